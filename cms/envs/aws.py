@@ -169,6 +169,8 @@ TECH_SUPPORT_EMAIL = ENV_TOKENS.get('TECH_SUPPORT_EMAIL', TECH_SUPPORT_EMAIL)
 
 COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
 
+STATIC_CONTENT_DISK_CACHE.update(ENV_TOKENS.get('STATIC_CONTENT_DISK_CACHE', {}))
+
 ASSET_IGNORE_REGEX = ENV_TOKENS.get('ASSET_IGNORE_REGEX', ASSET_IGNORE_REGEX)
 
 # Theme overrides
@@ -266,6 +268,11 @@ else:
 DATABASES = AUTH_TOKENS['DATABASES']
 MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTORE', MODULESTORE))
 CONTENTSTORE = AUTH_TOKENS['CONTENTSTORE']
+SPLIT_STRUCTURE_CACHE.update(ENV_TOKENS.get('SPLIT_STRUCTURE_CACHE', {}))
+CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT', CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT
+)
+GEOIP_CACHE_TIMEOUT = ENV_TOKENS.get('GEOIP_CACHE_TIMEOUT', GEOIP_CACHE_TIMEOUT)
 DOC_STORE_CONFIG = AUTH_TOKENS['DOC_STORE_CONFIG']
 # Datadog for events!
 DATADOG = AUTH_TOKENS.get("DATADOG", {})
@@ -202,6 +202,9 @@ sys.path.append(COMMON_ROOT / 'djangoapps')
 # For geolocation ip database
 GEOIP_PATH = REPO_ROOT / "common/static/data/geoip/GeoIP.dat"
 GEOIPV6_PATH = REPO_ROOT / "common/static/data/geoip/GeoIPv6.dat"
+# How long the country of an IP address is cached in process, in seconds.
+# 0 disables it.
+GEOIP_CACHE_TIMEOUT = 60 * 60
 
 ############################# WEB CONFIGURATION #############################
 # This is where we stick our compiled template files.
@@ -285,6 +288,17 @@ TEMPLATE_LOADERS = (
     'django.template.loaders.app_directories.Loader',
 )
 
+# Keep copies of assets too big for the cache on local disk, so that serving
+# them doesn't read them from the contentstore every time. See
+# contentserver.disk_cache. A DIRECTORY of None disables the disk cache.
+STATIC_CONTENT_DISK_CACHE = {
+    'DIRECTORY': None,
+    # Total size of the copies, in bytes
+    'MAX_SIZE': 10 * 1024 * 1024 * 1024,
+    # Assets bigger than this aren't copied
+    'MAX_ITEM_SIZE': 500 * 1024 * 1024,
+}
+
 MIDDLEWARE_CLASSES = (
     'request_cache.middleware.RequestCache',
     'django.middleware.cache.UpdateCacheMiddleware',
@@ -386,6 +400,20 @@ MODULESTORE = {
     }
 }
 
+# Keep the most recently used split modulestore course structures in each
+# process, decoded, in front of the 'course_structure_cache' cache. See
+# xmodule.modulestore.split_mongo.mongo_connection.StructureLRUCache.
+SPLIT_STRUCTURE_CACHE = {
+    # Pickled size of the structures to keep, in bytes. 0 disables the cache.
+    'MAX_BYTES': 0,
+    # Keep the structures compressed, saving memory but not decoding time.
+    'COMPRESS': False,
+}
+
+# How long configuration models (see config_models) are cached in process, in
+# seconds, before checking the shared cache for changes. 0 disables it.
+CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT = 5
+
 ############################ DJANGO_BUILTINS ################################
 # Change DEBUG/TEMPLATE_DEBUG in your environment settings files, not here
 DEBUG = False
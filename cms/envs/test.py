@@ -175,6 +175,13 @@ CACHES = {
     },
 }
 
+# Configuration changes must be seen right away, and the database is rolled back
+# between tests without going through ConfigurationModel.save
+CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT = 0
+
+# The tests mock the country of IP addresses
+GEOIP_CACHE_TIMEOUT = 0
+
 # Add external_auth to Installed apps for testing
 INSTALLED_APPS += ('external_auth', )
 
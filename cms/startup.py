@@ -21,6 +21,8 @@ def run():
 
     add_mimetypes()
 
+    configure_split_structure_cache()
+
     if settings.FEATURES.get('ENABLE_THIRD_PARTY_AUTH', False):
         from third_party_auth import settings as auth_settings
         auth_settings.apply_settings(settings)
@@ -43,6 +45,19 @@ def add_mimetypes():
     mimetypes.add_type('application/font-woff', '.woff')
 
 
+def configure_split_structure_cache():
+    """
+    Keep course structures in a process-wide cache, if configured in
+    SPLIT_STRUCTURE_CACHE.
+    """
+    if settings.SPLIT_STRUCTURE_CACHE.get('MAX_BYTES'):
+        from xmodule.modulestore.split_mongo.mongo_connection import configure_structure_cache
+        configure_structure_cache(
+            settings.SPLIT_STRUCTURE_CACHE['MAX_BYTES'],
+            compress=settings.SPLIT_STRUCTURE_CACHE.get('COMPRESS', False),
+        )
+
+
 def enable_theme():
     """
     Enable the settings for a custom theme, whose files should be stored
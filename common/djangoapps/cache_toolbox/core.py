@@ -11,6 +11,7 @@ Core methods
 from django.core.cache import cache
 from django.db import DEFAULT_DB_ALIAS
 from opaque_keys import InvalidKeyError
+from xmodule.contentstore.content import StaticContent
 
 from . import app_settings
 
@@ -118,6 +119,30 @@ def get_cached_content(location):
     return cache.get(unicode(location).encode("utf-8"))
 
 
+def set_cached_content_metadata(content):
+    """
+    Cache the metadata of `content`, without its data, for assets too big to
+    be cached whole.
+    """
+    metadata = StaticContent(
+        content.location, content.name, content.content_type, None,
+        last_modified_at=content.last_modified_at, length=content.length, locked=content.locked,
+    )
+    cache.set(content_metadata_key(content.location), metadata)
+
+
+def get_cached_content_metadata(location):
+    """
+    Return the cached metadata of the asset at `location`, as a StaticContent
+    without data, or None.
+    """
+    return cache.get(content_metadata_key(location))
+
+
+def content_metadata_key(location):
+    return u"metadata:{}".format(location).encode("utf-8")
+
+
 def del_cached_content(location):
     """
     delete content for the given location, as well as for content with run=None.
@@ -127,9 +152,10 @@ def del_cached_content(location):
     def location_str(loc):
         return unicode(loc).encode("utf-8")
 
-    locations = [location_str(location)]
+    locations = [location_str(location), content_metadata_key(location)]
     try:
         locations.append(location_str(location.replace(run=None)))
+        locations.append(content_metadata_key(location.replace(run=None)))
     except InvalidKeyError:
         # although deprecated keys allowed run=None, new keys don't if there is no version.
         pass
@@ -1,7 +1,12 @@
 """
 Django Model baseclass for database-backed configuration.
 """
+import time
+from uuid import uuid4
+
+from django.conf import settings
 from django.db import connection, models
+from django.db.models import Q
 from django.contrib.auth.models import User
 from django.core.cache import get_cache, InvalidCacheBackendError
 from django.utils.translation import ugettext_lazy as _
@@ -11,6 +16,13 @@ try:
 except InvalidCacheBackendError:
     from django.core.cache import cache
 
+# Process-local tier in front of the shared cache, mapping cache keys to
+# (expiry time, version stamp, value). See ConfigurationModel._get_cached.
+_local_cache = {}  # pylint: disable=invalid-name
+
+# The local tier is cleared when it grows past this many entries
+LOCAL_CACHE_MAX_ENTRIES = 10000
+
 
 class ConfigurationModelManager(models.Manager):
     """
@@ -97,6 +109,82 @@ class ConfigurationModel(models.Model):
         cache.delete(self.cache_key_name(*[getattr(self, key) for key in self.KEY_FIELDS]))
         if self.KEY_FIELDS:
             cache.delete(self.key_values_cache_key_name())
+        # Invalidate the entries of this model in the local cache of all processes
+        cache.delete(self.version_cache_key_name())
+        self.clear_local_cache()
+
+    @classmethod
+    def version_cache_key_name(cls):
+        """Return the name of the key of the version stamp of the cached configuration"""
+        return 'configuration/{}/version'.format(cls.__name__)
+
+    @classmethod
+    def clear_local_cache(cls):
+        """Forget the entries of this model cached in this process"""
+        prefix = 'configuration/{}/'.format(cls.__name__)
+        for cache_key in _local_cache.keys():
+            if cache_key.startswith(prefix):
+                _local_cache.pop(cache_key, None)
+
+    @classmethod
+    def _get_cached(cls, cache_keys):
+        """
+        Return a dict of the values cached for those of `cache_keys` that are cached,
+        and the version stamp of the cached configuration (or None).
+
+        If settings.CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT is set, values are kept in
+        process for that many seconds without any round trip to the shared cache. Once
+        they expire, they are kept for longer if the version stamp in the shared cache,
+        which changes whenever an entry is saved, hasn't changed, and read again from
+        the shared cache otherwise. Both are fetched in a single round trip.
+        """
+        local_timeout = getattr(settings, 'CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT', 0)
+        if not local_timeout:
+            if len(cache_keys) == 1:
+                cached = cache.get(cache_keys[0])
+                return ({cache_keys[0]: cached} if cached is not None else {}), None
+            return cache.get_many(cache_keys), None
+
+        now = time.time()
+        found = {}
+        for cache_key in cache_keys:
+            entry = _local_cache.get(cache_key)
+            if entry is not None and entry[0] > now:
+                found[cache_key] = entry[2]
+        missing = [cache_key for cache_key in cache_keys if cache_key not in found]
+        if not missing:
+            return found, None
+
+        version_key = cls.version_cache_key_name()
+        shared = cache.get_many([version_key] + missing)
+        version = shared.pop(version_key, None)
+        if version is None:
+            version = uuid4().hex
+            if not cache.add(version_key, version):
+                # Another process just set it, so we can't tell which values are current
+                version = None
+        for cache_key in missing:
+            entry = _local_cache.get(cache_key)
+            if cache_key in shared:
+                found[cache_key] = shared[cache_key]
+            elif entry is not None and version is not None and entry[1] == version:
+                found[cache_key] = entry[2]
+            else:
+                continue
+            cls._set_local_cache(cache_key, found[cache_key], version)
+        return found, version
+
+    @classmethod
+    def _set_local_cache(cls, cache_key, value, version):
+        """
+        Keep `value` in the local cache, if enabled, as of the given `version` stamp.
+        """
+        local_timeout = getattr(settings, 'CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT', 0)
+        if not local_timeout or version is None:
+            return
+        if len(_local_cache) >= LOCAL_CACHE_MAX_ENTRIES:
+            _local_cache.clear()
+        _local_cache[cache_key] = (time.time() + local_timeout, version, value)
 
     @classmethod
     def cache_key_name(cls, *args):
@@ -117,9 +205,10 @@ class ConfigurationModel(models.Model):
         from the database, or by creating a new empty entry (which is not
         persisted).
         """
-        cached = cache.get(cls.cache_key_name(*args))
-        if cached is not None:
-            return cached
+        cache_key = cls.cache_key_name(*args)
+        cached, version = cls._get_cached([cache_key])
+        if cache_key in cached:
+            return cached[cache_key]
 
         key_dict = dict(zip(cls.KEY_FIELDS, args))
         try:
@@ -127,9 +216,41 @@ class ConfigurationModel(models.Model):
         except IndexError:
             current = cls(**key_dict)
 
-        cache.set(cls.cache_key_name(*args), current, cls.cache_timeout)
+        cache.set(cache_key, current, cls.cache_timeout)
+        cls._set_local_cache(cache_key, current, version)
         return current
 
+    @classmethod
+    def current_many(cls, keys):
+        """
+        Return the active configuration entries for each of the given tuples of
+        KEY_FIELDS values, as a dict keyed by these tuples, like current() would.
+
+        The entries which aren't cached are fetched with a single query, and cached
+        with a single round trip.
+        """
+        assert cls.KEY_FIELDS != (), "Just use model.current() if there are no KEY_FIELDS"
+        cache_keys = dict((cls.cache_key_name(*key), tuple(key)) for key in keys)
+        cached, version = cls._get_cached(cache_keys.keys())
+        entries = dict((cache_keys[cache_key], value) for cache_key, value in cached.iteritems())
+
+        missing = [key for cache_key, key in cache_keys.iteritems() if cache_key not in cached]
+        if missing:
+            query = Q()
+            for key in missing:
+                query |= Q(**dict(zip(cls.KEY_FIELDS, key)))
+            current_entries = {}
+            for current in cls.objects.current_set().filter(query):
+                current_entries[cls.cache_key_name(*[getattr(current, field) for field in cls.KEY_FIELDS])] = current
+            to_cache = {}
+            for key in missing:
+                cache_key = cls.cache_key_name(*key)
+                current = current_entries.get(cache_key) or cls(**dict(zip(cls.KEY_FIELDS, key)))
+                to_cache[cache_key] = entries[key] = current
+                cls._set_local_cache(cache_key, current, version)
+            cache.set_many(to_cache, cls.cache_timeout)
+        return entries
+
     @classmethod
     def is_enabled(cls):
         """Returns True if this feature is configured as enabled, else False."""
@@ -168,9 +289,10 @@ class ConfigurationModel(models.Model):
         assert not kwargs, "'flat' is the only kwarg accepted"
         key_fields = key_fields or cls.KEY_FIELDS
         cache_key = cls.key_values_cache_key_name(*key_fields)
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
+        cached, version = cls._get_cached([cache_key])
+        if cache_key in cached:
+            return cached[cache_key]
         values = list(cls.objects.values_list(*key_fields, flat=flat).order_by().distinct())
         cache.set(cache_key, values, cls.cache_timeout)
+        cls._set_local_cache(cache_key, values, version)
         return values
@@ -7,10 +7,11 @@ import ddt
 from django.contrib.auth.models import User
 from django.db import models
 from django.test import TestCase
+from django.test.utils import override_settings
 from freezegun import freeze_time
 
 from mock import patch
-from config_models.models import ConfigurationModel
+from config_models.models import ConfigurationModel, cache
 
 
 class ExampleConfig(ConfigurationModel):
@@ -282,3 +283,80 @@ class KeyedConfigurationModelTests(TestCase):
         fake_result = [('a', 'b'), ('c', 'd')]
         mock_cache.get.return_value = fake_result
         self.assertEquals(ExampleKeyedConfig.key_values(), fake_result)
+
+
+@ddt.ddt
+class CurrentManyTests(TestCase):
+    """
+    Tests of ``ConfigurationModel.current_many``.
+    """
+    def setUp(self):
+        super(CurrentManyTests, self).setUp()
+        self.user = User()
+        self.user.save()
+        cache.clear()
+
+    def test_current_many(self):
+        with freeze_time('2012-01-01'):
+            ExampleKeyedConfig(left='left_a', right='right_a', int_field=0, changed_by=self.user).save()
+        ExampleKeyedConfig(left='left_a', right='right_a', int_field=1, changed_by=self.user).save()
+        ExampleKeyedConfig(left='left_b', right='right_b', int_field=2, changed_by=self.user).save()
+        keys = [('left_a', 'right_a'), ('left_b', 'right_b'), ('left_c', 'right_c')]
+
+        with self.assertNumQueries(1):
+            entries = ExampleKeyedConfig.current_many(keys)
+        self.assertEqual(set(entries), set(keys))
+        self.assertEqual(entries[('left_a', 'right_a')].int_field, 1)
+        self.assertEqual(entries[('left_b', 'right_b')].int_field, 2)
+        self.assertEqual(entries[('left_c', 'right_c')].int_field, 10)
+        self.assertIsNone(entries[('left_c', 'right_c')].pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(ExampleKeyedConfig.current_many(keys), entries)
+            self.assertEqual(ExampleKeyedConfig.current('left_b', 'right_b'), entries[('left_b', 'right_b')])
+
+    def test_current_many_without_key_fields(self):
+        with self.assertRaises(AssertionError):
+            ExampleConfig.current_many([()])
+
+
+@override_settings(CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT=5)
+class LocalCacheTests(TestCase):
+    """
+    Tests of the process-local cache of ``ConfigurationModels``.
+    """
+    def setUp(self):
+        super(LocalCacheTests, self).setUp()
+        self.user = User()
+        self.user.save()
+        cache.clear()
+        ExampleConfig.clear_local_cache()
+        ExampleConfig(string_field='first', changed_by=self.user).save()
+
+    def test_no_round_trips_until_expiry(self):
+        with freeze_time('2012-01-01 00:00:00'):
+            self.assertEqual(ExampleConfig.current().string_field, 'first')
+            with patch('config_models.models.cache') as mock_cache:
+                with self.assertNumQueries(0):
+                    self.assertEqual(ExampleConfig.current().string_field, 'first')
+                self.assertFalse(mock_cache.method_calls)
+
+    def test_revalidated_with_version(self):
+        with freeze_time('2012-01-01 00:00:00'):
+            current = ExampleConfig.current()
+        # Another process changes the configuration
+        ExampleConfig.objects.filter(pk=current.pk).update(string_field='changed')
+        with freeze_time('2012-01-01 00:00:10'):
+            # The version hasn't changed, so the entry is kept for longer
+            with self.assertNumQueries(0):
+                self.assertEqual(ExampleConfig.current().string_field, 'first')
+            # As the other process would do when saving
+            cache.delete(ExampleConfig.cache_key_name())
+            cache.delete(ExampleConfig.version_cache_key_name())
+        with freeze_time('2012-01-01 00:00:20'):
+            self.assertEqual(ExampleConfig.current().string_field, 'changed')
+
+    def test_cleared_on_save(self):
+        self.assertEqual(ExampleConfig.current().string_field, 'first')
+        ExampleConfig(string_field='second', changed_by=self.user).save()
+        self.assertEqual(ExampleConfig.current().string_field, 'second')
@@ -0,0 +1,154 @@
+"""
+A cache of large assets on local disk.
+
+Assets too big for memcached are otherwise read from GridFS on every request,
+which hurts for videos being scrubbed through and large handouts. Files are
+named after the asset's ETag, so a changed asset is never served from an old
+file; old files are removed when the cache outgrows its size limit.
+
+Assets are copied to disk in a background thread, so that the request which
+misses the cache is served from GridFS right away.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+
+from xmodule.contentstore.content import StaticContentStream
+
+log = logging.getLogger(__name__)
+
+# How much of an asset to copy to disk at a time.
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class AssetDiskCache(object):
+    """
+    Keeps copies of assets in `directory`, up to `max_size` bytes in total.
+    Assets bigger than `max_item_size` aren't cached.
+    """
+    def __init__(self, directory, max_size, max_item_size):
+        self.directory = directory
+        self.max_size = max_size
+        self.max_item_size = max_item_size
+        # The ETags of the assets being copied
+        self._filling = set()
+        self._lock = threading.Lock()
+
+    def path(self, etag):
+        """
+        The file caching the asset with `etag`.
+        """
+        return os.path.join(self.directory, hashlib.sha1(etag).hexdigest())
+
+    def get(self, content, etag):
+        """
+        Return a StaticContentStream reading the cached copy of `content`, the
+        metadata of an asset, or None if it isn't cached.
+        """
+        try:
+            stream = open(self.path(etag), 'rb')
+        except IOError:
+            return None
+        # Freshen the access time, which eviction goes by, even on noatime mounts.
+        os.utime(stream.name, None)
+        return StaticContentStream(
+            content.location, content.name, content.content_type, stream,
+            last_modified_at=content.last_modified_at, length=content.length, locked=content.locked,
+            chunk_size=COPY_CHUNK_SIZE,
+        )
+
+    def set_async(self, content, etag, open_stream):
+        """
+        Copy the asset with `etag`, whose metadata is `content`, to the cache
+        in a background thread, unless it's too big or already being copied.
+
+        `open_stream` is called in the thread, and returns a new
+        StaticContentStream of the asset, or None if the asset no longer has
+        `etag`.
+
+        Returns the thread, or None.
+        """
+        if content.length is None or content.length > self.max_item_size:
+            return None
+        with self._lock:
+            if etag in self._filling:
+                return None
+            self._filling.add(etag)
+        thread = threading.Thread(target=self._fill, args=(etag, open_stream))
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def _fill(self, etag, open_stream):
+        """
+        Copy the stream returned by `open_stream` to the cache.
+        """
+        try:
+            content = open_stream()
+            if content is not None:
+                self.set(content, etag)
+        except Exception:  # pylint: disable=broad-except
+            log.exception(u"Couldn't cache the asset with ETag %s on disk", etag)
+        finally:
+            with self._lock:
+                self._filling.discard(etag)
+
+    def set(self, content, etag):
+        """
+        Copy the StaticContentStream `content` to the cache, if it isn't too
+        big, and return whether it was copied.
+        """
+        if content.length is None or content.length > self.max_item_size:
+            return False
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            # Write to a temporary file first, so that no process reads a
+            # partial copy.
+            handle, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp')
+        except (IOError, OSError):
+            log.exception(u"Couldn't cache %s on disk", content.location)
+            return False
+        temp_file = os.fdopen(handle, 'wb')
+        try:
+            for chunk in content.stream_data_in_range(0, content.length - 1):
+                temp_file.write(chunk)
+            temp_file.close()
+            os.rename(temp_path, self.path(etag))
+        except (IOError, OSError):
+            log.exception(u"Couldn't cache %s on disk", content.location)
+            return False
+        finally:
+            temp_file.close()
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+        self.evict()
+        return True
+
+    def evict(self):
+        """
+        Remove the least recently used files until the cache fits `max_size`.
+        """
+        files = []
+        for name in os.listdir(self.directory):
+            if name.startswith('.tmp'):
+                # Being copied
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_atime, stat.st_size, path))
+        total_size = sum(size for __, size, __ in files)
+        for __, size, path in sorted(files):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
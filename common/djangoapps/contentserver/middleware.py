@@ -2,29 +2,50 @@
 Middleware to serve assets.
 """
 
+import hashlib
 import logging
 
+from django.conf import settings
 from django.http import (
     HttpResponse, HttpResponseNotModified, HttpResponseForbidden
 )
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, StaticContentStream, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
-from cache_toolbox.core import get_cached_content, set_cached_content
+from cache_toolbox.core import (
+    get_cached_content, set_cached_content, get_cached_content_metadata, set_cached_content_metadata
+)
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.exceptions import NotFoundError
 
+from .disk_cache import AssetDiskCache
+
 # TODO: Soon as we have a reasonable way to serialize/deserialize AssetKeys, we need
 # to change this file so instead of using course_id_partial, we're just using asset keys
 
 log = logging.getLogger(__name__)
 
+# Assets smaller than this are cached whole, bigger ones only have their
+# metadata cached.
+MAX_CACHED_CONTENT_SIZE = 1048576
+
 
 class StaticContentServer(object):
+    def __init__(self):
+        disk_cache_settings = getattr(settings, 'STATIC_CONTENT_DISK_CACHE', {})
+        if disk_cache_settings.get('DIRECTORY'):
+            self.disk_cache = AssetDiskCache(
+                disk_cache_settings['DIRECTORY'],
+                disk_cache_settings['MAX_SIZE'],
+                disk_cache_settings['MAX_ITEM_SIZE'],
+            )
+        else:
+            self.disk_cache = None
+
     def process_request(self, request):
         # look to see if the request is prefixed with an asset prefix tag
         if (
@@ -41,8 +62,11 @@ class StaticContentServer(object):
                 response.status_code = 400
                 return response
 
-            # first look in our cache so we don't have to round-trip to the DB
+            # first look in our cache so we don't have to round-trip to the DB.
+            # Large assets only have their metadata cached, without data.
             content = get_cached_content(loc)
+            if content is None:
+                content = get_cached_content_metadata(loc)
             if content is None:
                 # nope, not in cache, let's fetch from DB
                 try:
@@ -55,10 +79,12 @@ class StaticContentServer(object):
                 # since we fetched it from DB, let's cache it going forward, but only if it's < 1MB
                 # this is because I haven't been able to find a means to stream data out of memcached
                 if content.length is not None:
-                    if content.length < 1048576:
+                    if content.length < MAX_CACHED_CONTENT_SIZE:
                         # since we've queried as a stream, let's read in the stream into memory to set in cache
                         content = content.copy_to_in_mem()
                         set_cached_content(content)
+                    else:
+                        set_cached_content_metadata(content)
             else:
                 # NOP here, but we may wish to add a "cache-hit" counter in the future
                 pass
@@ -80,13 +106,29 @@ class StaticContentServer(object):
             # convert over the DB persistent last modified timestamp to a HTTP compatible
             # timestamp, so we can simply compare the strings
             last_modified_at_str = content.last_modified_at.strftime("%a, %d-%b-%Y %H:%M:%S GMT")
+            etag = content_etag(content)
 
             # see if the client has cached this content, if so then compare the
-            # timestamps, if they are the same then just return a 304 (Not Modified)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+            # ETags, or else the timestamps, if they are the same then just return
+            # a 304 (Not Modified)
+            if 'HTTP_IF_NONE_MATCH' in request.META:
+                if etag_matches(request.META['HTTP_IF_NONE_MATCH'], etag):
+                    return not_modified_response(etag, last_modified_at_str)
+            elif 'HTTP_IF_MODIFIED_SINCE' in request.META:
                 if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
                 if if_modified_since == last_modified_at_str:
-                    return HttpResponseNotModified()
+                    return not_modified_response(etag, last_modified_at_str)
+
+            # Large assets are served from the disk cache, if there is one, or
+            # else from the DB
+            if content.data is None:
+                try:
+                    content = self.load_stream(loc, content, etag)
+                except (ItemNotFoundError, NotFoundError):
+                    return HttpResponse(status=404)
+                # The asset may have changed since its metadata was cached.
+                last_modified_at_str = content.last_modified_at.strftime("%a, %d-%b-%Y %H:%M:%S GMT")
+                etag = content_etag(content)
 
             # *** File streaming within a byte range ***
             # If a Range is provided, parse Range attribute of the request
@@ -94,12 +136,10 @@ class StaticContentServer(object):
             # Request -> Range attribute structure: "Range: bytes=first-[last]"
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
+            # If-Range: only honor the Range if the client's copy is still current
             response = None
-            if request.META.get('HTTP_RANGE'):
-                # Data from cache (StaticContent) has no easy byte management, so we use the DB instead (StaticContentStream)
-                if type(content) == StaticContent:
-                    content = AssetManager.find(loc, as_stream=True)
-
+            if_range = request.META.get('HTTP_IF_RANGE')
+            if request.META.get('HTTP_RANGE') and if_range in (None, etag, last_modified_at_str):
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -145,9 +185,67 @@ class StaticContentServer(object):
             response['Accept-Ranges'] = 'bytes'
             response['Content-Type'] = content.content_type
             response['Last-Modified'] = last_modified_at_str
+            response['ETag'] = etag
 
             return response
 
+    def load_stream(self, loc, content, etag):
+        """
+        Return a StaticContentStream of the asset at `loc`, whose metadata or
+        stream is `content` and whose ETag is `etag`, from the disk cache if
+        possible. Otherwise the asset is copied to the disk cache in the
+        background, and streamed from the DB.
+        """
+        if self.disk_cache is not None:
+            cached = self.disk_cache.get(content, etag)
+            if cached is not None:
+                return cached
+        if not isinstance(content, StaticContentStream):
+            content = AssetManager.find(loc, as_stream=True)
+        if self.disk_cache is not None:
+            self.disk_cache.set_async(content, content_etag(content), lambda: self._find_stream(loc, content))
+        return content
+
+    @staticmethod
+    def _find_stream(loc, content):
+        """
+        Return a new StaticContentStream of the asset at `loc`, or None if it
+        changed since `content` was read.
+        """
+        stream = AssetManager.find(loc, as_stream=True)
+        if content_etag(stream) != content_etag(content):
+            return None
+        return stream
+
+
+def content_etag(content):
+    """
+    Returns the ETag of `content`, which changes whenever the asset is replaced.
+    """
+    md5 = hashlib.md5()
+    md5.update(unicode(content.location).encode('utf-8'))
+    md5.update(str(content.last_modified_at))
+    md5.update(str(content.length))
+    return '"{}"'.format(md5.hexdigest())
+
+
+def etag_matches(header_value, etag):
+    """
+    Does the If-None-Match `header_value` match `etag`?
+    """
+    etags = [value.strip() for value in header_value.split(',')]
+    return '*' in etags or etag in etags or 'W/' + etag in etags
+
+
+def not_modified_response(etag, last_modified_at_str):
+    """
+    Returns a 304 (Not Modified) response.
+    """
+    response = HttpResponseNotModified()
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified_at_str
+    return response
+
 
 def parse_range_header(header_value, content_length):
     """
@@ -2,11 +2,17 @@
 Tests for StaticContentServer
 """
 import copy
+from datetime import timedelta
 import ddt
 import logging
+import os
+import shutil
+import tempfile
 import unittest
 from uuid import uuid4
 
+from mock import Mock, patch
+
 from django.conf import settings
 from django.test.client import Client
 from django.test.utils import override_settings
@@ -17,7 +23,9 @@ from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.xml_importer import import_course_from_xml
 
-from contentserver.middleware import parse_range_header
+from contentserver.disk_cache import AssetDiskCache
+from contentserver.middleware import content_etag, parse_range_header
+from cache_toolbox.core import del_cached_content, set_cached_content_metadata
 from student.models import CourseEnrollment
 
 log = logging.getLogger(__name__)
@@ -192,6 +200,106 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         )
         self.assertEqual(resp.status_code, 416)
 
+    def test_etag_not_modified(self):
+        """
+        Test that a request with the ETag of the asset outputs 304 Not Modified.
+        """
+        resp = self.client.get(self.url_unlocked)
+        etag = resp['ETag']
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp['ETag'], etag)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(resp.status_code, 200)
+
+    def test_if_range(self):
+        """
+        Test that a range request is only honored if If-Range matches the asset.
+        """
+        etag = self.client.get(self.url_unlocked)['ETag']
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE=etag)
+        self.assertEqual(resp.status_code, 206)
+
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
+
+    @patch('contentserver.middleware.MAX_CACHED_CONTENT_SIZE', 0)
+    def test_large_asset_disk_cache(self):
+        """
+        Test that large assets are served from the disk cache, once their
+        metadata has been cached.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        disk_cache_settings = {'DIRECTORY': cache_dir, 'MAX_SIZE': 10 ** 6, 'MAX_ITEM_SIZE': 10 ** 6}
+        del_cached_content(self.unlocked_asset)
+
+        # Wait for the assets to be copied to disk
+        fill_threads = []
+        set_async = AssetDiskCache.set_async
+
+        def set_async_and_remember(disk_cache, *args):
+            """Remember the threads copying assets to disk."""
+            thread = set_async(disk_cache, *args)
+            if thread is not None:
+                fill_threads.append(thread)
+            return thread
+
+        with override_settings(STATIC_CONTENT_DISK_CACHE=disk_cache_settings):
+            client = Client()
+            with patch.object(AssetDiskCache, 'set_async', set_async_and_remember):
+                resp = client.get(self.url_unlocked)
+            self.assertEqual(resp.status_code, 200)
+            full_content = resp.content
+            self.assertEqual(len(fill_threads), 1)
+            fill_threads[0].join()
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            with patch('contentserver.middleware.AssetManager.find') as mock_find:
+                resp = client.get(self.url_unlocked, HTTP_RANGE='bytes=1-3')
+                self.assertFalse(mock_find.called)
+            self.assertEqual(resp.status_code, 206)
+            self.assertEqual(resp.content, full_content[1:4])
+
+
+    @patch('contentserver.middleware.MAX_CACHED_CONTENT_SIZE', 0)
+    def test_etag_of_refetched_asset(self):
+        """
+        Test that the ETag of a large asset is that of the asset sent, when the
+        asset changed since its metadata was cached.
+        """
+        del_cached_content(self.unlocked_asset)
+        content = self.contentstore.find(self.unlocked_asset, as_stream=True)
+        stale_content = copy.copy(content)
+        stale_content.last_modified_at -= timedelta(days=1)
+        set_cached_content_metadata(stale_content)
+        self.addCleanup(del_cached_content, self.unlocked_asset)
+
+        resp = self.client.get(self.url_unlocked)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['ETag'], content_etag(content))
+        self.assertNotEqual(resp['ETag'], content_etag(stale_content))
+
+
+class AssetDiskCacheTestCase(unittest.TestCase):
+    """
+    Tests for AssetDiskCache.
+    """
+    def test_failed_copy_is_removed(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        def stream_data_in_range(first, last):  # pylint: disable=unused-argument
+            """Fail after the first chunk."""
+            yield 'chunk'
+            raise IOError('GridFS went away')
+
+        content = Mock(length=10, stream_data_in_range=stream_data_in_range)
+        self.assertFalse(AssetDiskCache(cache_dir, 100, 100).set(content, '"etag"'))
+        self.assertEqual(os.listdir(cache_dir), [])
+
 
 @ddt.ddt
 class ParseRangeHeaderTestCase(unittest.TestCase):
@@ -2,6 +2,7 @@ import logging
 
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.cache import cache
 
 from django.dispatch import receiver
 from django.db.models.signals import post_save
@@ -9,7 +10,7 @@ from django.utils.translation import ugettext_noop
 
 from student.models import CourseEnrollment
 
-from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.django import modulestore, SignalHandler
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule_django.models import CourseKeyField, NoneToEmptyManager
 
@@ -18,6 +19,10 @@ FORUM_ROLE_MODERATOR = ugettext_noop('Moderator')
 FORUM_ROLE_COMMUNITY_TA = ugettext_noop('Community TA')
 FORUM_ROLE_STUDENT = ugettext_noop('Student')
 
+# The index of a course's inline discussions, see
+# `django_comment_client.utils.get_discussion_index`.
+DISCUSSION_INDEX_CACHE_KEY = u"django_comment_common.discussion_index.{course_id}"
+
 
 @receiver(post_save, sender=CourseEnrollment)
 def assign_default_role_on_enrollment(sender, instance, **kwargs):
@@ -41,6 +46,14 @@ def assign_default_role_on_enrollment(sender, instance, **kwargs):
     assign_default_role(instance.course_id, instance.user)
 
 
+@receiver(SignalHandler.course_published)
+def clear_discussion_index(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forget the index of the inline discussions of a course when it is published.
+    """
+    cache.delete(DISCUSSION_INDEX_CACHE_KEY.format(course_id=course_key))
+
+
 def assign_default_role(course_id, user):
     """
     Assign forum default role 'Student' to user
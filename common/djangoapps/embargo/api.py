@@ -6,7 +6,6 @@ This API is exposed via the middleware(emabargo/middileware.py) layer but may be
 
 """
 import logging
-import pygeoip
 
 from django.core.cache import cache
 from django.conf import settings
@@ -15,6 +14,7 @@ from rest_framework import status
 from ipware.ip import get_ip
 
 from embargo.models import CountryAccessRule, RestrictedCourse
+from geoinfo.api import country_code_from_ip
 
 
 log = logging.getLogger(__name__)
@@ -73,7 +73,7 @@ def check_course_access(course_key, user=None, ip_address=None, url=None):
     if ip_address is not None:
         # Retrieve the country code from the IP address
         # and check it against the allowed countries list for a course
-        user_country_from_ip = _country_code_from_ip(ip_address)
+        user_country_from_ip = country_code_from_ip(ip_address)
 
         if not CountryAccessRule.check_country_access(course_key, user_country_from_ip):
             log.info(
@@ -153,24 +153,6 @@ def _get_user_country_from_profile(user):
     return profile_country
 
 
-def _country_code_from_ip(ip_addr):
-    """
-    Return the country code associated with an IP address.
-    Handles both IPv4 and IPv6 addresses.
-
-    Args:
-        ip_addr (str): The IP address to look up.
-
-    Returns:
-        str: A 2-letter country code.
-
-    """
-    if ip_addr.find(':') >= 0:
-        return pygeoip.GeoIP(settings.GEOIPV6_PATH).country_code_by_addr(ip_addr)
-    else:
-        return pygeoip.GeoIP(settings.GEOIP_PATH).country_code_by_addr(ip_addr)
-
-
 def get_embargo_response(request, course_id, user):
     """
     Check whether any country access rules block the user from enrollment.
@@ -0,0 +1,115 @@
+"""
+Look up the country of IP addresses.
+
+The GeoIP databases are opened once per process and memory-mapped, and the
+country of each address is kept in a process-wide LRU cache for
+`settings.GEOIP_CACHE_TIMEOUT` seconds, and for the rest of the request
+being served, so that the embargo checks and CountryMiddleware don't read
+the databases for every request.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import pygeoip
+from django.conf import settings
+
+from request_cache.middleware import RequestCache
+
+COUNTRY_CODE_CACHE_KEY = "geoinfo.country_code"
+
+# How many addresses' countries to keep in each process.
+COUNTRY_CODE_CACHE_SIZE = 10000
+
+_READERS = {}
+_READERS_LOCK = threading.Lock()
+
+
+def _get_reader(path):
+    """
+    Return the process-wide reader of the GeoIP database at `path`.
+    """
+    reader = _READERS.get(path)
+    if reader is None:
+        with _READERS_LOCK:
+            reader = _READERS.get(path)
+            if reader is None:
+                reader = _READERS[path] = pygeoip.GeoIP(path, pygeoip.MMAP_CACHE)
+    return reader
+
+
+class CountryCodeCache(object):
+    """
+    A process-wide cache of the countries of the most recently looked up IP
+    addresses, whose entries expire after `settings.GEOIP_CACHE_TIMEOUT`
+    seconds.
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, ip_address):
+        """
+        Return the cached country code of `ip_address`, or None.
+        """
+        with self._lock:
+            entry = self._entries.pop(ip_address, None)
+            if entry is None or entry[0] < time.time():
+                return None
+            self._entries[ip_address] = entry
+            return entry[1]
+
+    def set(self, ip_address, country_code, timeout):
+        """
+        Cache the country code of `ip_address` for `timeout` seconds.
+        """
+        with self._lock:
+            self._entries.pop(ip_address, None)
+            self._entries[ip_address] = (time.time() + timeout, country_code)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Empty the cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+COUNTRY_CODES = CountryCodeCache(COUNTRY_CODE_CACHE_SIZE)
+
+
+def country_code_from_ip(ip_address):
+    """
+    Return the country code associated with an IP address.
+    Handles both IPv4 and IPv6 addresses.
+
+    Args:
+        ip_address (str): The IP address to look up.
+
+    Returns:
+        str: A 2-letter country code.
+
+    """
+    # Only memoize in the request cache while a request is being served, so
+    # that it is cleared when the request ends.
+    request_cache = RequestCache.get_request_cache()
+    if RequestCache.get_current_request() is not None:
+        country_codes = request_cache.data.setdefault(COUNTRY_CODE_CACHE_KEY, {})
+    else:
+        country_codes = {}
+    if ip_address in country_codes:
+        return country_codes[ip_address]
+
+    cache_timeout = getattr(settings, 'GEOIP_CACHE_TIMEOUT', 0)
+    country_code = COUNTRY_CODES.get(ip_address) if cache_timeout else None
+    if country_code is None:
+        if ip_address.find(':') >= 0:
+            country_code = _get_reader(settings.GEOIPV6_PATH).country_code_by_addr(ip_address)
+        else:
+            country_code = _get_reader(settings.GEOIP_PATH).country_code_by_addr(ip_address)
+        if cache_timeout and country_code is not None:
+            COUNTRY_CODES.set(ip_address, country_code, cache_timeout)
+
+    country_codes[ip_address] = country_code
+    return country_code
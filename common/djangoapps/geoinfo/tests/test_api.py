@@ -0,0 +1,79 @@
+"""
+Tests for looking up the country of IP addresses.
+"""
+import time
+
+from mock import patch
+import pygeoip
+
+from django.conf import settings
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+
+from geoinfo.api import COUNTRY_CODES, CountryCodeCache, country_code_from_ip, _get_reader
+from request_cache.middleware import RequestCache
+
+
+class CountryCodeFromIpTests(TestCase):
+    """
+    Tests of country_code_from_ip.
+    """
+    def setUp(self):
+        super(CountryCodeFromIpTests, self).setUp()
+        COUNTRY_CODES.clear()
+        self.addCleanup(COUNTRY_CODES.clear)
+        patcher = patch.object(pygeoip.GeoIP, 'country_code_by_addr', return_value='CN')
+        self.mock_country_code_by_addr = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_shared_readers(self):
+        self.assertEqual(country_code_from_ip('117.79.83.1'), 'CN')
+        self.assertEqual(country_code_from_ip('2001:da8:20f:1502:edcf:550b:4a9c:207d'), 'CN')
+        self.assertIs(_get_reader(settings.GEOIP_PATH), _get_reader(settings.GEOIP_PATH))
+        self.assertIs(_get_reader(settings.GEOIPV6_PATH), _get_reader(settings.GEOIPV6_PATH))
+        self.assertIsNot(_get_reader(settings.GEOIP_PATH), _get_reader(settings.GEOIPV6_PATH))
+
+    @override_settings(GEOIP_CACHE_TIMEOUT=0)
+    def test_not_cached(self):
+        country_code_from_ip('117.79.83.1')
+        country_code_from_ip('117.79.83.1')
+        self.assertEqual(self.mock_country_code_by_addr.call_count, 2)
+
+    @override_settings(GEOIP_CACHE_TIMEOUT=60)
+    def test_cached_until_timeout(self):
+        self.assertEqual(country_code_from_ip('117.79.83.1'), 'CN')
+        self.mock_country_code_by_addr.return_value = 'US'
+        self.assertEqual(country_code_from_ip('117.79.83.1'), 'CN')
+        self.assertEqual(country_code_from_ip('4.0.0.0'), 'US')
+        self.assertEqual(self.mock_country_code_by_addr.call_count, 2)
+
+        with patch('geoinfo.api.time.time', return_value=time.time() + 61):
+            self.assertEqual(country_code_from_ip('117.79.83.1'), 'US')
+
+    @override_settings(GEOIP_CACHE_TIMEOUT=0)
+    def test_memoized_for_request(self):
+        request_cache = RequestCache()
+        request_cache.process_request(RequestFactory().get('/somewhere'))
+        country_code_from_ip('117.79.83.1')
+        country_code_from_ip('117.79.83.1')
+        self.assertEqual(self.mock_country_code_by_addr.call_count, 1)
+
+        request_cache.process_response(None, None)
+        country_code_from_ip('117.79.83.1')
+        self.assertEqual(self.mock_country_code_by_addr.call_count, 2)
+
+
+class CountryCodeCacheTests(TestCase):
+    """
+    Tests of CountryCodeCache.
+    """
+    def test_least_recently_used_evicted(self):
+        country_codes = CountryCodeCache(2)
+        country_codes.set('117.79.83.1', 'CN', 60)
+        country_codes.set('4.0.0.0', 'SD', 60)
+        self.assertEqual(country_codes.get('117.79.83.1'), 'CN')
+        country_codes.set('8.8.8.8', 'US', 60)
+        self.assertIsNone(country_codes.get('4.0.0.0'))
+        self.assertEqual(country_codes.get('117.79.83.1'), 'CN')
+        self.assertEqual(country_codes.get('8.8.8.8'), 'US')
@@ -7,6 +7,7 @@ from pytz import UTC
 
 from django.utils.http import cookie_date
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse, NoReverseMatch
 
 import third_party_auth
@@ -23,6 +24,85 @@ VERIFY_STATUS_MISSED_DEADLINE = "verify_missed_deadline"
 VERIFY_STATUS_NEED_TO_REVERIFY = "verify_need_to_reverify"
 
 
+def get_dashboard_data(user, course_ids):
+    """
+    Load what the dashboard needs to know about the courses a user is
+    enrolled in, with one query for each kind of data instead of one for
+    each course.
+
+    The certificate data is cached per user for
+    `settings.DASHBOARD_DATA_CACHE_TIMEOUT` seconds, and forgotten when the
+    user's enrollments or certificates change. Course modes, invoices and
+    instructor email authorizations change for many users at once, so they
+    are loaded again for every call.
+
+    Arguments:
+        user (User): The user whose dashboard is shown.
+        course_ids (list[CourseKey]): The courses the user is enrolled in.
+
+    Returns:
+        dict: With the keys:
+            * all_course_modes: Lists of all the `Mode`s of each course, including expired modes.
+            * unexpired_course_modes: Lists of the unexpired `Mode`s of each course.
+            * selectable_course_modes: Lists of the `Mode`s of each course that
+              `CourseMode.modes_for_course` returns.
+            * certificate_statuses: The `certificate_status_for_student` of each course.
+            * certificate_course_ids: The courses the user has a certificate in.
+            * blocked_course_ids: The courses the user registered for with a
+              code from an invalid invoice.
+            * email_enabled_course_ids: The courses with instructor email enabled.
+    """
+    # These LMS apps aren't imported at module level, because the CMS imports this module too.
+    from bulk_email.models import CourseAuthorization
+    from certificates.models import certificate_statuses_for_student
+    from shoppingcart.models import CourseRegistrationCode
+    from student.models import DASHBOARD_DATA_CACHE_KEY
+
+    course_ids = frozenset(course_ids)
+    cache_key = DASHBOARD_DATA_CACHE_KEY.format(user_id=user.id)
+    data = None
+    if settings.DASHBOARD_DATA_CACHE_TIMEOUT:
+        data = cache.get(cache_key)
+        if data is not None and data['course_ids'] != course_ids:
+            data = None
+
+    if data is None:
+        certificate_statuses, certificate_course_ids = certificate_statuses_for_student(user, course_ids)
+        data = {
+            'course_ids': course_ids,
+            'certificate_statuses': certificate_statuses,
+            'certificate_course_ids': frozenset(certificate_course_ids),
+        }
+        if settings.DASHBOARD_DATA_CACHE_TIMEOUT:
+            cache.set(cache_key, data, settings.DASHBOARD_DATA_CACHE_TIMEOUT)
+
+    data['all_course_modes'] = dict(CourseMode.all_modes_for_courses(list(course_ids)))
+    data['blocked_course_ids'] = frozenset(
+        registration_code.course_id
+        for registration_code in CourseRegistrationCode.objects.filter(
+            course_id__in=course_ids,
+            registrationcoderedemption__redeemed_by=user,
+            invoice_item__invoice__is_valid=False,
+        )
+    )
+    data['email_enabled_course_ids'] = CourseAuthorization.instructor_email_enabled_courses(course_ids)
+
+    # Modes expire over time, so these aren't cached.
+    now = datetime.now(UTC)
+    data['unexpired_course_modes'] = {
+        course_id: [
+            mode for mode in modes
+            if mode.expiration_datetime is None or mode.expiration_datetime >= now
+        ]
+        for course_id, modes in data['all_course_modes'].iteritems()
+    }
+    data['selectable_course_modes'] = {
+        course_id: [mode for mode in modes if mode.slug not in CourseMode.CREDIT_MODES] or [CourseMode.DEFAULT_MODE]
+        for course_id, modes in data['unexpired_course_modes'].iteritems()
+    }
+    return data
+
+
 def check_verify_status_by_course(user, course_enrollments, all_course_modes):
     """
     Determine the per-course verification statuses for a given user.
@@ -26,9 +26,10 @@ from django.utils import timezone
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.core.cache import cache
 from django.db import models, IntegrityError
 from django.db.models import Count
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver, Signal
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.translation import ugettext_noop
@@ -61,6 +62,9 @@ log = logging.getLogger(__name__)
 AUDIT_LOG = logging.getLogger("audit")
 SessionStore = import_module(settings.SESSION_ENGINE).SessionStore  # pylint: disable=invalid-name
 
+# The data loaded in bulk for a user's dashboard, see `student.helpers.get_dashboard_data`.
+DASHBOARD_DATA_CACHE_KEY = u"student.dashboard_data.{user_id}"
+
 UNENROLLED_TO_ALLOWEDTOENROLL = 'from unenrolled to allowed to enroll'
 ALLOWEDTOENROLL_TO_ENROLLED = 'from allowed to enroll to enrolled'
 ENROLLED_TO_ENROLLED = 'from enrolled to enrolled'
@@ -1265,11 +1269,34 @@ class CourseEnrollment(models.Model):
     def enrollments_for_user(cls, user):
         return CourseEnrollment.objects.filter(user=user, is_active=1)
 
-    def is_paid_course(self):
+    @classmethod
+    def load_course_overviews(cls, enrollments):
+        """
+        Load the course overviews of all of `enrollments` with one query,
+        instead of one query per enrollment the first time its
+        `course_overview` is used.
+
+        Overviews which aren't in the database yet are still created by
+        `course_overview`.
+        """
+        from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+        overviews = {
+            overview.id: overview
+            for overview in CourseOverview.objects.filter(
+                id__in=[enrollment.course_id for enrollment in enrollments]
+            )
+        }
+        for enrollment in enrollments:
+            if enrollment.course_id in overviews:
+                enrollment._course_overview = overviews[enrollment.course_id]  # pylint: disable=protected-access
+
+    def is_paid_course(self, modes_dict=None):
         """
         Returns True, if course is paid
+
+        `modes_dict` are the course's modes, if they have already been loaded.
         """
-        paid_course = CourseMode.is_white_label(self.course_id)
+        paid_course = CourseMode.is_white_label(self.course_id, modes_dict=modes_dict)
         if paid_course or CourseMode.is_professional_slug(self.mode):
             return True
 
@@ -1289,10 +1316,14 @@ class CourseEnrollment(models.Model):
         """Changes this `CourseEnrollment` record's mode to `mode`.  Saves immediately."""
         self.update_enrollment(mode=mode)
 
-    def refundable(self):
+    def refundable(self, has_certificate=None, modes=None):
         """
         For paid/verified certificates, students may receive a refund if they have
         a verified certificate and the deadline for refunds has not yet passed.
+
+        `has_certificate` (whether the student has been given a certificate)
+        and `modes` (the course's modes) avoid database queries when they
+        have already been loaded.
         """
         # In order to support manual refunds past the deadline, set can_refund on this object.
         # On unenrolling, the "UNENROLL_DONE" signal calls CertificateItem.refund_cert_callback(),
@@ -1303,12 +1334,14 @@ class CourseEnrollment(models.Model):
             return True
 
         # If the student has already been given a certificate they should not be refunded
-        if GeneratedCertificate.certificate_for_student(self.user, self.course_id) is not None:
+        if has_certificate is None:
+            has_certificate = GeneratedCertificate.certificate_for_student(self.user, self.course_id) is not None
+        if has_certificate:
             return False
 
         #TODO - When Course administrators to define a refund period for paid courses then refundable will be supported. # pylint: disable=fixme
 
-        course_mode = CourseMode.mode_for_course(self.course_id, 'verified')
+        course_mode = CourseMode.mode_for_course(self.course_id, 'verified', modes=modes)
         if course_mode is None:
             return False
         else:
@@ -1348,6 +1381,25 @@ class CourseEnrollment(models.Model):
         return CourseMode.is_verified_slug(self.mode)
 
 
+def invalidate_dashboard_data(user_id):
+    """
+    Forget the cached dashboard data of the user with id `user_id`.
+    """
+    cache.delete(DASHBOARD_DATA_CACHE_KEY.format(user_id=user_id))
+
+
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+@receiver(post_save, sender=GeneratedCertificate)
+@receiver(post_delete, sender=GeneratedCertificate)
+def invalidate_dashboard_data_callback(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forget a user's cached dashboard data when their enrollments or
+    certificates change.
+    """
+    invalidate_dashboard_data(instance.user_id)
+
+
 class ManualEnrollmentAudit(models.Model):
     """
     Table for tracking which enrollments were performed through manual enrollment.
@@ -0,0 +1,96 @@
+"""
+Tests for loading the student dashboard's data in bulk.
+"""
+import unittest
+from datetime import datetime, timedelta
+
+import pytz
+from django.conf import settings
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.test.utils import override_settings
+
+from certificates.models import CertificateStatuses  # pylint: disable=import-error
+from certificates.tests.factories import GeneratedCertificateFactory  # pylint: disable=import-error
+from student.helpers import get_dashboard_data
+from student.models import CourseEnrollment
+from student.tests.factories import UserFactory, CourseModeFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+class DashboardDataTest(ModuleStoreTestCase):
+    """
+    Tests for `get_dashboard_data`.
+    """
+    def setUp(self):
+        super(DashboardDataTest, self).setUp()
+        self.user = UserFactory.create(username="jack", password="test")
+        self.courses = [CourseFactory.create() for __ in range(3)]
+        for course in self.courses:
+            CourseEnrollment.enroll(self.user, course.id)
+        self.course_ids = [course.id for course in self.courses]
+        cache.clear()
+
+    def test_data(self):
+        CourseModeFactory.create(
+            course_id=self.course_ids[0], mode_slug='verified',
+            expiration_datetime=datetime.now(pytz.UTC) - timedelta(days=1)
+        )
+        CourseModeFactory.create(course_id=self.course_ids[0], mode_slug='credit')
+        GeneratedCertificateFactory.create(
+            user=self.user, course_id=self.course_ids[1], status=CertificateStatuses.downloadable,
+            download_url='http://example.com/cert.pdf', grade='0.9'
+        )
+
+        data = get_dashboard_data(self.user, self.course_ids)
+
+        self.assertEqual(
+            sorted(mode.slug for mode in data['all_course_modes'][self.course_ids[0]]), ['credit', 'verified']
+        )
+        self.assertEqual([mode.slug for mode in data['unexpired_course_modes'][self.course_ids[0]]], ['credit'])
+        self.assertEqual([mode.slug for mode in data['selectable_course_modes'][self.course_ids[0]]], ['honor'])
+        self.assertEqual(data['certificate_course_ids'], frozenset([self.course_ids[1]]))
+        self.assertEqual(data['certificate_statuses'][self.course_ids[1]]['download_url'], 'http://example.com/cert.pdf')
+        self.assertEqual(data['certificate_statuses'][self.course_ids[2]]['status'], CertificateStatuses.unavailable)
+        self.assertEqual(data['blocked_course_ids'], frozenset())
+
+    def test_queries_per_data_type(self):
+        with self.assertNumQueries(4):
+            get_dashboard_data(self.user, self.course_ids)
+
+    @override_settings(DASHBOARD_DATA_CACHE_TIMEOUT=60)
+    def test_cached_until_certificates_change(self):
+        get_dashboard_data(self.user, self.course_ids)
+        # Only the certificates are cached
+        with self.assertNumQueries(3):
+            data = get_dashboard_data(self.user, self.course_ids)
+        self.assertEqual(data['certificate_course_ids'], frozenset())
+
+        GeneratedCertificateFactory.create(user=self.user, course_id=self.course_ids[0])
+        data = get_dashboard_data(self.user, self.course_ids)
+        self.assertEqual(data['certificate_course_ids'], frozenset([self.course_ids[0]]))
+
+    @override_settings(DASHBOARD_DATA_CACHE_TIMEOUT=60)
+    def test_course_modes_not_cached(self):
+        get_dashboard_data(self.user, self.course_ids)
+        CourseModeFactory.create(course_id=self.course_ids[1], mode_slug='verified')
+        data = get_dashboard_data(self.user, self.course_ids)
+        self.assertIn('verified', [mode.slug for mode in data['all_course_modes'][self.course_ids[1]]])
+
+    @override_settings(DASHBOARD_DATA_CACHE_TIMEOUT=60)
+    def test_cached_until_enrollments_change(self):
+        get_dashboard_data(self.user, self.course_ids)
+        CourseEnrollment.unenroll(self.user, self.course_ids[0])
+        with self.assertNumQueries(4):
+            get_dashboard_data(self.user, self.course_ids)
+
+    @override_settings(DASHBOARD_DATA_CACHE_TIMEOUT=60)
+    def test_dashboard(self):
+        self.client.login(username="jack", password="test")
+        for __ in range(2):
+            response = self.client.get(reverse('dashboard'))
+            self.assertEqual(response.status_code, 200)
+            for course in self.courses:
+                self.assertContains(response, course.display_name)
@@ -73,7 +73,7 @@ from xmodule.modulestore import ModuleStoreEnum
 
 from collections import namedtuple
 
-from courseware.courses import get_courses, sort_by_announcement, sort_by_start_date  # pylint: disable=import-error
+from courseware.courses import get_sorted_courses, render_course_listing  # pylint: disable=import-error
 from courseware.access import has_access
 
 from django_comment_common.models import Role
@@ -85,7 +85,7 @@ from external_auth.login_and_register import (
     register as external_auth_register
 )
 
-from bulk_email.models import Optout, CourseAuthorization
+from bulk_email.models import Optout
 import shoppingcart
 from lang_pref import LANGUAGE_KEY
 
@@ -109,12 +109,12 @@ from util.password_policy_validators import (
 import third_party_auth
 from third_party_auth import pipeline, provider
 from student.helpers import (
-    check_verify_status_by_course,
+    check_verify_status_by_course, get_dashboard_data,
     auth_pipeline_urls, get_next_url_for_login_page
 )
 from student.cookies import set_logged_in_cookies, delete_logged_in_cookies
 from student.models import anonymous_id_for_user
-from shoppingcart.models import DonationConfiguration, CourseRegistrationCode
+from shoppingcart.models import DonationConfiguration
 
 from embargo import api as embargo_api
 
@@ -162,14 +162,14 @@ def index(request, extra_context=None, user=AnonymousUser()):
     if domain is False:
         domain = request.META.get('HTTP_HOST')
 
-    courses = get_courses(user, domain=domain)
-    if microsite.get_value("ENABLE_COURSE_SORTING_BY_START_DATE",
-                           settings.FEATURES["ENABLE_COURSE_SORTING_BY_START_DATE"]):
-        courses = sort_by_start_date(courses)
-    else:
-        courses = sort_by_announcement(courses)
+    # One more course than shown is enough to know whether to link to all the courses
+    max_courses = settings.HOMEPAGE_COURSE_MAX
+    courses = get_sorted_courses(user, domain=domain, limit=max_courses + 1 if max_courses else None)
+    course_listing_html = ''
+    if settings.FEATURES.get('COURSES_ARE_BROWSABLE'):
+        course_listing_html = render_course_listing(courses[:max_courses])
 
-    context = {'courses': courses}
+    context = {'courses': courses, 'course_listing_html': course_listing_html}
 
     context.update(extra_context)
     return render_to_response('index.html', context)
@@ -183,7 +183,7 @@ def process_survey_link(survey_link, user):
     return survey_link.format(UNIQUE_ID=unique_id_for_user(user))
 
 
-def cert_info(user, course_overview, course_mode):
+def cert_info(user, course_overview, course_mode, cert_status=None):
     """
     Get the certificate info needed to render the dashboard section for the given
     student and course.
@@ -192,6 +192,8 @@ def cert_info(user, course_overview, course_mode):
         user (User): A user.
         course_overview (CourseOverview): A course.
         course_mode (str): The enrollment mode (honor, verified, audit, etc.)
+        cert_status (dict): The `certificate_status_for_student` of the user
+            in the course, if it has already been loaded.
 
     Returns:
         dict: A dictionary with keys:
@@ -205,12 +207,9 @@ def cert_info(user, course_overview, course_mode):
     """
     if not course_overview.may_certify():
         return {}
-    return _cert_info(
-        user,
-        course_overview,
-        certificate_status_for_student(user, course_overview.id),
-        course_mode
-    )
+    if cert_status is None:
+        cert_status = certificate_status_for_student(user, course_overview.id)
+    return _cert_info(user, course_overview, cert_status, course_mode)
 
 
 def reverification_info(statuses):
@@ -251,7 +250,9 @@ def get_course_enrollments(user, org_to_include, orgs_to_exclude):
         generator[CourseEnrollment]: a sequence of enrollments to be displayed
         on the user's dashboard.
     """
-    for enrollment in CourseEnrollment.enrollments_for_user(user):
+    enrollments = list(CourseEnrollment.enrollments_for_user(user))
+    CourseEnrollment.load_course_overviews(enrollments)
+    for enrollment in enrollments:
 
         # If the course is missing or broken, log an error and skip it.
         course_overview = enrollment.course_overview
@@ -494,20 +495,27 @@ def is_course_blocked(request, redeemed_registration_codes, course_key):
         if redeemed_registration.invoice_item:
             if not getattr(redeemed_registration.invoice_item.invoice, 'is_valid'):
                 blocked = True
-                # disabling email notifications for unpaid registration courses
-                Optout.objects.get_or_create(user=request.user, course_id=course_key)
-                log.info(
-                    u"User %s (%s) opted out of receiving emails from course %s",
-                    request.user.username,
-                    request.user.email,
-                    course_key
-                )
-                track.views.server_track(request, "change-email1-settings", {"receive_emails": "no", "course": course_key.to_deprecated_string()}, page='dashboard')
+                _opt_out_of_blocked_course(request, course_key)
                 break
 
     return blocked
 
 
+def _opt_out_of_blocked_course(request, course_key):
+    """
+    Disable email notifications for a course the user registered for with
+    an unpaid registration code.
+    """
+    Optout.objects.get_or_create(user=request.user, course_id=course_key)
+    log.info(
+        u"User %s (%s) opted out of receiving emails from course %s",
+        request.user.username,
+        request.user.email,
+        course_key
+    )
+    track.views.server_track(request, "change-email1-settings", {"receive_emails": "no", "course": course_key.to_deprecated_string()}, page='dashboard')
+
+
 @login_required
 @ensure_csrf_cookie
 def dashboard(request):
@@ -535,9 +543,11 @@ def dashboard(request):
     # sort the enrollment pairs by the enrollment date
     course_enrollments.sort(key=lambda x: x.created, reverse=True)
 
-    # Retrieve the course modes for each course
+    # Retrieve the course modes, certificates, etc. for all the courses at once
     enrolled_course_ids = [enrollment.course_id for enrollment in course_enrollments]
-    all_course_modes, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(enrolled_course_ids)
+    dashboard_data = get_dashboard_data(user, enrolled_course_ids)
+    all_course_modes = dashboard_data['all_course_modes']
+    unexpired_course_modes = dashboard_data['unexpired_course_modes']
     course_modes_by_course = {
         course_id: {
             mode.slug: mode
@@ -606,7 +616,10 @@ def dashboard(request):
         all_course_modes
     )
     cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview, enrollment.mode)
+        enrollment.course_id: cert_info(
+            request.user, enrollment.course_overview, enrollment.mode,
+            cert_status=dashboard_data['certificate_statuses'][enrollment.course_id]
+        )
         for enrollment in course_enrollments
     }
 
@@ -615,7 +628,7 @@ def dashboard(request):
         enrollment.course_id for enrollment in course_enrollments if (
             settings.FEATURES['ENABLE_INSTRUCTOR_EMAIL'] and
             modulestore().get_modulestore_type(enrollment.course_id) != ModuleStoreEnum.Type.xml and
-            CourseAuthorization.instructor_email_enabled(enrollment.course_id)
+            enrollment.course_id in dashboard_data['email_enabled_course_ids']
         )
     )
 
@@ -627,26 +640,26 @@ def dashboard(request):
     statuses = ["approved", "denied", "pending", "must_reverify"]
     reverifications = reverification_info(statuses)
 
+    selectable_course_modes = dashboard_data['selectable_course_modes']
     show_refund_option_for = frozenset(
         enrollment.course_id for enrollment in course_enrollments
-        if enrollment.refundable()
-    )
-
-    block_courses = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if is_course_blocked(
-            request,
-            CourseRegistrationCode.objects.filter(
-                course_id=enrollment.course_id,
-                registrationcoderedemption__redeemed_by=request.user
-            ),
-            enrollment.course_id
+        if enrollment.refundable(
+            has_certificate=enrollment.course_id in dashboard_data['certificate_course_ids'],
+            modes=selectable_course_modes[enrollment.course_id]
         )
     )
 
+    block_courses = dashboard_data['blocked_course_ids']
+    for course_key in block_courses:
+        _opt_out_of_blocked_course(request, course_key)
+
     enrolled_courses_either_paid = frozenset(
         enrollment.course_id for enrollment in course_enrollments
-        if enrollment.is_paid_course()
+        if enrollment.is_paid_course(
+            modes_dict=CourseMode.modes_for_course_dict(
+                enrollment.course_id, modes=selectable_course_modes[enrollment.course_id]
+            )
+        )
     )
 
     # If there are *any* denied reverifications that have not been toggled off,
@@ -16,14 +16,16 @@ class Registry(object):
     @classmethod
     def _enabled_providers(cls):
         """ Helper method to iterate over all providers """
+        oauth2_providers = OAuth2ProviderConfig.current_many((backend_name, ) for backend_name in _PSA_OAUTH2_BACKENDS)
         for backend_name in _PSA_OAUTH2_BACKENDS:
-            provider = OAuth2ProviderConfig.current(backend_name)
+            provider = oauth2_providers[(backend_name, )]
             if provider.enabled:
                 yield provider
         if SAMLConfiguration.is_enabled():
             idp_slugs = SAMLProviderConfig.key_values('idp_slug', flat=True)
+            saml_providers = SAMLProviderConfig.current_many((idp_slug, ) for idp_slug in idp_slugs)
             for idp_slug in idp_slugs:
-                provider = SAMLProviderConfig.current(idp_slug)
+                provider = saml_providers[(idp_slug, )]
                 if provider.enabled and provider.backend_name in _PSA_SAML_BACKENDS:
                     yield provider
 
@@ -2,8 +2,14 @@
 
 from __future__ import absolute_import
 
+import atexit
 import logging
+import os
+import Queue
+import threading
+import time
 
+from dogapi import dog_stats_api
 import pymongo
 from pymongo import MongoClient
 from pymongo.errors import PyMongoError
@@ -97,3 +103,125 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+
+class BufferedMongoBackend(MongoBackend):
+    """
+    MongoDB event tracker backend that inserts events in batches from a
+    background thread, so that tracking doesn't wait on MongoDB.
+
+    Takes the same parameters as `MongoBackend`, and:
+
+      - `batch_size`: most events inserted at once
+      - `flush_interval`: longest time in seconds an event waits to be
+        inserted while a batch is filling up
+      - `max_queue_size`: most events waiting to be inserted. Events sent
+        while the queue is full are dropped and counted, rather than
+        blocking the request.
+
+    """
+
+    def __init__(self, **kwargs):
+        self.batch_size = kwargs.pop('batch_size', 100)
+        self.flush_interval = kwargs.pop('flush_interval', 1.0)
+        self.max_queue_size = kwargs.pop('max_queue_size', 10000)
+        super(BufferedMongoBackend, self).__init__(**kwargs)
+
+        self.dropped = 0
+        self._queue = Queue.Queue(self.max_queue_size)
+        self._worker = None
+        self._pid = None
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def send(self, event):
+        """Queue the event to be inserted in to the Mongo collection"""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(event)
+        except Queue.Full:
+            with self._lock:
+                self.dropped += 1
+            dog_stats_api.increment('track.mongodb.dropped')
+
+    def flush(self):
+        """Insert all the queued events now"""
+        while True:
+            batch = self._get_batch(block=False)
+            if not batch:
+                return
+            self._insert(batch)
+
+    def _ensure_worker(self):
+        """
+        Start the background thread, unless it is running in this process
+        already. Threads don't survive a fork, so a forked process starts its
+        own, with an empty queue. A thread that died is restarted, keeping
+        the queued events.
+        """
+        if self._pid == os.getpid() and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid() or not self._worker.is_alive():
+                if self._pid != os.getpid():
+                    self._queue = Queue.Queue(self.max_queue_size)
+                self._worker = threading.Thread(target=self._run, name='BufferedMongoBackend')
+                self._worker.daemon = True
+                self._worker.start()
+                self._pid = os.getpid()
+
+    def _run(self):
+        """Insert batches of events as they are queued, forever"""
+        while True:
+            try:
+                self._insert(self._get_batch(block=True))
+            except Exception:  # pylint: disable=broad-except
+                # Keep inserting the next events rather than let the thread die.
+                log.exception('Error in MongoDB event tracker backend thread')
+
+    def _get_batch(self, block):
+        """
+        Return up to `batch_size` queued events.
+
+        If `block` is true, wait for a first event, then for up to
+        `flush_interval` seconds for the batch to fill up.
+        """
+        batch = []
+        try:
+            batch.append(self._queue.get(block=block))
+        except Queue.Empty:
+            return batch
+        deadline = time.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                if block:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except Queue.Empty:
+                break
+        return batch
+
+    def _insert(self, batch):
+        """Insert the events of `batch` in to the Mongo collection"""
+        try:
+            self.collection.insert(batch, manipulate=False, continue_on_error=True)
+        except BSONError:
+            if len(batch) == 1:
+                log.exception('Error inserting to MongoDB event tracker backend')
+                dog_stats_api.increment('track.mongodb.failed')
+                return
+            # An event that can't be encoded fails the whole batch before any
+            # of it is sent, so insert the events one at a time to only lose
+            # that one.
+            for event in batch:
+                self._insert([event])
+        except PyMongoError:
+            # As with MongoBackend, the events are lost.
+            log.exception('Error inserting to MongoDB event tracker backend')
+            dog_stats_api.increment('track.mongodb.failed', value=len(batch))
+        else:
+            dog_stats_api.increment('track.mongodb.inserted', value=len(batch))
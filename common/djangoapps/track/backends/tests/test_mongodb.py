@@ -1,10 +1,13 @@
 from __future__ import absolute_import
 
+import time
+
+from bson.errors import InvalidDocument
 from mock import patch
 
 from django.test import TestCase
 
-from track.backends.mongodb import MongoBackend
+from track.backends.mongodb import BufferedMongoBackend, MongoBackend
 
 
 class TestMongoBackend(TestCase):
@@ -37,3 +40,70 @@ class TestMongoBackend(TestCase):
 
         self.assertEqual(events[0], first_argument(calls[0]))
         self.assertEqual(events[1], first_argument(calls[1]))
+
+
+class TestBufferedMongoBackend(TestCase):
+    def setUp(self):
+        super(TestBufferedMongoBackend, self).setUp()
+        self.mongo_patcher = patch('track.backends.mongodb.MongoClient')
+        self.mongo_patcher.start()
+        self.addCleanup(self.mongo_patcher.stop)
+
+        self.backend = BufferedMongoBackend(batch_size=2, flush_interval=0.01, max_queue_size=3)
+
+    def inserted_batches(self):
+        return [args[0] for _, args, _ in self.backend.collection.insert.mock_calls]
+
+    def test_events_are_inserted_in_batches(self):
+        events = [{'test': 1}, {'test': 2}, {'test': 3}]
+        # Without the background thread, events are inserted by flush().
+        with patch.object(self.backend, '_ensure_worker'):
+            for event in events:
+                self.backend.send(event)
+        self.assertEqual(self.inserted_batches(), [])
+
+        self.backend.flush()
+        self.assertEqual(self.inserted_batches(), [events[:2], events[2:]])
+
+    def test_events_are_dropped_when_queue_is_full(self):
+        events = [{'test': i} for i in range(5)]
+        with patch.object(self.backend, '_ensure_worker'):
+            for event in events:
+                self.backend.send(event)
+        self.assertEqual(self.backend.dropped, 2)
+
+        self.backend.flush()
+        self.assertEqual(self.inserted_batches(), [events[:2], events[2:3]])
+
+    def test_background_thread_inserts_events(self):
+        events = [{'test': 1}, {'test': 2}]
+        for event in events:
+            self.backend.send(event)
+        for __ in range(100):
+            if sum(len(batch) for batch in self.inserted_batches()) == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual(sum(self.inserted_batches(), []), events)
+
+    def test_invalid_event_only_loses_itself(self):
+        events = [{'test': 1}, {'test.bad': 2}]
+
+        def insert(batch, **kwargs):  # pylint: disable=unused-argument
+            if any('test.bad' in event for event in batch):
+                raise InvalidDocument("key 'test.bad' must not contain '.'")
+        self.backend.collection.insert.side_effect = insert
+
+        self.backend._insert(events)  # pylint: disable=protected-access
+        self.assertEqual(self.inserted_batches(), [events, events[:1], events[1:]])
+
+    def test_dead_thread_is_restarted(self):
+        with patch.object(self.backend, '_run'):
+            self.backend.send({'test': 1})
+        self.backend._worker.join()  # pylint: disable=protected-access
+
+        self.backend.send({'test': 2})
+        for __ in range(100):
+            if sum(len(batch) for batch in self.inserted_batches()) == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual(sum(self.inserted_batches(), []), [{'test': 1}, {'test': 2}])
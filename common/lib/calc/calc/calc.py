@@ -4,9 +4,11 @@ Parser and evaluator for FormulaResponse and NumericalResponse
 Uses pyparsing to parse. Main function as of now is evaluator().
 """
 
+from collections import OrderedDict
 import math
 import operator
 import numbers
+import threading
 import numpy
 import scipy.constants
 import functions
@@ -50,6 +52,14 @@ DEFAULT_FUNCTIONS = {
     'arccsch': functions.arccsch,
     'arccoth': functions.arccoth
 }
+# Functions of DEFAULT_FUNCTIONS that aren't numpy ufuncs but work on whole
+# numpy arrays, see `vectorized_evaluator`.
+VECTORIZED_FUNCTIONS = frozenset([
+    functions.sec, functions.csc, functions.cot,
+    functions.arcsec, functions.arccsc,
+    functions.sech, functions.csch, functions.coth,
+    functions.arcsech, functions.arccsch, functions.arccoth,
+])
 DEFAULT_VARIABLES = {
     'i': numpy.complex(0, 1),
     'j': numpy.complex(0, 1),
@@ -73,6 +83,16 @@ SUFFIXES = {
 }
 
 
+# How many parse trees to keep around. Problems evaluate the same instructor
+# answers over and over (once per sample, for every submission), so these are
+# worth keeping.
+PARSE_CACHE_SIZE = 1024
+
+_ALGEBRA_GRAMMAR = None
+_PARSE_CACHE = OrderedDict()
+_PARSE_CACHE_LOCK = threading.Lock()
+
+
 class UndefinedVariable(Exception):
     """
     Indicate when a student inputs a variable which was not expected.
@@ -258,6 +278,253 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     return math_interpreter.reduce_tree(evaluate_actions)
 
 
+# The following functions are the evaluation actions used by
+# vectorized_evaluator, where values may be numpy arrays holding one value per
+# sample. Those can't be told apart from operators with `numbers.Number`, nor
+# compared with strings, so only strings are treated as operators.
+
+def eval_atom_vectorized(parse_result):
+    """
+    Return the value wrapped by the atom, like `eval_atom`.
+    """
+    return next(k for k in parse_result if not isinstance(k, basestring))
+
+
+def eval_power_vectorized(parse_result):
+    """
+    Exponentiate the values right to left, like `eval_power`.
+    """
+    parse_result = reversed([k for k in parse_result if not isinstance(k, basestring)])
+    return reduce(lambda a, b: b ** a, parse_result)
+
+
+def eval_parallel_vectorized(parse_result):
+    """
+    Apply the parallel resistors operator, like `eval_parallel`.
+
+    The result is NaN for the samples where any of the inputs is zero.
+    """
+    values = [k for k in parse_result if not isinstance(k, basestring)]
+    if len(values) == 1:
+        return values[0]
+    if not any(isinstance(value, numpy.ndarray) for value in values):
+        return eval_parallel(values)
+    has_zero = reduce(numpy.logical_or, [numpy.equal(value, 0) for value in values])
+    reciprocals = [1. / numpy.where(has_zero, 1, value) for value in values]
+    return numpy.where(has_zero, float('nan'), 1. / sum(reciprocals))
+
+
+def eval_sum_vectorized(parse_result):
+    """
+    Add the inputs, keeping in mind their sign, like `eval_sum`.
+    """
+    total = 0.0
+    current_op = operator.add
+    for token in parse_result:
+        if not isinstance(token, basestring):
+            total = current_op(total, token)
+        elif token == '+':
+            current_op = operator.add
+        elif token == '-':
+            current_op = operator.sub
+    return total
+
+
+def eval_product_vectorized(parse_result):
+    """
+    Multiply the inputs, like `eval_product`.
+    """
+    prod = 1.0
+    current_op = operator.mul
+    for token in parse_result:
+        if not isinstance(token, basestring):
+            prod = current_op(prod, token)
+        elif token == '*':
+            current_op = operator.mul
+        elif token == '/':
+            current_op = operator.truediv
+    return prod
+
+
+def apply_vectorized(function, arg):
+    """
+    Apply `function` to `arg`, one sample at a time unless `function` is known
+    to work on numpy arrays.
+    """
+    if numpy.ndim(arg) == 0 or isinstance(function, numpy.ufunc) or function in VECTORIZED_FUNCTIONS:
+        return function(arg)
+    result = numpy.array([function(value) for value in arg])
+    if result.dtype.kind not in 'fc':
+        # e.g. the ints returned by factorial
+        result = result.astype(float)
+    return result
+
+
+def vectorized_evaluator(variables, functions, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression for many samples of its variables at once.
+
+    Like `evaluator`, but the values in `variables` may be numpy arrays of the
+    same length, holding one value per sample. Return an array of the results
+    for every sample, or a single number if the expression doesn't depend on
+    any of the arrays.
+
+    `evaluator` raises errors (e.g. ZeroDivisionError) for some samples where
+    numpy would produce infinities or NaNs. So instead, any floating point
+    error other than underflow raises FloatingPointError here. Callers should
+    then use `evaluator` on each sample to get its exact behavior.
+    """
+    if math_expr.strip() == "":
+        return float('nan')
+
+    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+    math_interpreter.parse_algebra()
+
+    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+    math_interpreter.check_variables(all_variables, all_functions)
+
+    if case_sensitive:
+        casify = lambda x: x
+    else:
+        casify = lambda x: x.lower()  # Lowercase for case insens.
+
+    evaluate_actions = {
+        'number': eval_number,
+        'variable': lambda x: all_variables[casify(x[0])],
+        'function': lambda x: apply_vectorized(all_functions[casify(x[0])], x[1]),
+        'atom': eval_atom_vectorized,
+        'power': eval_power_vectorized,
+        'parallel': eval_parallel_vectorized,
+        'product': eval_product_vectorized,
+        'sum': eval_sum_vectorized
+    }
+
+    with numpy.errstate(all='raise', under='ignore'):
+        return math_interpreter.reduce_tree(evaluate_actions)
+
+
+def _build_algebra_grammar():
+    """
+    Build the pyparsing grammar for algebraic expressions.
+
+    Leave all operators in the parse result and do not parse any strings of
+    numbers into their float versions.
+    """
+    # 0.33 or 7 or .34 or 16.
+    number_part = Word(nums)
+    inner_number = (number_part + Optional("." + Optional(number_part))) | ("." + number_part)
+    # pyparsing allows spaces between tokens--`Combine` prevents that.
+    inner_number = Combine(inner_number)
+
+    # SI suffixes and percent.
+    number_suffix = MatchFirst(Literal(k) for k in SUFFIXES.keys())
+
+    # 0.33k or 17
+    plus_minus = Literal('+') | Literal('-')
+    number = Group(
+        Optional(plus_minus) +
+        inner_number +
+        Optional(CaselessLiteral("E") + Optional(plus_minus) + number_part) +
+        Optional(number_suffix)
+    )
+    number = number("number")
+
+    # Predefine recursive variables.
+    expr = Forward()
+
+    # Handle variables passed in. They must start with letters/underscores
+    # and may contain numbers afterward.
+    inner_varname = Word(alphas + "_", alphanums + "_")
+    varname = Group(inner_varname)("variable")
+
+    # Same thing for functions.
+    function = Group(inner_varname + Suppress("(") + expr + Suppress(")"))("function")
+
+    atom = number | function | varname | "(" + expr + ")"
+    atom = Group(atom)("atom")
+
+    # Do the following in the correct order to preserve order of operation.
+    pow_term = atom + ZeroOrMore("^" + atom)
+    pow_term = Group(pow_term)("power")
+
+    par_term = pow_term + ZeroOrMore('||' + pow_term)  # 5k || 4k
+    par_term = Group(par_term)("parallel")
+
+    prod_term = par_term + ZeroOrMore((Literal('*') | Literal('/')) + par_term)  # 7 * 5 / 4
+    prod_term = Group(prod_term)("product")
+
+    sum_term = Optional(plus_minus) + prod_term + ZeroOrMore(plus_minus + prod_term)  # -5 + 4 - 3
+    sum_term = Group(sum_term)("sum")
+
+    # Finish the recursion.
+    expr << sum_term  # pylint: disable=pointless-statement
+    return expr + stringEnd
+
+
+def _algebra_grammar():
+    """
+    Return the grammar for algebraic expressions, building it the first time.
+    """
+    global _ALGEBRA_GRAMMAR  # pylint: disable=global-statement
+    if _ALGEBRA_GRAMMAR is None:
+        _ALGEBRA_GRAMMAR = _build_algebra_grammar()
+    return _ALGEBRA_GRAMMAR
+
+
+def _names_used(tree):
+    """
+    Return the sets of variable names and of function names used in `tree`.
+    """
+    variables_used = set()
+    functions_used = set()
+    nodes = [tree]
+    while nodes:
+        node = nodes.pop()
+        if not isinstance(node, ParseResults):
+            continue
+        node_name = node.getName()
+        if node_name == 'variable':
+            variables_used.add(node[0])
+        elif node_name == 'function':
+            functions_used.add(node[0])
+        nodes.extend(node)
+    return variables_used, functions_used
+
+
+def parse_algebra_cached(math_expr, case_sensitive=False):
+    """
+    Parse `math_expr`, reusing the result of a previous parse of it if any.
+
+    Return a tuple of the parse tree, and the frozensets of the variable and
+    function names used in it. Raise `pyparsing.ParseException` if the
+    expression can't be parsed. The last `PARSE_CACHE_SIZE` results are kept.
+    """
+    key = (math_expr, case_sensitive)
+    with _PARSE_CACHE_LOCK:
+        parsed = _PARSE_CACHE.pop(key, None)
+        if parsed is not None:
+            # Mark it as the most recently used
+            _PARSE_CACHE[key] = parsed
+            return parsed
+
+    tree = _algebra_grammar().parseString(math_expr)[0]
+    variables_used, functions_used = _names_used(tree)
+    parsed = (tree, frozenset(variables_used), frozenset(functions_used))
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE[key] = parsed
+        while len(_PARSE_CACHE) > PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+    return parsed
+
+
+def clear_parse_cache():
+    """
+    Forget all the parse trees kept by `parse_algebra_cached`.
+    """
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE.clear()
+
+
 class ParseAugmenter(object):
     """
     Holds the data for a particular parse.
@@ -278,23 +545,6 @@ class ParseAugmenter(object):
         self.variables_used = set()
         self.functions_used = set()
 
-        def vpa(tokens):
-            """
-            When a variable is recognized, store it in `variables_used`.
-            """
-            varname = tokens[0][0]
-            self.variables_used.add(varname)
-
-        def fpa(tokens):
-            """
-            When a function is recognized, store it in `functions_used`.
-            """
-            varname = tokens[0][0]
-            self.functions_used.add(varname)
-
-        self.variable_parse_action = vpa
-        self.function_parse_action = fpa
-
     def parse_algebra(self):
         """
         Parse an algebraic expression into a tree.
@@ -307,57 +557,9 @@ class ParseAugmenter(object):
         really gross. For debugging, use something like
           print OBJ.tree.asXML()
         """
-        # 0.33 or 7 or .34 or 16.
-        number_part = Word(nums)
-        inner_number = (number_part + Optional("." + Optional(number_part))) | ("." + number_part)
-        # pyparsing allows spaces between tokens--`Combine` prevents that.
-        inner_number = Combine(inner_number)
-
-        # SI suffixes and percent.
-        number_suffix = MatchFirst(Literal(k) for k in SUFFIXES.keys())
-
-        # 0.33k or 17
-        plus_minus = Literal('+') | Literal('-')
-        number = Group(
-            Optional(plus_minus) +
-            inner_number +
-            Optional(CaselessLiteral("E") + Optional(plus_minus) + number_part) +
-            Optional(number_suffix)
-        )
-        number = number("number")
-
-        # Predefine recursive variables.
-        expr = Forward()
-
-        # Handle variables passed in. They must start with letters/underscores
-        # and may contain numbers afterward.
-        inner_varname = Word(alphas + "_", alphanums + "_")
-        varname = Group(inner_varname)("variable")
-        varname.setParseAction(self.variable_parse_action)
-
-        # Same thing for functions.
-        function = Group(inner_varname + Suppress("(") + expr + Suppress(")"))("function")
-        function.setParseAction(self.function_parse_action)
-
-        atom = number | function | varname | "(" + expr + ")"
-        atom = Group(atom)("atom")
-
-        # Do the following in the correct order to preserve order of operation.
-        pow_term = atom + ZeroOrMore("^" + atom)
-        pow_term = Group(pow_term)("power")
-
-        par_term = pow_term + ZeroOrMore('||' + pow_term)  # 5k || 4k
-        par_term = Group(par_term)("parallel")
-
-        prod_term = par_term + ZeroOrMore((Literal('*') | Literal('/')) + par_term)  # 7 * 5 / 4
-        prod_term = Group(prod_term)("product")
-
-        sum_term = Optional(plus_minus) + prod_term + ZeroOrMore(plus_minus + prod_term)  # -5 + 4 - 3
-        sum_term = Group(sum_term)("sum")
-
-        # Finish the recursion.
-        expr << sum_term  # pylint: disable=pointless-statement
-        self.tree = (expr + stringEnd).parseString(self.math_expr)[0]
+        self.tree, variables_used, functions_used = parse_algebra_cached(self.math_expr, self.case_sensitive)
+        self.variables_used = set(variables_used)
+        self.functions_used = set(functions_used)
 
     def reduce_tree(self, handle_actions, terminal_converter=None):
         """
@@ -0,0 +1,72 @@
+"""
+Micro-benchmark for calc.evaluator
+
+Compares the throughput of evaluating the same expression many times, the way
+FormulaResponse does for every sample of every submission:
+
+ - rebuilding the grammar and parsing on every call (as before the grammar
+   and the parse trees were cached),
+ - parsing on every call with the grammar built once,
+ - reusing the cached parse tree.
+
+Run with `python -m calc.tests.benchmark_calc` from common/lib/calc.
+"""
+
+import timeit
+
+from mock import patch
+
+import calc
+
+EXPRESSIONS = [
+    '3*x^2 + 2*x - 1',
+    'sqrt(x^2 + y^2) / (2*pi*R1 || R2)',
+    'sin(omega*t + phi)*exp(-t/tau) + 1.5k',
+]
+VARIABLES = {'x': 1.5, 'y': 2.0, 'R1': 10.0, 'R2': 20.0, 'omega': 3.0, 't': 0.5, 'phi': 0.1, 'tau': 2.0}
+REPEAT = 3
+NUMBER = 300
+
+
+def evaluate_all():
+    """
+    Evaluate each of EXPRESSIONS once.
+    """
+    for expression in EXPRESSIONS:
+        calc.evaluator(VARIABLES, {}, expression)
+
+
+def evaluate_all_uncached():
+    """
+    Evaluate each of EXPRESSIONS, parsing each of them again.
+    """
+    calc.clear_parse_cache()
+    evaluate_all()
+
+
+def throughput(func):
+    """
+    Return the best number of evaluations per second of `func`.
+    """
+    best = min(timeit.repeat(func, repeat=REPEAT, number=NUMBER))
+    return NUMBER * len(EXPRESSIONS) / best
+
+
+def main():
+    """
+    Print the evaluator throughput with and without the caches.
+    """
+    with patch('calc.calc._algebra_grammar', calc.calc._build_algebra_grammar):  # pylint: disable=protected-access
+        rebuilt = throughput(evaluate_all_uncached)
+    parsed = throughput(evaluate_all_uncached)
+    cached = throughput(evaluate_all)
+    calc.clear_parse_cache()
+
+    print "Evaluations per second"
+    print "  grammar rebuilt, no parse cache: {:10.0f}".format(rebuilt)
+    print "  grammar reused, no parse cache:  {:10.0f}".format(parsed)
+    print "  grammar reused, parse cache:     {:10.0f} ({:.1f}x)".format(cached, cached / rebuilt)
+
+
+if __name__ == '__main__':
+    main()
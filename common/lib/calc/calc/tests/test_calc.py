@@ -5,6 +5,7 @@ Unit tests for calc.py
 import unittest
 import numpy
 import calc
+from mock import patch
 from pyparsing import ParseException
 
 # numpy's default behavior when it evaluates a function outside its domain
@@ -559,3 +560,89 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class ParseCacheTest(unittest.TestCase):
+    """
+    Test that parse trees are reused across evaluations of the same expression
+    """
+
+    def setUp(self):
+        super(ParseCacheTest, self).setUp()
+        calc.clear_parse_cache()
+        self.addCleanup(calc.clear_parse_cache)
+
+    def test_expression_parsed_once(self):
+        """
+        Evaluating the same expression again reuses the first parse
+        """
+        with patch('calc.calc._algebra_grammar', wraps=calc.calc._algebra_grammar) as mock_grammar:
+            for x_value in range(5):
+                self.assertEqual(calc.evaluator({'x': x_value}, {}, '2*x+1'), 2 * x_value + 1)
+        self.assertEqual(mock_grammar.call_count, 1)
+
+    def test_variables_checked_on_cached_parse(self):
+        """
+        Undefined variables are still caught when the parse comes from the cache
+        """
+        self.assertEqual(calc.evaluator({'x': 1}, {'f': lambda x: x}, 'f(x)'), 1)
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'x'):
+            calc.evaluator({}, {'f': lambda x: x}, 'f(x)')
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'f'):
+            calc.evaluator({'x': 1}, {}, 'f(x)')
+
+    def test_least_recently_used_evicted(self):
+        """
+        Only the `PARSE_CACHE_SIZE` most recently used parses are kept
+        """
+        with patch('calc.calc.PARSE_CACHE_SIZE', 2):
+            calc.parse_algebra_cached('1+1')
+            calc.parse_algebra_cached('2+2')
+            calc.parse_algebra_cached('1+1')
+            calc.parse_algebra_cached('3+3')
+            self.assertEqual(
+                calc.calc._PARSE_CACHE.keys(),  # pylint: disable=protected-access
+                [('1+1', False), ('3+3', False)]
+            )
+
+
+class VectorizedEvaluatorTest(unittest.TestCase):
+    """
+    Test calc.vectorized_evaluator against calc.evaluator
+    """
+
+    def assert_matches_evaluator(self, math_expr, samples):
+        """
+        Evaluating all `samples` at once matches evaluating them one by one
+        """
+        result = calc.vectorized_evaluator({'x': numpy.array(samples)}, {}, math_expr)
+        result = numpy.resize(result, len(samples))
+        for value, sample in zip(result, samples):
+            expected = calc.evaluator({'x': sample}, {}, math_expr)
+            if numpy.isnan(expected):
+                self.assertTrue(numpy.isnan(value))
+            else:
+                self.assertAlmostEqual(value, expected)
+
+    def test_matches_evaluator(self):
+        """
+        Test operators, functions and complex numbers on arrays
+        """
+        samples = [-3.5, -1.0, 0.5, 2.0, 7.25]
+        for math_expr in ['x', '-x^2 + 3*x - 1', '2^x^2', '1.5k*x/4 - 10%', 'x || 2 || 4', 'x || 0',
+                          'sin(x)*e^(i*x)', 'arccot(x)', 'sec(x) + coth(x)', 'fact(3)*x', 'abs(x)', '42']:
+            self.assert_matches_evaluator(math_expr, samples)
+
+    def test_floating_point_errors(self):
+        """
+        Samples for which evaluator wouldn't return a number raise an error
+        """
+        samples = numpy.array([-1.0, 0.0, 1.0])
+        for math_expr in ['1/x', 'x^0.5', 'ln(x)']:
+            with self.assertRaises(FloatingPointError):
+                calc.vectorized_evaluator({'x': samples}, {}, math_expr)
+
+        with self.assertRaises(ValueError):
+            calc.vectorized_evaluator({'x': samples}, {}, 'fact(x)')
+        with self.assertRaises(calc.UndefinedVariable):
+            calc.vectorized_evaluator({'x': samples}, {}, 'x+y')
@@ -36,7 +36,7 @@ from shapely.geometry import Point, MultiPoint
 import dogstats_wrapper as dog_stats_api
 
 # specific library imports
-from calc import evaluator, UndefinedVariable
+from calc import evaluator, vectorized_evaluator, UndefinedVariable
 from . import correctmap
 from .registry import TagRegistry
 from datetime import datetime
@@ -2792,6 +2792,13 @@ class FormulaResponse(LoncapaResponse):
         Each dictionary represents a test case for the answer.
         Returns a tuple of formula evaluation results.
         """
+        try:
+            return self.tupleize_answers_vectorized(answer, var_dict_list)
+        except Exception:  # pylint: disable=broad-except
+            # Evaluate the test cases one at a time instead, which reports
+            # the problem with the answer
+            pass
+
         _ = self.capa_system.i18n.ugettext
 
         out = []
@@ -2845,6 +2852,25 @@ class FormulaResponse(LoncapaResponse):
                 )
         return out
 
+    def tupleize_answers_vectorized(self, answer, var_dict_list):
+        """
+        Evaluates the answer for all the test cases of `var_dict_list` in one
+        pass over NumPy arrays, see `tupleize_answers`.
+
+        Raises an exception for any answer that can't be evaluated that way,
+        including any answer that `tupleize_answers` would reject.
+        """
+        samples = {}
+        if var_dict_list:
+            for var in var_dict_list[0]:
+                samples[var] = numpy.array([var_dict[var] for var_dict in var_dict_list])
+
+        result = vectorized_evaluator(samples, dict(), answer, case_sensitive=self.case_sensitive)
+        if numpy.ndim(result) == 0:
+            # The answer doesn't depend on the variables
+            return [result] * len(var_dict_list)
+        return result.tolist()
+
     def randomize_variables(self, samples):
         """
         Returns a list of dictionaries mapping variables to random values in range,
@@ -0,0 +1,67 @@
+"""
+A small in-process cache for safe_exec results.
+
+`safe_exec` results are cached in the cache given by the caller (memcached in
+the LMS). Many learners get the same random seed, so the same results are
+looked up over and over: keeping the most recently used ones in the process
+avoids the round trip to the shared cache.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+
+class LocalResultCache(object):
+    """
+    A thread-safe LRU cache of safe_exec results, bounded by size in bytes.
+
+    Results are stored serialized, so that callers can't change the cached
+    results by changing the globals they got from it, and so that their size
+    is known. Results bigger than `max_item_bytes` aren't kept.
+    """
+    def __init__(self, max_bytes, max_item_bytes=None):
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes or max_bytes // 10
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the result cached for `key`, or None.
+        """
+        with self._lock:
+            data = self._items.pop(key, None)
+            if data is None:
+                return None
+            self._items[key] = data
+        return json.loads(data)
+
+    def set(self, key, value):
+        """
+        Cache the result `value`, which must be JSON-serializable, for `key`.
+        """
+        data = json.dumps(value)
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            if len(data) > self.max_item_bytes:
+                return
+            self._items[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                __, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        """
+        Forget all the cached results.
+        """
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._items)
@@ -0,0 +1,388 @@
+"""
+A pool of warm sandboxed Python processes for running capa code.
+
+`codejail` starts a new sandboxed Python process for every execution, which
+then has to import the modules capa code assumes (numpy, scipy, ...) again.
+The workers here are started with the same sandboxed Python executable and
+import those modules once. For every execution, a worker forks a child that
+runs the code under the resource limits codejail would apply, so executions
+can't see each other's state.
+
+Like codejail's processes, workers run with an empty environment in a
+temporary directory of their own, so that code can't read the settings or
+credentials of the process using the pool.
+
+Workers are replaced after `max_executions` executions, or when they stop
+answering.
+"""
+
+import json
+import logging
+import os
+import Queue
+import select
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+from codejail.safe_exec import SafeExecException, json_safe
+
+log = logging.getLogger(__name__)
+
+# How long to wait for a worker to answer, beyond the time limit it enforces
+# on executions itself.
+WORKER_GRACE_TIME = 5
+
+# The program run by each worker, with its configuration as a JSON argument.
+# It reads one request per line from stdin, a JSON list of the code and the
+# globals to run it with, and writes one JSON response per line to stdout.
+# Globals are cleaned the same way codejail cleans them.
+WORKER_CODE = """\
+import json
+import os
+import resource
+import select
+import signal
+import sys
+import time
+import traceback
+
+lazy_imports, assumed_imports, limits, timeout = json.loads(sys.argv[1])
+
+lazy_globals = {}
+exec lazy_imports in lazy_globals
+lazy_globals.pop("__doc__", None)
+for name, modname in assumed_imports:
+    try:
+        lazy_globals[name]._load_mod()
+    except Exception:
+        pass
+
+ok_types = (type(None), int, long, float, str, unicode, list, tuple, dict)
+bad_keys = ("__builtins__",)
+
+def jsonable(v):
+    if not isinstance(v, ok_types):
+        return False
+    try:
+        json.dumps(v)
+    except Exception:
+        return False
+    return True
+
+def run(code, g_dict, result_fd):
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    if limits.get("CPU"):
+        resource.setrlimit(resource.RLIMIT_CPU, (limits["CPU"], limits["CPU"]))
+    if limits.get("VMEM"):
+        resource.setrlimit(resource.RLIMIT_AS, (limits["VMEM"], limits["VMEM"]))
+
+    g_dict.update(lazy_globals)
+    try:
+        exec code in g_dict
+    except BaseException:
+        response = {"emsg": traceback.format_exc(), "globals": {}}
+    else:
+        response = {
+            "emsg": None,
+            "globals": dict((k, v) for k, v in g_dict.iteritems() if jsonable(v) and k not in bad_keys),
+        }
+    data = json.dumps(response)
+    while data:
+        data = data[os.write(result_fd, data):]
+
+def wait_for_result(pid, read_fd):
+    chunks = []
+    deadline = time.time() + timeout
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            return {"emsg": "timed out"}
+        if select.select([read_fd], [], [], remaining)[0]:
+            data = os.read(read_fd, 65536)
+            if not data:
+                break
+            chunks.append(data)
+    _, status = os.waitpid(pid, 0)
+    try:
+        return json.loads("".join(chunks))
+    except ValueError:
+        return {"emsg": "stopped with status %d" % status}
+
+responses = os.fdopen(os.dup(1), "w")
+responses.write("ready\\n")
+responses.flush()
+
+while True:
+    line = sys.stdin.readline()
+    if not line:
+        break
+    code, g_dict = json.loads(line)
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            os.close(responses.fileno())
+            run(code, g_dict, write_fd)
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    response = wait_for_result(pid, read_fd)
+    os.close(read_fd)
+    responses.write(json.dumps(response) + "\\n")
+    responses.flush()
+"""
+
+
+class WorkerError(Exception):
+    """
+    Raised when a worker didn't answer, because it died or timed out.
+    """
+    pass
+
+
+class SandboxWorker(object):
+    """
+    One warm sandboxed Python process.
+    """
+    def __init__(self, command, config):
+        self.executions = 0
+        self._buffer = ""
+        self._ready = False
+        self.tmpdir = tempfile.mkdtemp(prefix="codejail-")
+        # The sandbox user needs to be able to use the directory too.
+        os.chmod(self.tmpdir, 0775)
+        with open(os.devnull, "w") as devnull:
+            self.process = subprocess.Popen(
+                command + ["-c", WORKER_CODE, json.dumps(config)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=devnull,
+                close_fds=True,
+                env={},
+                cwd=self.tmpdir,
+            )
+
+    def execute(self, code, globals_dict, timeout, startup_timeout):
+        """
+        Run `code` with `globals_dict`, and return the exception message (or
+        None) and the resulting globals.
+
+        Raises `WorkerError` if the worker doesn't answer in time.
+        """
+        if not self._ready:
+            if self._read_line(time.time() + startup_timeout) != "ready":
+                raise WorkerError("worker failed to start")
+            self._ready = True
+
+        self.executions += 1
+        try:
+            self.process.stdin.write(json.dumps([code, json_safe(globals_dict)]) + "\n")
+            self.process.stdin.flush()
+        except IOError as exc:
+            raise WorkerError("worker died: {}".format(exc))
+
+        try:
+            response = json.loads(self._read_line(time.time() + timeout))
+            emsg, results = response["emsg"], response.get("globals") or {}
+        except (ValueError, TypeError, KeyError):
+            raise WorkerError("invalid response")
+        if not isinstance(results, dict):
+            raise WorkerError("invalid response")
+        return emsg, results
+
+    def is_alive(self):
+        """
+        Is the worker process still running?
+        """
+        return self.process.poll() is None
+
+    def kill(self):
+        """
+        Stop the worker process.
+
+        When the worker runs through sudo, only sudo gets killed, but then the
+        worker exits as soon as it reads the end of its input.
+        """
+        try:
+            self.process.stdin.close()
+            if self.is_alive():
+                self.process.kill()
+        except (IOError, OSError):
+            pass
+        self.process.wait()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _read_line(self, deadline):
+        """
+        Read one line from the worker, waiting until `deadline` at most.
+        """
+        stdout = self.process.stdout.fileno()
+        while "\n" not in self._buffer:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise WorkerError("timed out")
+            if select.select([stdout], [], [], remaining)[0]:
+                data = os.read(stdout, 65536)
+                if not data:
+                    raise WorkerError("worker died")
+                self._buffer += data
+        line, self._buffer = self._buffer.split("\n", 1)
+        return line
+
+
+class WarmSandboxPool(object):
+    """
+    Runs code in a pool of `SandboxWorker`s.
+
+    `command` is the argument list that starts the sandboxed Python
+    executable, e.g. `["sudo", "-u", "sandbox", "/path/to/python", "-E", "-B"]`.
+    `lazy_imports` is Python code defining the names of `assumed_imports`,
+    a list of (name, module name) pairs, which the workers import up front.
+
+    At most `size` idle workers are kept, and at most `max_workers` (twice
+    `size` by default) run at once, idle or busy: beyond that, executions
+    wait up to `startup_timeout` seconds for a worker to be free. Workers
+    are started on first use, so that they aren't shared by processes forked
+    after the pool is created.
+    `limits` has the same "CPU" and "VMEM" limits as codejail, which apply to
+    every execution, and executions are stopped after `timeout` seconds.
+    """
+    def __init__(self, command, lazy_imports, assumed_imports, size=4, max_executions=100, timeout=5,
+                 startup_timeout=30, limits=None, max_workers=None):
+        self.command = command
+        self.config = [lazy_imports, assumed_imports, limits or {}, timeout]
+        self.size = size
+        self.max_workers = max_workers or 2 * size
+        self.max_executions = max_executions
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self._idle = Queue.Queue()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._live = 0
+        self._worker_available = threading.Condition()
+
+    def execute(self, code, globals_dict, slug=None):
+        """
+        Run `code` with `globals_dict` in a warm worker.
+
+        Changes to the globals are visible in `globals_dict` afterwards, like
+        codejail's `safe_exec`, and errors raise `SafeExecException`.
+        """
+        worker = self._checkout()
+        try:
+            emsg, results = worker.execute(
+                code, globals_dict, self.timeout + WORKER_GRACE_TIME, self.startup_timeout
+            )
+        except WorkerError as exc:
+            log.warning("Warm sandbox worker failed running %s: %s", slug, exc)
+            self._stop_worker(worker)
+            self._replenish()
+            raise SafeExecException("Couldn't execute jailed code: {}".format(exc))
+
+        self._checkin(worker)
+        if emsg:
+            raise SafeExecException("Couldn't execute jailed code: {}".format(emsg))
+        globals_dict.update(results)
+
+    def close(self):
+        """
+        Stop all the idle workers.
+        """
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except Queue.Empty:
+                return
+            self._stop_worker(worker)
+
+    def _checkout(self):
+        """
+        Return an idle worker, or a new one if none is idle.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # We were forked: the workers belong to the parent process.
+                self._idle = Queue.Queue()
+                self._pid = os.getpid()
+                self._live = 0
+                self._worker_available = threading.Condition()
+
+        deadline = time.time() + self.startup_timeout
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except Queue.Empty:
+                worker = self._start_worker()
+                if worker is not None:
+                    return worker
+                # Wait for a worker to be checked in or stopped
+                with self._worker_available:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise SafeExecException("Couldn't execute jailed code: too many executions")
+                    self._worker_available.wait(min(remaining, 1))
+                continue
+            if worker.is_alive():
+                return worker
+            self._stop_worker(worker)
+
+    def _checkin(self, worker):
+        """
+        Make `worker` available again, or replace it if it is worn out.
+        """
+        if worker.executions < self.max_executions and worker.is_alive() and self._idle.qsize() < self.size:
+            self._idle.put(worker)
+            with self._worker_available:
+                self._worker_available.notify()
+        else:
+            self._stop_worker(worker)
+            self._replenish()
+
+    def _replenish(self):
+        """
+        Start a worker to replace one that was stopped, so that it is warm by
+        the time it is needed.
+        """
+        if self._idle.qsize() < self.size:
+            worker = self._start_worker()
+            if worker is not None:
+                self._idle.put(worker)
+                with self._worker_available:
+                    self._worker_available.notify()
+
+    def _start_worker(self):
+        """
+        Start a new worker process, or return None if `max_workers` are
+        already running.
+        """
+        with self._worker_available:
+            if self._live >= self.max_workers:
+                return None
+            self._live += 1
+        try:
+            return SandboxWorker(self.command, self.config)
+        except Exception:
+            with self._worker_available:
+                self._live -= 1
+                self._worker_available.notify()
+            raise
+
+    def _stop_worker(self, worker):
+        """
+        Stop `worker`, making room for another one.
+        """
+        worker.kill()
+        with self._worker_available:
+            self._live -= 1
+            self._worker_available.notify()
@@ -4,9 +4,13 @@ from codejail.safe_exec import safe_exec as codejail_safe_exec
 from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
 from codejail.safe_exec import json_safe, SafeExecException
 from . import lazymod
+from .local_cache import LocalResultCache
+from .pool import WarmSandboxPool
 from dogapi import dog_stats_api
 
 import hashlib
+import json
+import time
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -46,6 +50,45 @@ for name, modname in ASSUMED_IMPORTS:
 
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
+# The pool of warm sandboxes used to run code, if configured with
+# `configure_warm_pool`.
+WARM_POOL = None
+
+# The in-process cache checked before the cache given to `safe_exec`, if
+# configured with `configure_local_cache`.
+LOCAL_CACHE = None
+
+
+def configure_warm_pool(python_bin, user=None, **kwargs):
+    """
+    Run sandboxed code in a pool of warm worker processes, see `pool.py`.
+
+    `python_bin` and `user` are the sandboxed Python executable and the user
+    to run it as, like codejail's configuration. Other keyword arguments are
+    passed to `WarmSandboxPool`. Code that needs extra files or a Python path
+    is still run by codejail.
+    """
+    global WARM_POOL  # pylint: disable=global-statement
+    command = []
+    if user:
+        command.extend(["sudo", "-u", user])
+    command.extend([python_bin, "-E", "-B"])
+    if WARM_POOL is not None:
+        WARM_POOL.close()
+    WARM_POOL = WarmSandboxPool(command, LAZY_IMPORTS, ASSUMED_IMPORTS, **kwargs)
+
+
+def configure_local_cache(max_bytes, max_item_bytes=None):
+    """
+    Keep up to `max_bytes` of the most recently used results in the process,
+    in front of the cache given to `safe_exec`. 0 disables the local cache.
+    """
+    global LOCAL_CACHE  # pylint: disable=global-statement
+    if max_bytes:
+        LOCAL_CACHE = LocalResultCache(max_bytes, max_item_bytes)
+    else:
+        LOCAL_CACHE = None
+
 
 def update_hash(hasher, obj):
     """
@@ -70,6 +113,52 @@ def update_hash(hasher, obj):
         hasher.update(repr(obj))
 
 
+def cache_key(code, safe_globals, random_seed):
+    """
+    Return the cache key for running `code` with the JSON-safe globals
+    `safe_globals` and `random_seed`.
+
+    `safe_globals` has been through a JSON round trip already, so dumping it
+    with sorted keys is a canonical serialization, and much faster than
+    `update_hash`.
+    """
+    md5er = hashlib.md5()
+    md5er.update(repr(code))
+    md5er.update(json.dumps(safe_globals, sort_keys=True, separators=(',', ':')))
+    return "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
+
+
+def get_cached_result(cache, key):
+    """
+    Return the result cached for `key` in the local cache or in `cache`, or
+    None, recording which tier answered.
+    """
+    start = time.time()
+    tier = None
+    cached = LOCAL_CACHE.get(key) if LOCAL_CACHE is not None else None
+    if cached is not None:
+        tier = 'local'
+    else:
+        cached = cache.get(key)
+        if cached is not None:
+            tier = 'shared'
+            if LOCAL_CACHE is not None:
+                LOCAL_CACHE.set(key, cached)
+    tags = ['result:hit', 'tier:{}'.format(tier)] if tier else ['result:miss']
+    dog_stats_api.increment('capa.safe_exec.cache', tags=tags)
+    dog_stats_api.histogram('capa.safe_exec.cache.lookup_time', time.time() - start, tags=tags)
+    return cached
+
+
+def set_cached_result(cache, key, result):
+    """
+    Cache `result` for `key` in `cache`, and in the local cache.
+    """
+    if LOCAL_CACHE is not None:
+        LOCAL_CACHE.set(key, result)
+    cache.set(key, result)
+
+
 @dog_stats_api.timed('capa.safe_exec.time')
 def safe_exec(
     code,
@@ -99,7 +188,8 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    and the random seed.  Exceptions are cached too.  If `configure_local_cache`
+    was called, the process-local cache is checked first.
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
@@ -109,12 +199,8 @@ def safe_exec(
     """
     # Check the cache for a previous result.
     if cache:
-        safe_globals = json_safe(globals_dict)
-        md5er = hashlib.md5()
-        md5er.update(repr(code))
-        update_hash(md5er, safe_globals)
-        key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
-        cached = cache.get(key)
+        key = cache_key(code, json_safe(globals_dict), random_seed)
+        cached = get_cached_result(cache, key)
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
             # message, if any, else None; and the resulting globals dictionary.
@@ -135,10 +221,14 @@ def safe_exec(
 
     # Run the code!  Results are side effects in globals_dict.
     try:
-        exec_fn(
-            code_prolog + LAZY_IMPORTS + code, globals_dict,
-            python_path=python_path, extra_files=extra_files, slug=slug,
-        )
+        if WARM_POOL is not None and not unsafely and not python_path and not extra_files:
+            # The workers of the pool have already defined LAZY_IMPORTS.
+            WARM_POOL.execute(code_prolog + code, globals_dict, slug=slug)
+        else:
+            exec_fn(
+                code_prolog + LAZY_IMPORTS + code, globals_dict,
+                python_path=python_path, extra_files=extra_files, slug=slug,
+            )
     except SafeExecException as e:
         emsg = e.message
     else:
@@ -148,7 +238,7 @@ def safe_exec(
     # the globals dict might not be entirely serializable.
     if cache:
         cleaned_results = json_safe(globals_dict)
-        cache.set(key, (emsg, cleaned_results))
+        set_cached_result(cache, key, (emsg, cleaned_results))
 
     # If an exception happened, raise it now.
     if emsg:
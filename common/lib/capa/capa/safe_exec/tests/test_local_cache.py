@@ -0,0 +1,54 @@
+"""Test local_cache.py"""
+
+import unittest
+
+from capa.safe_exec.local_cache import LocalResultCache
+
+
+class TestLocalResultCache(unittest.TestCase):
+    """
+    Test the size-bounded LRU cache of results.
+    """
+    def test_get_and_set(self):
+        cache = LocalResultCache(1000)
+        self.assertIsNone(cache.get("key"))
+        cache.set("key", [None, {"a": 1}])
+        self.assertEqual(cache.get("key"), [None, {"a": 1}])
+
+    def test_values_are_copies(self):
+        cache = LocalResultCache(1000)
+        cache.set("key", [None, {"a": [1]}])
+        cache.get("key")[1]["a"].append(2)
+        self.assertEqual(cache.get("key"), [None, {"a": [1]}])
+
+    def test_evicts_least_recently_used(self):
+        cache = LocalResultCache(100, max_item_bytes=100)
+        for key in "abc":
+            cache.set(key, "x" * 28)
+        cache.get("a")
+        cache.set("d", "x" * 28)
+        self.assertIsNone(cache.get("b"))
+        for key in "acd":
+            self.assertIsNotNone(cache.get(key))
+        self.assertLessEqual(cache.size, 100)
+
+    def test_replacing_keeps_size(self):
+        cache = LocalResultCache(100, max_item_bytes=100)
+        cache.set("a", "x" * 28)
+        cache.set("a", "x" * 8)
+        self.assertEqual(cache.size, 10)
+        self.assertEqual(len(cache), 1)
+
+    def test_big_items_are_not_kept(self):
+        cache = LocalResultCache(1000)
+        cache.set("small", "x" * 10)
+        cache.set("big", "x" * 200)
+        self.assertIsNone(cache.get("big"))
+        self.assertEqual(cache.get("small"), "x" * 10)
+
+    def test_clear(self):
+        cache = LocalResultCache(1000)
+        cache.set("a", 1)
+        cache.clear()
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.size, 0)
@@ -0,0 +1,91 @@
+"""Test pool.py"""
+
+import importlib
+import os
+import sys
+import unittest
+
+from mock import patch
+
+from capa.safe_exec import safe_exec
+from capa.safe_exec.pool import WarmSandboxPool
+from capa.safe_exec.safe_exec import ASSUMED_IMPORTS, LAZY_IMPORTS
+from codejail.safe_exec import SafeExecException
+
+# The module, which capa.safe_exec.safe_exec (the function) hides.
+safe_exec_module = importlib.import_module("capa.safe_exec.safe_exec")
+
+
+class TestWarmSandboxPool(unittest.TestCase):
+    """
+    Run code in a pool of unsandboxed workers.
+    """
+    def setUp(self):
+        super(TestWarmSandboxPool, self).setUp()
+        self.pool = WarmSandboxPool(
+            [sys.executable, "-E", "-B"], LAZY_IMPORTS, ASSUMED_IMPORTS, size=1, max_executions=2, timeout=1,
+        )
+        self.addCleanup(self.pool.close)
+
+    def test_set_values(self):
+        g = {"b": 2}
+        self.pool.execute("a = int(math.pi) + b", g)
+        self.assertEqual(g, {"a": 5, "b": 2})
+
+    def test_raising_exceptions(self):
+        with self.assertRaises(SafeExecException) as cm:
+            self.pool.execute("1/0", {})
+        self.assertIn("ZeroDivisionError", cm.exception.message)
+
+    def test_timeout(self):
+        with self.assertRaisesRegexp(SafeExecException, "timed out"):
+            self.pool.execute("while True: pass", {})
+        # The worker is still usable afterwards
+        g = {}
+        self.pool.execute("a = 17", g)
+        self.assertEqual(g["a"], 17)
+
+    def test_executions_are_isolated(self):
+        g = {}
+        self.pool.execute("import os\nos.environ['LEAK'] = 'yes'", g)
+        self.pool.execute("import os\nleak = os.environ.get('LEAK')", g)
+        self.assertIsNone(g["leak"])
+
+    def test_environment_is_not_inherited(self):
+        os.environ['SECRET_FOR_TEST'] = 'secret'
+        self.addCleanup(os.environ.pop, 'SECRET_FOR_TEST')
+        g = {}
+        self.pool.execute("import os\nenv = dict(os.environ)\ncwd = os.getcwd()", g)
+        self.assertEqual(g["env"], {})
+        self.assertNotEqual(g["cwd"], os.getcwd())
+
+    def test_live_workers_are_capped(self):
+        pool = WarmSandboxPool(
+            [sys.executable, "-E", "-B"], LAZY_IMPORTS, ASSUMED_IMPORTS, size=1, timeout=1, startup_timeout=1,
+            max_workers=1,
+        )
+        self.addCleanup(pool.close)
+        busy_worker = pool._checkout()  # pylint: disable=protected-access
+        with self.assertRaisesRegexp(SafeExecException, "too many executions"):
+            pool.execute("a = 1", {})
+        pool._checkin(busy_worker)  # pylint: disable=protected-access
+        g = {}
+        pool.execute("a = 1", g)
+        self.assertEqual(g["a"], 1)
+
+    def test_workers_are_reused_then_replaced(self):
+        worker_pids = []
+        for __ in range(3):
+            g = {}
+            self.pool.execute("import os\nworker = os.getppid()", g)
+            worker_pids.append(g["worker"])
+        self.assertEqual(worker_pids[0], worker_pids[1])
+        self.assertNotEqual(worker_pids[1], worker_pids[2])
+
+    def test_safe_exec_uses_pool(self):
+        with patch.object(safe_exec_module, "WARM_POOL", self.pool):
+            g = {}
+            safe_exec("a = 1/2\nrnum = random.randint(0, 999)", g, random_seed=17)
+            self.assertEqual(g["a"], 0.5)
+            with self.assertRaises(SafeExecException):
+                safe_exec("1/0", {})
@@ -1,18 +1,25 @@
 """Test safe_exec.py"""
 
 import hashlib
+import importlib
 import os
 import os.path
 import random
 import textwrap
 import unittest
 
+from mock import patch
 from nose.plugins.skip import SkipTest
 
 from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec.local_cache import LocalResultCache
+from capa.safe_exec.safe_exec import cache_key
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
 
+# The module, which capa.safe_exec.safe_exec (the function) hides.
+safe_exec_module = importlib.import_module("capa.safe_exec.safe_exec")
+
 
 class TestSafeExec(unittest.TestCase):
     def test_set_values(self):
@@ -177,6 +184,81 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+class TestSafeExecLocalCaching(unittest.TestCase):
+    """Test the process-local cache in front of the cache given to safe_exec."""
+
+    def setUp(self):
+        super(TestSafeExecLocalCaching, self).setUp()
+        patcher = patch.object(safe_exec_module, "LOCAL_CACHE", LocalResultCache(10000))
+        self.local_cache = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_local_hit_skips_shared_cache(self):
+        cache = {}
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=DictCache(cache))
+        self.assertEqual(g['a'], 3)
+        self.assertEqual(len(self.local_cache), 1)
+
+        # The shared cache isn't consulted any more.
+        cache[cache.keys()[0]] = (None, {'a': 17})
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=DictCache(cache))
+        self.assertEqual(g['a'], 3)
+
+    def test_shared_hit_fills_local_cache(self):
+        cache = {}
+        safe_exec("a = int(math.pi)", {}, cache=DictCache(cache))
+        self.local_cache.clear()
+        cache[cache.keys()[0]] = (None, {'a': 17})
+
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=DictCache(cache))
+        self.assertEqual(g['a'], 17)
+        cache.clear()
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=DictCache(cache))
+        self.assertEqual(g['a'], 17)
+
+    def test_local_cache_exceptions(self):
+        cache = {}
+        with self.assertRaises(SafeExecException):
+            safe_exec("1/0", {}, cache=DictCache(cache))
+        cache.clear()
+        with self.assertRaisesRegexp(SafeExecException, "ZeroDivisionError"):
+            safe_exec("1/0", {}, cache=DictCache(cache))
+        self.assertEqual(cache, {})
+
+    def test_cached_globals_are_copies(self):
+        g = {}
+        safe_exec("a = [1, 2]", g, cache=DictCache({}))
+        g = {}
+        safe_exec("a = [1, 2]", g, cache=DictCache({}))
+        g['a'].append(3)
+        g = {}
+        safe_exec("a = [1, 2]", g, cache=DictCache({}))
+        self.assertEqual(g['a'], [1, 2])
+
+
+class TestCacheKey(unittest.TestCase):
+    """Test the safe_exec.cache_key function."""
+
+    def test_dict_ordering(self):
+        d1, d2 = TestUpdateHash("test_dict_ordering").equal_but_different_dicts()
+        self.assertEqual(cache_key("a = 1", {'d': [d1]}, 1), cache_key("a = 1", {'d': [d2]}, 1))
+
+    def test_differences(self):
+        key = cache_key("a = 1", {'b': [1, 2]}, 1)
+        self.assertNotEqual(key, cache_key("a = 2", {'b': [1, 2]}, 1))
+        self.assertNotEqual(key, cache_key("a = 1", {'b': [2, 1]}, 1))
+        self.assertNotEqual(key, cache_key("a = 1", {'b': ["1", 2]}, 1))
+        self.assertNotEqual(key, cache_key("a = 1", {'b': [1, 2]}, 2))
+        self.assertNotEqual(key, cache_key("a = 1", {'b': [1, 2]}, None))
+
+    def test_unicode(self):
+        self.assertNotEqual(cache_key(u"# \u2603", {'s': u"\u2603"}, 1), cache_key(u"# \u2604", {'s': u"\u2603"}, 1))
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
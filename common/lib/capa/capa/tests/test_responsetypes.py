@@ -529,6 +529,34 @@ class FormulaResponseTest(ResponseTest):
         self.assertTrue(problem.responders.values()[0].validate_answer('14*x'))
         self.assertFalse(problem.responders.values()[0].validate_answer('3*y+2*x'))
 
+    def test_vectorized_samples_match_single_samples(self):
+        """
+        Evaluating all the samples at once gives the same results as
+        evaluating them one at a time.
+        """
+        sample_dict = {'x': (-10, 10), 'y': (1, 2)}
+        problem = self.build_problem(sample_dict=sample_dict, num_samples=50, tolerance="1%", answer="x")
+        responder = problem.responders.values()[0]
+        var_dict_list = responder.randomize_variables(responder.samples)
+
+        for answer in ["x^2*sin(y) + i*y", "arccot(x) + fact(3)*sec(y)", "x || y", "5"]:
+            vectorized = responder.tupleize_answers_vectorized(answer, var_dict_list)
+            single = [calc.evaluator(var_dict, {}, answer) for var_dict in var_dict_list]
+            self.assertEqual(len(vectorized), 50)
+            for vectorized_value, single_value in zip(vectorized, single):
+                self.assertAlmostEqual(vectorized_value, single_value)
+
+    def test_vectorized_errors_use_single_samples(self):
+        """
+        Answers that can't be evaluated for some samples raise the same errors
+        as when the samples were evaluated one at a time.
+        """
+        sample_dict = {'x': (-2, 2)}
+        problem = self.build_problem(sample_dict=sample_dict, num_samples=10, tolerance="1%", answer="x")
+        with self.assertRaisesRegexp(StudentInputError, 'factorial'):
+            problem.grade_answers({'1_2_1': 'fact(x)'})
+        self.assert_grade(problem, "sqrt(x)^2", "incorrect")
+
 
 class StringResponseTest(ResponseTest):
     xml_factory_class = StringResponseXMLFactory
@@ -12,11 +12,16 @@ structure:
 }
 """
 
+import cPickle
 import pymongo
 import sys
 import logging
 import copy
 import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
 from uuid import uuid4
 
 from bson.son import SON
@@ -77,6 +82,14 @@ _OSFS_INSTANCE = {}
 
 _DETACHED_CATEGORIES = [name for name, __ in XBlock.load_tagged_classes("detached")]
 
+# The key of the inheritance index of a course in the metadata_inheritance_cache_subsystem
+INHERITANCE_INDEX_CACHE_KEY = u"inheritance_index.{}"
+# The key of the counter of the changes to the inheritance index of a course. The cached index is
+# only valid if it was stored for the current value of the counter.
+INHERITANCE_INDEX_VERSION_CACHE_KEY = u"inheritance_index_version.{}"
+# How many courses' inheritance trees, expanded from their inheritance index, to keep in each process.
+INHERITANCE_TREE_CACHE_SIZE = 20
+
 
 class MongoRevisionKey(object):
     """
@@ -605,6 +618,11 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         self._course_run_cache = {}
         self.signal_handler = signal_handler
 
+        # The inheritance index and tree of the most recently read courses, keyed by course and
+        # branch, with the version of the index they are current for
+        self._inheritance_trees = OrderedDict()
+        self._inheritance_trees_lock = threading.Lock()
+
     def close_connections(self):
         """
         Closes any open connections to the underlying database
@@ -676,9 +694,15 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         else:
             return ParentLocationCache()
 
-    def _compute_metadata_inheritance_tree(self, course_id):
+    def _compute_metadata_inheritance_tree(self, course_id, location=None):
         '''
-        Find all inheritable fields from all xblocks in the course which may define inheritable data
+        Find all inheritable fields from all xblocks in the course which may define inheritable data,
+        or only from the xblock at `location` if given.
+
+        Returns the inheritance index of the course (or the part of it for `location`): a dict with
+        the url of the course under 'root', and the inheritable metadata and children urls of each
+        block with children under 'blocks'. `_expand_inheritance_index` computes the metadata each
+        block inherits from it.
         '''
         # get all collections in the course, this query should not return any leaf nodes
         course_id = self.fill_in_run(course_id)
@@ -688,6 +712,9 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             ('_id.course', course_id.course),
             ('_id.category', {'$in': BLOCK_TYPES_WITH_CHILDREN})
         ])
+        if location is not None:
+            query['_id.category'] = location.category
+            query['_id.name'] = location.name
         # if we're only dealing in the published branch, then only get published containers
         if self.get_branch_setting() == ModuleStoreEnum.Branch.published_only:
             query['_id.revision'] = None
@@ -704,115 +731,303 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
         # it's ok to keep these as deprecated strings b/c the overall cache is indexed by course_key and this
         # is a dictionary relative to that course
-        results_by_url = {}
+        blocks = {}
         root = None
 
         # now go through the results and order them by the location url
         for result in resultset:
             # manually pick it apart b/c the db has tag and we want as_published revision regardless
-            location = as_published(Location._from_deprecated_son(result['_id'], course_id.run))
+            result_location = as_published(Location._from_deprecated_son(result['_id'], course_id.run))
 
-            location_url = unicode(location)
-            if location_url in results_by_url:
+            location_url = unicode(result_location)
+            children = result.get('definition', {}).get('children', [])
+            if location_url in blocks:
                 # found either draft or live to complement the other revision
                 # FIXME this is wrong. If the child was moved in draft from one parent to the other, it will
                 # show up under both in this logic: https://openedx.atlassian.net/browse/TNL-1075
-                existing_children = results_by_url[location_url].get('definition', {}).get('children', [])
-                additional_children = result.get('definition', {}).get('children', [])
-                total_children = existing_children + additional_children
                 # use set to get rid of duplicates. We don't care about order; so, it shouldn't matter.
-                results_by_url[location_url].setdefault('definition', {})['children'] = set(total_children)
+                blocks[location_url][1] = list(set(blocks[location_url][1] + children))
             else:
-                results_by_url[location_url] = result
-            if location.category == 'course':
+                blocks[location_url] = [result.get('metadata', {}), children]
+            if result_location.category == 'course':
                 root = location_url
 
-        # now traverse the tree and compute down the inherited metadata
-        metadata_to_inherit = {}
+        return {'root': root, 'blocks': blocks}
+
+    def _expand_inheritance_index(self, index, tree=None, url=None):
+        '''
+        Compute the metadata inherited by each block of the course from its inheritance `index`, as
+        a dict mapping the url of each block (except the course) to the metadata it inherits.
+
+        If given the `tree` previously expanded from the index and the `url` of the only block whose
+        entry changed in the index since, only the metadata inherited in the subtree of that block is
+        recomputed.
+        '''
+        branch = self.get_branch_setting()
+        blocks = index['blocks']
+        root = index['root']
 
-        def _compute_inherited_metadata(url):
+        def _compute_inherited_metadata(url, metadata):
             """
-            Helper method for computing inherited metadata for a specific location url
+            Helper method for computing the metadata inherited from the block at `url`, given
+            the metadata the block has including its inherited metadata
             """
-            my_metadata = results_by_url[url].get('metadata', {})
-
             # go through all the children and recurse, but only if we have
-            # in the result set. Remember results will not contain leaf nodes
-            for child in results_by_url[url].get('definition', {}).get('children', []):
-                if child in results_by_url:
-                    new_child_metadata = copy.deepcopy(my_metadata)
-                    new_child_metadata.update(results_by_url[child].get('metadata', {}))
-                    results_by_url[child]['metadata'] = new_child_metadata
-                    metadata_to_inherit[child] = new_child_metadata
-                    _compute_inherited_metadata(child)
+            # in the index. Remember the index does not contain leaf nodes
+            for child in blocks[url][1]:
+                if child in blocks:
+                    tree[child] = copy.deepcopy(metadata)
+                    tree[child].update(blocks[child][0])
+                    _compute_inherited_metadata(child, tree[child])
                 else:
                     # this is likely a leaf node, so let's record what metadata we need to inherit
-                    metadata_to_inherit[child] = my_metadata.copy()
+                    tree[child] = metadata.copy()
                 # WARNING: 'parent' is not part of inherited metadata, but
                 # we're piggybacking on this recursive traversal to grab
                 # and cache the child's parent, as a performance optimization.
                 # The 'parent' key will be popped out of the dictionary during
                 # CachingDescriptorSystem.load_item
-                metadata_to_inherit[child].setdefault('parent', {})[self.get_branch_setting()] = url
-
-        if root is not None:
-            _compute_inherited_metadata(root)
-
-        return metadata_to_inherit
+                tree[child]['parent'] = {branch: url}
+
+        if tree is None or url == root:
+            tree = {}
+            if root in blocks:
+                _compute_inherited_metadata(root, blocks[root][0])
+            return tree
+
+        # the tree may be shared with runtimes, so leave it alone
+        tree = dict(tree)
+        parent_url = tree.get(url, {}).get('parent', {}).get(branch)
+        if url not in blocks or parent_url not in blocks:
+            # the block is not (or no longer) part of the course, or is new: the entry of its
+            # parent will be updated when the block is added to its children
+            return tree
+        if parent_url == root:
+            parent_metadata = blocks[root][0]
+        else:
+            parent_metadata = dict((key, value) for key, value in tree[parent_url].iteritems() if key != 'parent')
+        tree[url] = copy.deepcopy(parent_metadata)
+        tree[url].update(blocks[url][0])
+        _compute_inherited_metadata(url, tree[url])
+        tree[url]['parent'] = {branch: parent_url}
+        return tree
 
     def _get_cached_metadata_inheritance_tree(self, course_id, force_refresh=False):
         '''
         Compute the metadata inheritance for the course.
-        '''
-        tree = {}
 
+        The tree is kept in the request cache, and in the process for the current version of the
+        inheritance index, so that it is only expanded from the index again after a change.
+        '''
         course_id = self.fill_in_run(course_id)
         if not force_refresh:
             # see if we are first in the request cache (if present)
             if self.request_cache is not None and unicode(course_id) in self.request_cache.data.get('metadata_inheritance', {}):
                 return self.request_cache.data['metadata_inheritance'][unicode(course_id)]
 
-            # then look in any caching subsystem (e.g. memcached)
-            if self.metadata_inheritance_cache_subsystem is not None:
-                tree = self.metadata_inheritance_cache_subsystem.get(unicode(course_id), {})
-            else:
+        # The version is read first, so that any change made while computing makes the stored index stale.
+        # A refresh follows a change, so it increments the version, which makes the trees other processes
+        # keep for the previous version stale.
+        version = self._get_inheritance_index_version(course_id, increment=force_refresh)
+        index = tree = None
+        if not force_refresh:
+            index, tree = self._get_process_inheritance_tree(course_id, version)
+            if index is None and self.metadata_inheritance_cache_subsystem is not None:
+                # then look in the caching subsystem (e.g. memcached)
+                index = self._load_inheritance_index(course_id, version)
+            elif index is None:
                 logging.warning(
                     'Running MongoModuleStore without a metadata_inheritance_cache_subsystem. This is \
                     OK in localdev and testing environment. Not OK in production.'
                 )
 
-        if not tree:
+        if index is None:
             # if not in subsystem, or we are on force refresh, then we have to compute
-            tree = self._compute_metadata_inheritance_tree(course_id)
+            index = self._compute_metadata_inheritance_tree(course_id)
+            self._store_inheritance_index(course_id, index, version)
+        if tree is None:
+            tree = self._expand_inheritance_index(index)
+            self._set_process_inheritance_tree(course_id, version, index, tree)
+        self._cache_metadata_inheritance_tree(course_id, index, tree, version)
+        return tree
+
+    def _get_cached_inheritance_index(self, course_id):
+        '''
+        Return the inheritance index of the course from the request cache or from the caching
+        subsystem (e.g. memcached) and the version it is cached for, or (None, None) if it isn't
+        cached.
+        '''
+        if self.request_cache is not None:
+            index = self.request_cache.data.get('metadata_inheritance_index', {}).get(unicode(course_id))
+            if index is not None:
+                return index, self.request_cache.data.get('metadata_inheritance_version', {}).get(unicode(course_id))
 
-            # now write out computed tree to caching subsystem (e.g. memcached), if available
-            if self.metadata_inheritance_cache_subsystem is not None:
-                self.metadata_inheritance_cache_subsystem.set(unicode(course_id), tree)
+        if self.metadata_inheritance_cache_subsystem is not None:
+            version = self._get_inheritance_index_version(course_id)
+            return self._load_inheritance_index(course_id, version), version
+        return None, None
 
-        # now populate a request_cache, if available. NOTE, we are outside of the
-        # scope of the above if: statement so that after a memcache hit, it'll get
-        # put into the request_cache
+    def _get_process_inheritance_tree(self, course_id, version):
+        '''
+        Return the inheritance index of the course and the tree expanded from it, if they are kept in
+        this process for `version` of the index, or (None, None).
+        '''
+        if version is None:
+            return None, None
+        key = (unicode(course_id), self.get_branch_setting())
+        with self._inheritance_trees_lock:
+            cached = self._inheritance_trees.pop(key, None)
+            if cached is None:
+                return None, None
+            # most recently used last
+            self._inheritance_trees[key] = cached
+        if cached[0] != version:
+            return None, None
+        return cached[1], cached[2]
+
+    def _set_process_inheritance_tree(self, course_id, version, index, tree):
+        '''
+        Keep the inheritance index of the course and the tree expanded from it in this process for
+        `version` of the index, evicting the least recently used courses beyond
+        INHERITANCE_TREE_CACHE_SIZE.
+        '''
+        if version is None:
+            return
+        key = (unicode(course_id), self.get_branch_setting())
+        with self._inheritance_trees_lock:
+            self._inheritance_trees.pop(key, None)
+            self._inheritance_trees[key] = (version, index, tree)
+            while len(self._inheritance_trees) > INHERITANCE_TREE_CACHE_SIZE:
+                self._inheritance_trees.popitem(last=False)
+
+    def _get_inheritance_index_version(self, course_id, increment=False):
+        '''
+        Return the current version of the inheritance index of the course in the caching subsystem,
+        after incrementing it if `increment`, or None if there is no version to compare to.
+        '''
+        cache = self.metadata_inheritance_cache_subsystem
+        if cache is None:
+            return None
+        key = INHERITANCE_INDEX_VERSION_CACHE_KEY.format(course_id)
+        if increment:
+            try:
+                return cache.incr(key)
+            except ValueError:
+                # the counter was evicted, so the cached index can't be trusted anymore
+                return None
+        version = cache.get(key)
+        if version is None:
+            # Start from the current time rather than 0, so that a counter that was evicted doesn't
+            # start over from a version a process still keeps a tree for.
+            cache.add(key, int(time.time() * 1000))
+            version = cache.get(key)
+        return version
+
+    def _load_inheritance_index(self, course_id, version):
+        '''
+        Return the inheritance index of the course from the caching subsystem if it was stored for
+        `version`, or None.
+        '''
+        if version is None:
+            return None
+        cached = self.metadata_inheritance_cache_subsystem.get(INHERITANCE_INDEX_CACHE_KEY.format(course_id))
+        if cached is None or cached[0] != version:
+            return None
+        return cPickle.loads(zlib.decompress(cached[1]))
+
+    def _store_inheritance_index(self, course_id, index, version):
+        '''
+        Write out the inheritance index of the course to the caching subsystem (e.g. memcached), if
+        available, for `version`. It is pickled and compressed, as the metadata of sibling blocks is
+        repetitive, to stay well under memcached's limit on the size of values.
+        '''
+        if self.metadata_inheritance_cache_subsystem is not None and version is not None:
+            self.metadata_inheritance_cache_subsystem.set(
+                INHERITANCE_INDEX_CACHE_KEY.format(course_id),
+                (version, zlib.compress(cPickle.dumps(index, cPickle.HIGHEST_PROTOCOL)))
+            )
+
+    def _cache_metadata_inheritance_tree(self, course_id, index, tree, version=None):
+        '''
+        Populate the request_cache, if available, with the inheritance index and tree of the course,
+        and the version of the index they were computed from, if known.
+        '''
         if self.request_cache is not None:
-            # we can't assume the 'metadatat_inheritance' part of the request cache dict has been
+            # we can't assume the 'metadata_inheritance' parts of the request cache dict have been
             # defined
-            if 'metadata_inheritance' not in self.request_cache.data:
-                self.request_cache.data['metadata_inheritance'] = {}
-            self.request_cache.data['metadata_inheritance'][unicode(course_id)] = tree
+            self.request_cache.data.setdefault('metadata_inheritance', {})[unicode(course_id)] = tree
+            self.request_cache.data.setdefault('metadata_inheritance_index', {})[unicode(course_id)] = index
+            self.request_cache.data.setdefault('metadata_inheritance_version', {})[unicode(course_id)] = version
+
+    def _update_cached_metadata_inheritance_tree(self, course_id, location):
+        '''
+        Update the cached metadata inheritance of the course for a change to the block at `location`.
 
+        Only blocks with children are part of the inheritance index, so only their changes need the
+        index entry of the block to be read again, and the inheritance of its subtree recomputed.
+
+        Every such change increments the version of the cached index. The index is only updated if
+        no other change was made since the version it was stored for, as the other change may not
+        be part of it yet; otherwise it is computed again.
+        '''
+        course_id = self.fill_in_run(course_id)
+        if location.category not in BLOCK_TYPES_WITH_CHILDREN:
+            return self._get_cached_metadata_inheritance_tree(course_id)
+
+        tree = None
+        if self.metadata_inheritance_cache_subsystem is not None:
+            version = self._get_inheritance_index_version(course_id, increment=True)
+            index = self._load_inheritance_index(course_id, version - 1) if version is not None else None
+        else:
+            # no other process shares the index
+            index, version = self._get_cached_inheritance_index(course_id)
+        if index is None:
+            # nothing to update, so compute it all
+            return self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
+        if self.request_cache is not None and (
+            version is None or self.request_cache.data.get('metadata_inheritance_version', {}).get(
+                unicode(course_id)
+            ) == version - 1
+        ):
+            tree = self.request_cache.data.get('metadata_inheritance', {}).get(unicode(course_id))
+        if tree is None and version is not None:
+            tree = self._get_process_inheritance_tree(course_id, version - 1)[1]
+
+        url = unicode(as_published(location))
+        block_index = self._compute_metadata_inheritance_tree(course_id, location)
+        index = {
+            'root': block_index['root'] or index['root'],
+            'blocks': dict(index['blocks']),
+        }
+        if url in block_index['blocks']:
+            index['blocks'][url] = block_index['blocks'][url]
+        else:
+            index['blocks'].pop(url, None)
+        self._store_inheritance_index(course_id, index, version)
+
+        tree = self._expand_inheritance_index(index, tree, url)
+        self._set_process_inheritance_tree(course_id, version, index, tree)
+        self._cache_metadata_inheritance_tree(course_id, index, tree, version)
         return tree
 
-    def refresh_cached_metadata_inheritance_tree(self, course_id, runtime=None):
+    def refresh_cached_metadata_inheritance_tree(self, course_id, runtime=None, location=None):
         """
         Refresh the cached metadata inheritance tree for the org/course combination
         for location
 
+        If given the `location` of the only block that changed, only the inheritance of
+        that block's subtree is recomputed.
+
         If given a runtime, it replaces the cached_metadata in that runtime. NOTE: failure to provide
         a runtime may mean that some objects report old values for inherited data.
         """
         course_id = course_id.for_branch(None)
         if not self._is_in_bulk_operation(course_id):
             # below is done for side effects when runtime is None
-            cached_metadata = self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
+            if location is not None:
+                cached_metadata = self._update_cached_metadata_inheritance_tree(course_id, location)
+            else:
+                cached_metadata = self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
             if runtime:
                 runtime.cached_metadata = cached_metadata
 
@@ -943,7 +1158,15 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         else:
             system = using_descriptor_system
             system.module_data.update(data_cache)
-            system.cached_metadata.update(cached_metadata)
+            if cached_metadata and cached_metadata is not system.cached_metadata:
+                # The inheritance tree is shared with other runtimes and kept in the process, so
+                # replace it rather than update it in place.
+                if system.course_id == course_key:
+                    system.cached_metadata = cached_metadata
+                else:
+                    merged_metadata = dict(system.cached_metadata)
+                    merged_metadata.update(cached_metadata)
+                    system.cached_metadata = merged_metadata
 
         return system.load_item(location, for_parent=for_parent)
 
@@ -1473,8 +1696,10 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             # update the edit info of the instantiated xblock
             xblock._edit_info = payload['edit_info']
 
-            # recompute (and update) the metadata inheritance tree which is cached
-            self.refresh_cached_metadata_inheritance_tree(xblock.scope_ids.usage_id.course_key, xblock.runtime)
+            # update the metadata inheritance tree which is cached
+            self.refresh_cached_metadata_inheritance_tree(
+                xblock.scope_ids.usage_id.course_key, xblock.runtime, xblock.scope_ids.usage_id
+            )
             # fire signal that we've written to DB
         except ItemNotFoundError:
             if not allow_not_found:
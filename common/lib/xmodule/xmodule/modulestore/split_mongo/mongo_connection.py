@@ -4,10 +4,12 @@ Segregation of pymongo functions from the data modeling mechanisms for split mod
 import datetime
 import cPickle as pickle
 import math
+import threading
 import zlib
 import pymongo
 import pytz
 import re
+from collections import OrderedDict, defaultdict
 from contextlib import contextmanager
 from time import time
 
@@ -260,6 +262,120 @@ class CourseStructureCache(object):
             self.cache.set(key, compressed_pickled_data, None)
 
 
+def _copy_object(obj):
+    """
+    Return a shallow copy of `obj`, much faster than `copy.copy`.
+    """
+    new_obj = obj.__class__.__new__(obj.__class__)
+    new_obj.__dict__.update(obj.__dict__)
+    return new_obj
+
+
+def copy_structure(structure):
+    """
+    Return a copy of `structure` that is safe to hand out alongside the
+    original: the modulestore loads definitions into the blocks of the
+    structures it reads, changing their fields, so each block, its fields and
+    its edit info are copied. The field values themselves are shared.
+    """
+    new_structure = dict(structure)
+    new_blocks = {}
+    for block_key, block in structure['blocks'].iteritems():
+        new_block = _copy_object(block)
+        new_block.fields = dict(block.fields)
+        new_block.edit_info = _copy_object(block.edit_info)
+        new_blocks[block_key] = new_block
+    new_structure['blocks'] = new_blocks
+    return new_structure
+
+
+class StructureLRUCache(object):
+    """
+    A process-wide cache of the most recently used course structures, up to
+    `max_bytes` of their pickled size.
+
+    Structures are immutable and keyed by their version guid, so they never
+    need invalidating. They are kept decoded, and copied on the way out (see
+    :func:`copy_structure`), unless `compress` is true, in which case they are
+    kept pickled and compressed, using less memory but more time.
+    """
+    def __init__(self, max_bytes, compress=False):
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, course_context=None):
+        """Return a copy of the cached structure with id `key`, or None."""
+        with TIMER.timer("StructureLRUCache.get", course_context) as tagger:
+            with self._lock:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self._entries[key] = entry
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            tagger.tag(from_cache=str(entry is not None).lower())
+            if entry is None:
+                return None
+
+            structure, size = entry
+            tagger.measure('size', size)
+            if self.compress:
+                return pickle.loads(zlib.decompress(structure))
+            return copy_structure(structure)
+
+    def set(self, key, structure, course_context=None):
+        """Cache a copy of `structure` under `key`."""
+        with TIMER.timer("StructureLRUCache.set", course_context) as tagger:
+            pickled_data = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
+            if self.compress:
+                structure = zlib.compress(pickled_data, 1)
+                size = len(structure)
+            else:
+                structure = copy_structure(structure)
+                size = len(pickled_data)
+            tagger.measure('size', size)
+
+            if size > self.max_bytes:
+                return
+            with self._lock:
+                old_entry = self._entries.pop(key, None)
+                if old_entry is not None:
+                    self.size -= old_entry[1]
+                self._entries[key] = (structure, size)
+                self.size += size
+                while self.size > self.max_bytes:
+                    __, (__, evicted_size) = self._entries.popitem(last=False)
+                    self.size -= evicted_size
+                tagger.measure('total_size', self.size)
+
+    def clear(self):
+        """Empty the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+# The process-wide structure cache, if configured with `configure_structure_cache`.
+STRUCTURE_CACHE = None
+
+
+def configure_structure_cache(max_bytes, compress=False):
+    """
+    Keep up to `max_bytes` of course structures in each process, in front of
+    the 'course_structure_cache' Django cache. 0 disables the process cache.
+    """
+    global STRUCTURE_CACHE  # pylint: disable=global-statement
+    if max_bytes:
+        STRUCTURE_CACHE = StructureLRUCache(max_bytes, compress)
+    else:
+        STRUCTURE_CACHE = None
+
+
 class MongoConnection(object):
     """
     Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
@@ -293,6 +409,7 @@ class MongoConnection(object):
         self.course_index = self.database[collection + '.active_versions']
         self.structures = self.database[collection + '.structures']
         self.definitions = self.database[collection + '.definitions']
+        self.asset_metadata = self.database[collection + '.asset_metadata']
 
         # every app has write access to the db (v having a flag to indicate r/o v write)
         # Force mongo to report errors, at the expense of performance
@@ -301,6 +418,7 @@ class MongoConnection(object):
         self.course_index.write_concern = {'w': 1}
         self.structures.write_concern = {'w': 1}
         self.definitions.write_concern = {'w': 1}
+        self.asset_metadata.write_concern = {'w': 1}
 
     def heartbeat(self):
         """
@@ -315,9 +433,17 @@ class MongoConnection(object):
         """
         Get the structure from the persistence mechanism whose id is the given key.
 
-        This method will use a cached version of the structure if it is availble.
+        This method will use a cached version of the structure if it is availble,
+        from the process-wide cache first, then from the shared cache.
         """
         with TIMER.timer("get_structure", course_context) as tagger_get_structure:
+            process_cache = STRUCTURE_CACHE
+            if process_cache is not None:
+                structure = process_cache.get(key, course_context)
+                if structure:
+                    tagger_get_structure.tag(from_cache='process')
+                    return structure
+
             cache = CourseStructureCache()
 
             structure = cache.get(key, course_context)
@@ -334,6 +460,9 @@ class MongoConnection(object):
 
                 cache.set(key, structure, course_context)
 
+            if process_cache is not None:
+                process_cache.set(key, structure, course_context)
+
             return structure
 
     @autoretry_read()
@@ -518,6 +647,98 @@ class MongoConnection(object):
             tagger.tag(block_type=definition['block_type'])
             self.definitions.insert(definition)
 
+    def _asset_metadata_query(self, course_key, asset_type=None, filename=None):
+        """
+        Return the query for the asset metadata of the course branch, narrowed
+        to the given asset type and filename, if any.
+        """
+        query = {'course_id': unicode(course_key.version_agnostic())}
+        if asset_type is not None:
+            query['asset_type'] = asset_type
+        if filename is not None:
+            query['filename'] = filename
+        return query
+
+    def get_asset_metadata(self, course_key, asset_type, filename):
+        """
+        Return the stored metadata of one asset of the course branch, or None.
+        """
+        with TIMER.timer("get_asset_metadata", course_key):
+            return self.asset_metadata.find_one(
+                self._asset_metadata_query(course_key, asset_type, filename), {'_id': False}
+            )
+
+    def find_asset_metadata(
+        self, course_key, asset_type=None, sort_field='filename', descending=False, start=0, maxresults=-1
+    ):
+        """
+        Return a page of the stored metadata of the assets of the course branch,
+        of the given type or of all types, sorted by `sort_field`.
+        A negative `maxresults` means no limit.
+        """
+        with TIMER.timer("find_asset_metadata", course_key) as tagger:
+            if maxresults == 0:
+                return []
+            cursor = self.asset_metadata.find(
+                self._asset_metadata_query(course_key, asset_type), {'_id': False}
+            ).sort(sort_field, pymongo.DESCENDING if descending else pymongo.ASCENDING)
+            if start:
+                cursor = cursor.skip(start)
+            if maxresults > 0:
+                cursor = cursor.limit(maxresults)
+            asset_docs = list(cursor)
+            tagger.measure('assets', len(asset_docs))
+            return asset_docs
+
+    def upsert_asset_metadata(self, course_key, asset_docs):
+        """
+        Insert or replace the stored metadata of the given assets of the course
+        branch, in a single bulk write.
+        """
+        with TIMER.timer("upsert_asset_metadata", course_key) as tagger:
+            tagger.measure('assets', len(asset_docs))
+            if not asset_docs:
+                return
+            bulk = self.asset_metadata.initialize_unordered_bulk_op()
+            for asset_doc in asset_docs:
+                query = self._asset_metadata_query(course_key, asset_doc['asset_type'], asset_doc['filename'])
+                asset_doc = dict(asset_doc, course_id=query['course_id'])
+                bulk.find(query).upsert().replace_one(asset_doc)
+            bulk.execute()
+
+    def replace_asset_metadata(self, course_key, asset_docs):
+        """
+        Replace all the stored asset metadata of the course branch by the given
+        assets: they are upserted, then the other assets are deleted.
+        """
+        with TIMER.timer("replace_asset_metadata", course_key):
+            self.upsert_asset_metadata(course_key, asset_docs)
+            filenames_by_type = defaultdict(list)
+            for asset_doc in asset_docs:
+                filenames_by_type[asset_doc['asset_type']].append(asset_doc['filename'])
+            for asset_type in self.asset_metadata.find(self._asset_metadata_query(course_key)).distinct('asset_type'):
+                query = self._asset_metadata_query(course_key, asset_type)
+                query['filename'] = {'$nin': filenames_by_type[asset_type]}
+                self.asset_metadata.remove(query)
+
+    def delete_asset_metadata(self, course_key, asset_type=None, filename=None):
+        """
+        Delete the stored metadata of the matching assets of the course branch.
+        Returns the number of assets deleted.
+        """
+        with TIMER.timer("delete_asset_metadata", course_key):
+            result = self.asset_metadata.remove(self._asset_metadata_query(course_key, asset_type, filename))
+            return result['n']
+
+    def copy_asset_metadata(self, source_course_key, dest_course_key):
+        """
+        Replace the stored asset metadata of the destination course branch by
+        that of the source course branch.
+        """
+        with TIMER.timer("copy_asset_metadata", dest_course_key):
+            self.delete_asset_metadata(dest_course_key)
+            self.upsert_asset_metadata(dest_course_key, self.find_asset_metadata(source_course_key))
+
     def ensure_indexes(self):
         """
         Ensure that all appropriate indexes are created that are needed by this modulestore, or raise
@@ -534,3 +755,20 @@ class MongoConnection(object):
             ],
             unique=True
         )
+        self.asset_metadata.create_index(
+            [
+                ('course_id', pymongo.ASCENDING),
+                ('asset_type', pymongo.ASCENDING),
+                ('filename', pymongo.ASCENDING),
+            ],
+            unique=True
+        )
+        self.asset_metadata.create_index(
+            [
+                ('course_id', pymongo.ASCENDING),
+                ('asset_type', pymongo.ASCENDING),
+                ('edit_info.edited_on', pymongo.ASCENDING),
+            ]
+        )
+        self.asset_metadata.create_index([('course_id', pymongo.ASCENDING), ('filename', pymongo.ASCENDING)])
+        self.asset_metadata.create_index([('course_id', pymongo.ASCENDING), ('edit_info.edited_on', pymongo.ASCENDING)])
@@ -81,6 +81,7 @@ from ..exceptions import ItemNotFoundError
 from .caching_descriptor_system import CachingDescriptorSystem
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
+from xmodule.modulestore.split_mongo.structure_index import STRUCTURE_INDEXES, StructureIndex
 from xmodule.error_module import ErrorDescriptor
 from collections import defaultdict
 from types import NoneType
@@ -338,12 +339,24 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         (no data will be written to the database if a bulk operation is active.)
         """
         self._clear_cache(structure['_id'])
+        STRUCTURE_INDEXES.discard(structure['_id'])
         bulk_write_record = self._get_bulk_ops_record(course_key)
         if bulk_write_record.active:
             bulk_write_record.structures[structure['_id']] = structure
         else:
             self.db_connection.insert_structure(structure, course_key)
 
+    def get_structure_index(self, course_key, structure):
+        """
+        Return the :class:`.StructureIndex` of `structure`. Structures which
+        are still being edited in a bulk operation get a fresh index, the
+        others share the one kept for their version.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        if bulk_write_record.active and structure['_id'] not in bulk_write_record.structures_in_db:
+            return StructureIndex(structure)
+        return STRUCTURE_INDEXES.get(structure)
+
     def get_cached_block(self, course_key, version_guid, block_id):
         """
         If there's an active bulk_operation, see if it's cached this module and just return it
@@ -640,9 +653,11 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None, user_service=None,
-                 services=None, signal_handler=None, **kwargs):
+                 services=None, signal_handler=None, asset_metadata_collection=False, **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param asset_metadata_collection: if True, keep course asset metadata in its own indexed collection, one
+            document per asset, instead of in the course structures.
         """
 
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
@@ -673,6 +688,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             self.services["request_cache"] = self.request_cache
 
         self.signal_handler = signal_handler
+        self.asset_metadata_collection = asset_metadata_collection
 
     def close_connections(self):
         """
@@ -1075,6 +1091,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             return []
 
         course = self._lookup_course(course_locator)
+        blocks = course.structure['blocks']
+        structure_index = self.get_structure_index(course_locator, course.structure)
         items = []
         qualifiers = qualifiers.copy() if qualifiers else {}  # copy the qualifiers (destructively manipulated here)
 
@@ -1099,8 +1117,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             # odd case where we don't search just confirm
             block_name = qualifiers.pop('name')
             block_ids = []
-            for block_id, block in course.structure['blocks'].iteritems():
-                if block_name == block_id.id and _block_matches_all(block):
+            for block_id in structure_index.blocks_named(block_name):
+                if _block_matches_all(blocks[block_id]):
                     block_ids.append(block_id)
 
             return self._load_items(course, block_ids, **kwargs)
@@ -1111,8 +1129,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         # don't expect caller to know that children are in fields
         if 'children' in qualifiers:
             settings['children'] = qualifiers.pop('children')
-        for block_id, value in course.structure['blocks'].iteritems():
-            if _block_matches_all(value):
+        for block_id in structure_index.candidates(qualifiers, settings):
+            if _block_matches_all(blocks[block_id]):
                 items.append(block_id)
 
         if len(items) > 0:
@@ -1133,15 +1151,16 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(locator)
 
         course = self._lookup_course(locator.course_key)
-        parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
+        structure_index = self.get_structure_index(locator.course_key, course.structure)
+        parent_ids = structure_index.parents(BlockKey.from_usage_key(locator))
         if len(parent_ids) == 0:
             return None
         # find alphabetically least
-        parent_ids.sort(key=lambda parent: (parent.type, parent.id))
+        parent_id = min(parent_ids, key=lambda parent: (parent.type, parent.id))
         return BlockUsageLocator.make_relative(
             locator,
-            block_type=parent_ids[0].type,
-            block_id=parent_ids[0].id,
+            block_type=parent_id.type,
+            block_id=parent_id.id,
         )
 
     def get_orphans(self, course_key, **kwargs):
@@ -2433,12 +2452,20 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         Only removes the course from the index. The data remains. You can use create_course
         with a versions hash to restore the course; however, the edited_on and
-        edited_by won't reflect the originals, of course.
+        edited_by won't reflect the originals, of course. Asset metadata kept in
+        its own collection is deleted though.
         """
         # this is the only real delete in the system. should it do something else?
         log.info(u"deleting course from split-mongo: %s", course_key)
+        index = self.get_course_index(course_key) if self.asset_metadata_collection else None
         self.delete_course_index(course_key)
 
+        # Asset metadata kept in its own collection isn't versioned with the structures, so it
+        # can't be restored with them: delete it for every branch.
+        if index is not None:
+            for branch in index['versions']:
+                self.db_connection.delete_asset_metadata(course_key.for_branch(branch))
+
         # We do NOT call the super class here since we need to keep the assets
         # in case the course is later restored.
         # super(SplitMongoModuleStore, self).delete_course(course_key, user_id)
@@ -2522,6 +2549,12 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         """
         Split specific lookup
         """
+        if self.asset_metadata_collection:
+            course_assets = defaultdict(list)
+            for asset_doc in self.db_connection.find_asset_metadata(course_key):
+                course_assets[asset_doc['asset_type']].append(asset_doc)
+            return dict(course_assets)
+
         try:
             course_assets = self._lookup_course(course_key).structure.get('assets', {})
         except (InsufficientSpecificationError, VersionConflictError) as err:
@@ -2532,6 +2565,69 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         return course_assets
 
+    def _check_asset_course_exists(self, course_key):
+        """
+        Raise ItemNotFoundError unless the course branch whose asset metadata is
+        looked up in the asset metadata collection exists, as the structure based
+        lookups do.
+        """
+        index = self.get_course_index(course_key)
+        if index is None or course_key.branch not in index['versions']:
+            raise ItemNotFoundError(course_key)
+
+    @contract(asset_key='AssetKey')
+    def find_asset_metadata(self, asset_key, **kwargs):
+        """
+        Find the metadata for a particular course asset, with a single indexed
+        lookup when asset metadata is kept in its own collection.
+        """
+        if not self.asset_metadata_collection:
+            return super(SplitMongoModuleStore, self).find_asset_metadata(asset_key, **kwargs)
+
+        asset_doc = self.db_connection.get_asset_metadata(asset_key.course_key, asset_key.asset_type, asset_key.path)
+        if asset_doc is None:
+            self._check_asset_course_exists(asset_key.course_key)
+            return None
+        mdata = AssetMetadata(asset_key, asset_key.path, **kwargs)
+        mdata.from_storable(asset_doc)
+        return mdata
+
+    @contract(
+        course_key='CourseKey', asset_type='None | basestring',
+        start='int | None', maxresults='int | None', sort='tuple(str,(int,>=1,<=2))|None'
+    )
+    def get_all_asset_metadata(self, course_key, asset_type, start=0, maxresults=-1, sort=None, **kwargs):
+        """
+        Returns a list of asset metadata for all assets of the given asset_type in the course.
+        When asset metadata is kept in its own collection, the database sorts and pages them.
+        See :meth:`ModuleStoreAssetBase.get_all_asset_metadata` for the arguments.
+        """
+        if not self.asset_metadata_collection:
+            return super(SplitMongoModuleStore, self).get_all_asset_metadata(
+                course_key, asset_type, start, maxresults, sort, **kwargs
+            )
+
+        # Assets are sorted by filename, unless sorting by upload date.
+        sort_field = 'filename'
+        descending = False
+        if sort:
+            if sort[0] == 'uploadDate':
+                sort_field = 'edit_info.edited_on'
+            descending = sort[1] == ModuleStoreEnum.SortOrder.descending
+
+        asset_docs = self.db_connection.find_asset_metadata(
+            course_key, asset_type, sort_field, descending, start or 0, -1 if maxresults is None else maxresults
+        )
+        if not asset_docs:
+            self._check_asset_course_exists(course_key)
+        ret_assets = []
+        for asset_doc in asset_docs:
+            asset_key = course_key.make_asset_key(asset_doc['asset_type'], asset_doc['filename'])
+            new_asset = AssetMetadata(asset_key)
+            new_asset.from_storable(asset_doc)
+            ret_assets.append(new_asset)
+        return ret_assets
+
     def _update_course_assets(self, user_id, asset_key, update_function):
         """
         A wrapper for functions wanting to manipulate assets. Gets and versions the structure,
@@ -2541,6 +2637,19 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         The update function can raise an exception if it doesn't want to actually do the commit. The
         surrounding method probably should catch that exception.
         """
+        if self.asset_metadata_collection:
+            # Only the asset itself is read, passed to the function and written back
+            course_key = asset_key.course_key
+            self._check_asset_course_exists(course_key)
+            asset_doc = self.db_connection.get_asset_metadata(course_key, asset_key.asset_type, asset_key.path)
+            all_assets = SortedAssetList(iterable=[] if asset_doc is None else [asset_doc])
+            all_assets_updated = update_function(all_assets, all_assets.find(asset_key))
+            if len(all_assets_updated) == 0:
+                self.db_connection.delete_asset_metadata(course_key, asset_key.asset_type, asset_key.path)
+            else:
+                self.db_connection.upsert_asset_metadata(course_key, all_assets_updated.as_list())
+            return
+
         with self.bulk_operations(asset_key.course_key):
             original_structure = self._lookup_course(asset_key.course_key).structure
             index_entry = self._get_index_if_valid(asset_key.course_key)
@@ -2569,12 +2678,34 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         Saves a list of AssetMetadata to the modulestore. The list can be composed of multiple
         asset types. This method is optimized for multiple inserts at once - it only re-saves the structure
         at the end of all saves/updates.
+
+        When asset metadata is kept in its own collection, importing (`import_only`) replaces all the
+        asset metadata of the course by the list, since nothing versions it with the course structure.
         """
         # Determine course key to use in bulk operation. Use the first asset assuming that
         # all assets will be for the same course.
         asset_key = asset_metadata_list[0].asset_id
         course_key = asset_key.course_key
 
+        if self.asset_metadata_collection:
+            self._check_asset_course_exists(course_key)
+            asset_docs = []
+            for asset_md in asset_metadata_list:
+                if asset_md.asset_id.course_key != course_key:
+                    # pylint: disable=logging-format-interpolation
+                    log.warning("Asset's course {} does not match other assets for course {} - not saved.".format(
+                        asset_md.asset_id.course_key, course_key
+                    ))
+                    continue
+                if not import_only:
+                    asset_md.update({'edited_by': user_id, 'edited_on': datetime.datetime.now(UTC)})
+                asset_docs.append(asset_md.to_storable())
+            if import_only:
+                self.db_connection.replace_asset_metadata(course_key, asset_docs)
+            else:
+                self.db_connection.upsert_asset_metadata(course_key, asset_docs)
+            return
+
         with self.bulk_operations(course_key):
             original_structure = self._lookup_course(course_key).structure
             index_entry = self._get_index_if_valid(course_key)
@@ -2668,6 +2799,12 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             source_course_key (CourseKey): identifier of course to copy from
             dest_course_key (CourseKey): identifier of course to copy to
         """
+        if self.asset_metadata_collection:
+            self._check_asset_course_exists(source_course_key)
+            self._check_asset_course_exists(dest_course_key)
+            self.db_connection.copy_asset_metadata(source_course_key, dest_course_key)
+            return
+
         source_structure = self._lookup_course(source_course_key).structure
         with self.bulk_operations(dest_course_key):
             original_structure = self._lookup_course(dest_course_key).structure
@@ -0,0 +1,127 @@
+"""
+Secondary indexes over the blocks of a split modulestore structure.
+
+Structures are immutable once they are written, and identified by their
+version guid, so the indexes built for one are kept in a process-wide cache
+and shared by every request reading that version of a course.
+"""
+import threading
+from collections import OrderedDict
+
+from xmodule.modulestore.split_mongo import BlockKey
+
+# Settings fields which are indexed by value, for get_items(settings={field: value}).
+INDEXED_FIELDS = ('discussion_id',)
+
+# How many structures' indexes to keep in each process.
+STRUCTURE_INDEX_CACHE_SIZE = 100
+
+
+class StructureIndex(object):
+    """
+    Maps of the block keys of a structure by block type, block id, parent and
+    value of each of the INDEXED_FIELDS.
+
+    The index only holds block keys, so it can be used with any copy of the
+    structure it was built from.
+    """
+    def __init__(self, structure):
+        self.all_blocks = []
+        self._by_type = {}
+        self._by_name = {}
+        self._parents = {}
+        self._by_field = dict((field_name, {}) for field_name in INDEXED_FIELDS)
+
+        for block_key, block_data in structure['blocks'].iteritems():
+            self.all_blocks.append(block_key)
+            self._by_type.setdefault(block_key.type, []).append(block_key)
+            self._by_name.setdefault(block_key.id, []).append(block_key)
+            for child in block_data.fields.get('children', []):
+                self._parents.setdefault(BlockKey(*child), []).append(block_key)
+            for field_name, values in self._by_field.iteritems():
+                if field_name not in block_data.fields:
+                    continue
+                value = block_data.fields[field_name]
+                for element in value if isinstance(value, list) else [value]:
+                    try:
+                        values.setdefault(element, []).append(block_key)
+                    except TypeError:
+                        # Unhashable values can't equal the hashable criteria looked up here
+                        pass
+
+    def blocks_of_type(self, block_type):
+        """
+        Return the keys of the blocks of type `block_type`.
+        """
+        return self._by_type.get(block_type, [])
+
+    def blocks_named(self, block_id):
+        """
+        Return the keys of the blocks whose id is `block_id`.
+        """
+        return self._by_name.get(block_id, [])
+
+    def parents(self, block_key):
+        """
+        Return the keys of the blocks which have `block_key` as a child.
+        """
+        return self._parents.get(block_key, [])
+
+    def candidates(self, qualifiers, settings):
+        """
+        Return the keys of the blocks which may match the get_items `qualifiers`
+        and `settings`, using the most selective index that applies. The
+        blocks still need checking against all of the criteria.
+        """
+        for field_name in INDEXED_FIELDS:
+            value = settings.get(field_name)
+            if isinstance(value, basestring):
+                return self._by_field[field_name].get(value, [])
+        block_type = qualifiers.get('block_type')
+        if isinstance(block_type, basestring):
+            return self.blocks_of_type(block_type)
+        return self.all_blocks
+
+
+class StructureIndexCache(object):
+    """
+    A process-wide cache of the indexes of the most recently used structures,
+    keyed by their version guid.
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, structure):
+        """
+        Return the index of `structure`, building it if it isn't cached.
+        """
+        key = structure['_id']
+        with self._lock:
+            index = self._entries.pop(key, None)
+            if index is not None:
+                self._entries[key] = index
+                return index
+
+        index = StructureIndex(structure)
+        with self._lock:
+            self._entries[key] = index
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def discard(self, key):
+        """
+        Forget the index of the structure with version guid `key`.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Empty the cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+STRUCTURE_INDEXES = StructureIndexCache(STRUCTURE_INDEX_CACHE_SIZE)
@@ -16,9 +16,14 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.test_cross_modulestore_import_export import (
     MIXED_MODULESTORE_BOTH_SETUP, MODULESTORE_SETUPS,
-    XmlModulestoreBuilder, MixedModulestoreBuilder
+    XmlModulestoreBuilder, MixedModulestoreBuilder, VersioningModulestoreBuilder
 )
 
+SPLIT_ASSET_METADATA_COLLECTION_SETUP = MixedModulestoreBuilder(
+    [('split', VersioningModulestoreBuilder(asset_metadata_collection=True))]
+)
+ASSET_MODULESTORE_SETUPS = MODULESTORE_SETUPS + (SPLIT_ASSET_METADATA_COLLECTION_SETUP,)
+
 
 class AssetStoreTestData(object):
     """
@@ -156,7 +161,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
                 if store is not None and i not in (4, 5):
                     store.save_asset_metadata(asset_md, asset[4])
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_save_one_and_confirm(self, storebuilder):
         """
         Save the metadata in each store and retrieve it singularly, as all assets, and after deleting all.
@@ -174,7 +179,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(new_asset_md, found_asset_md)
             self.assertEquals(len(store.get_all_asset_metadata(course.id, 'asset')), 1)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_delete(self, storebuilder):
         """
         Delete non-existent and existent metadata
@@ -191,7 +196,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(store.delete_asset_metadata(new_asset_loc, ModuleStoreEnum.UserID.test), 1)
             self.assertEquals(len(store.get_all_asset_metadata(course.id, 'asset')), 0)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_find_non_existing_assets(self, storebuilder):
         """
         Find a non-existent asset in an existing course.
@@ -203,7 +208,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             asset_md = store.find_asset_metadata(new_asset_loc)
             self.assertIsNone(asset_md)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_get_all_non_existing_assets(self, storebuilder):
         """
         Get all assets in an existing course when no assets exist.
@@ -214,7 +219,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             asset_md = store.get_all_asset_metadata(course.id, 'asset')
             self.assertEquals(asset_md, [])
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_find_assets_in_non_existent_course(self, storebuilder):
         """
         Find asset metadata from a non-existent course.
@@ -231,7 +236,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             with self.assertRaises(ItemNotFoundError):
                 store.get_all_asset_metadata(fake_course_id, 'asset')
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_add_same_asset_twice(self, storebuilder):
         """
         Add an asset's metadata, then add it again.
@@ -248,7 +253,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             # Still one here?
             self.assertEquals(len(store.get_all_asset_metadata(course.id, 'asset')), 1)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_different_asset_types(self, storebuilder):
         """
         Test saving assets with other asset types.
@@ -262,7 +267,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(len(store.get_all_asset_metadata(course.id, 'vrml')), 1)
             self.assertEquals(len(store.get_all_asset_metadata(course.id, 'asset')), 0)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_asset_types_with_other_field_names(self, storebuilder):
         """
         Test saving assets using an asset type of 'course_id'.
@@ -278,7 +283,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             all_assets = store.get_all_asset_metadata(course.id, 'course_id')
             self.assertEquals(all_assets[0].asset_id.path, new_asset_loc.path)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_lock_unlock_assets(self, storebuilder):
         """
         Save multiple metadata in each store and retrieve it singularly, as all assets, and after deleting all.
@@ -326,7 +331,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
         ('villain', 'Khan')
     )
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_set_all_attrs(self, storebuilder):
         """
         Save setting each attr one at a time
@@ -345,7 +350,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
                 self.assertIsNotNone(getattr(updated_asset_md, attribute, None))
                 self.assertEquals(getattr(updated_asset_md, attribute, None), value)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_set_disallowed_attrs(self, storebuilder):
         """
         setting disallowed attrs should fail
@@ -366,7 +371,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
                 # Make sure that the attribute is unchanged from its original value.
                 self.assertEquals(getattr(updated_asset_md, attribute, None), original_attr_val)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_set_unknown_attrs(self, storebuilder):
         """
         setting unknown attrs should fail
@@ -386,7 +391,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
                 with self.assertRaises(AttributeError):
                     self.assertEquals(getattr(updated_asset_md, attribute), value)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_save_one_different_asset(self, storebuilder):
         """
         saving and deleting things which are not 'asset'
@@ -402,7 +407,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(store.delete_asset_metadata(asset_key, ModuleStoreEnum.UserID.test), 1)
             self.assertEquals(len(store.get_all_asset_metadata(course.id, 'different')), 0)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_find_different(self, storebuilder):
         """
         finding things which are of type other than 'asset'
@@ -427,7 +432,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(assets[idx].asset_id.asset_type, asset[0])
             self.assertEquals(assets[idx].asset_id.path, asset[1])
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_get_multiple_types(self, storebuilder):
         """
         getting all things which are of type other than 'asset'
@@ -464,7 +469,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(len(assets), len(self.alls))
             self._check_asset_values(assets, self.alls)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_save_metadata_list(self, storebuilder):
         """
         Save a list of asset metadata all at once.
@@ -504,7 +509,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(len(assets), len(self.alls))
             self._check_asset_values(assets, self.alls)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_save_metadata_list_with_mismatched_asset(self, storebuilder):
         """
         Save a list of asset metadata all at once - but with one asset's metadata from a different course.
@@ -547,7 +552,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(len(assets), len(self.differents + self.vrmls))
             self._check_asset_values(assets, self.differents + self.vrmls)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_delete_all_different_type(self, storebuilder):
         """
         deleting all assets of a given but not 'asset' type
@@ -562,7 +567,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
 
             self.assertEquals(len(store.get_all_asset_metadata(course.id, 'different')), 1)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_get_all_assets_with_paging(self, storebuilder):
         """
         Save multiple metadata in each store and retrieve it singularly, as all assets, and after deleting all.
@@ -646,7 +651,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(store.find_asset_metadata(asset_key), None)
             self.assertEquals(store.get_all_asset_metadata(course_key, 'asset'), [])
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_copy_all_assets_same_modulestore(self, storebuilder):
         """
         Create a course with assets, copy them all to another course in the same modulestore, and check on it.
@@ -666,7 +671,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(all_assets[0].asset_id.path, 'pic1.jpg')
             self.assertEquals(all_assets[1].asset_id.path, 'shout.ogg')
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_MODULESTORE_SETUPS)
     def test_copy_all_assets_from_course_with_no_assets(self, storebuilder):
         """
         Create a course with *no* assets, and try copy them all to another course in the same modulestore.
@@ -707,3 +712,72 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(len(all_assets), 2)
             self.assertEquals(all_assets[0].asset_id.path, 'pic1.jpg')
             self.assertEquals(all_assets[1].asset_id.path, 'shout.ogg')
+
+    def test_asset_metadata_collection(self):
+        """
+        Save assets in their own collection without versioning the course.
+        """
+        storebuilder = SPLIT_ASSET_METADATA_COLLECTION_SETUP
+        with storebuilder.build() as (__, store):
+            course = CourseFactory.create(modulestore=store)
+            structures = store.modulestores[0].db_connection.structures
+            num_structures = structures.count()
+
+            asset_mds = [
+                self._make_asset_metadata(course.id.make_asset_key('asset', 'pic{}.jpg'.format(i))) for i in range(3)
+            ]
+            store.save_asset_metadata_list(asset_mds, ModuleStoreEnum.UserID.test)
+            store.set_asset_metadata_attr(asset_mds[0].asset_id, 'locked', True, ModuleStoreEnum.UserID.test)
+
+            # One document per asset and branch
+            self.assertEquals(storebuilder.asset_collection().count(), 6)
+            self.assertEquals(structures.count(), num_structures)
+            self.assertTrue(store.find_asset_metadata(asset_mds[0].asset_id).locked)
+            self.assertEquals(
+                [asset_md.asset_id.path for asset_md in store.get_all_asset_metadata(course.id, None, start=1)],
+                ['pic1.jpg', 'pic2.jpg']
+            )
+
+    def test_asset_metadata_collection_import(self):
+        """
+        Importing assets kept in their own collection replaces all of the course's assets.
+        """
+        storebuilder = SPLIT_ASSET_METADATA_COLLECTION_SETUP
+        with storebuilder.build() as (__, store):
+            course = CourseFactory.create(modulestore=store)
+            asset_mds = [
+                self._make_asset_metadata(course.id.make_asset_key('asset', 'pic{}.jpg'.format(i))) for i in range(3)
+            ]
+            store.save_asset_metadata_list(asset_mds, ModuleStoreEnum.UserID.test)
+
+            imported_mds = [
+                asset_mds[0], self._make_asset_metadata(course.id.make_asset_key('asset', 'shout.ogg'))
+            ]
+            store.save_asset_metadata_list(imported_mds, ModuleStoreEnum.UserID.test, import_only=True)
+
+            self.assertEquals(storebuilder.asset_collection().count(), 4)
+            self.assertEquals(
+                [asset_md.asset_id.path for asset_md in store.get_all_asset_metadata(course.id, None)],
+                ['pic0.jpg', 'shout.ogg']
+            )
+            self.assertIsNone(store.find_asset_metadata(asset_mds[1].asset_id))
+
+    def test_asset_metadata_collection_delete_course(self):
+        """
+        Deleting a course deletes the assets kept in their own collection.
+        """
+        storebuilder = SPLIT_ASSET_METADATA_COLLECTION_SETUP
+        with storebuilder.build() as (__, store):
+            course = CourseFactory.create(modulestore=store)
+            other_course = CourseFactory.create(modulestore=store)
+            for course_key in (course.id, other_course.id):
+                store.save_asset_metadata(
+                    self._make_asset_metadata(course_key.make_asset_key('asset', 'pic1.jpg')),
+                    ModuleStoreEnum.UserID.test
+                )
+            self.assertEquals(storebuilder.asset_collection().count(), 4)
+
+            store.delete_course(course.id, ModuleStoreEnum.UserID.test)
+
+            self.assertEquals(storebuilder.asset_collection().count(), 2)
+            self.assertEquals(store.get_all_asset_metadata(other_course.id, 'asset')[0].asset_id.path, 'pic1.jpg')
@@ -78,6 +78,31 @@ class MemoryCache(object):
         """
         self._data[key] = value
 
+    def add(self, key, value):
+        """
+        Set a key in the cache, unless it is already set.
+
+        Args:
+            key: The key to update.
+            value: The value change the key to.
+        """
+        self._data.setdefault(key, value)
+
+    def incr(self, key):
+        """
+        Increment the value of a key in the cache, and return it.
+
+        Args:
+            key: The key to update.
+
+        Raises:
+            ValueError if the key hasn't been set previously.
+        """
+        if key not in self._data:
+            raise ValueError("Key '{}' not found".format(key))
+        self._data[key] += 1
+        return self._data[key]
+
 
 class MongoContentstoreBuilder(object):
     """
@@ -186,6 +211,13 @@ class VersioningModulestoreBuilder(StoreBuilderBase):
     """
     A builder class for a VersioningModuleStore.
     """
+    def __init__(self, asset_metadata_collection=False):
+        """
+        Args:
+            asset_metadata_collection: whether the modulestore keeps asset metadata in its own collection.
+        """
+        self.asset_metadata_collection = asset_metadata_collection
+
     @contextmanager
     def build_with_contentstore(self, contentstore):
         """
@@ -211,6 +243,7 @@ class VersioningModulestoreBuilder(StoreBuilderBase):
             fs_root,
             render_template=repr,
             xblock_mixins=XBLOCK_MIXINS,
+            asset_metadata_collection=self.asset_metadata_collection,
         )
         modulestore.ensure_indexes()
 
@@ -224,6 +257,8 @@ class VersioningModulestoreBuilder(StoreBuilderBase):
             rmtree(fs_root, ignore_errors=True)
 
     def __repr__(self):
+        if self.asset_metadata_collection:
+            return 'SplitModulestoreBuilder(asset_metadata_collection=True)'
         return 'SplitModulestoreBuilder()'
 
 
@@ -312,6 +347,9 @@ class MixedModulestoreBuilder(StoreBuilderBase):
             # Mongo modulestore beneath mixed.
             # Returns the entire collection with *all* courses' asset metadata.
             return store.asset_collection
+        elif store.asset_metadata_collection:
+            # Split modulestore keeping asset metadata in its own collection.
+            return store.db_connection.asset_metadata
         else:
             # Split modulestore beneath mixed.
             # Split stores all asset metadata in the structure collection.
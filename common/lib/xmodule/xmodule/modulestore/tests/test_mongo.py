@@ -17,7 +17,7 @@ from uuid import uuid4
 from datetime import datetime
 from pytz import UTC
 import unittest
-from mock import patch
+from mock import patch, Mock
 from xblock.core import XBlock
 
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
@@ -40,8 +40,11 @@ from nose.tools import assert_in
 from xmodule.exceptions import NotFoundError
 from git.test.lib.asserts import assert_not_none
 from xmodule.x_module import XModuleMixin
-from xmodule.modulestore.mongo.base import as_draft
+from xmodule.modulestore.mongo.base import (
+    as_draft, INHERITANCE_INDEX_CACHE_KEY, INHERITANCE_INDEX_VERSION_CACHE_KEY
+)
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
+from xmodule.modulestore.tests.test_cross_modulestore_import_export import MemoryCache
 from xmodule.modulestore.tests.utils import LocationMixin, mock_tab_from_json
 from xmodule.modulestore.edit_info import EditInfoMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError
@@ -759,6 +762,108 @@ class TestMongoModuleStore(TestMongoModuleStoreBase):
         # Clean up the data so we don't break other tests which apparently expect a particular state
         self.draft_store.delete_course(course.id, self.dummy_user)
 
+    def test_update_inheritance_tree_incrementally(self):
+        """
+        Test that updating a block only recomputes the inheritance of its subtree.
+        """
+        course = self.draft_store.create_course("TestX", "Inheritance", "1234_A1", self.dummy_user)
+        chapter = self.draft_store.create_child(self.dummy_user, course.location, "chapter")
+        sequential = self.draft_store.create_child(self.dummy_user, chapter.location, "sequential")
+        problem = self.draft_store.create_child(self.dummy_user, sequential.location, "problem")
+        self.addCleanup(self.draft_store.delete_course, course.id, self.dummy_user)
+
+        with patch.object(self.draft_store, 'request_cache', Mock(data={})):
+            self.draft_store._get_cached_metadata_inheritance_tree(course.id)
+            chapter = self.draft_store.get_item(chapter.location)
+            chapter.graded = True
+            with patch.object(
+                self.draft_store, '_compute_metadata_inheritance_tree',
+                wraps=self.draft_store._compute_metadata_inheritance_tree
+            ) as mock_compute:
+                self.draft_store.update_item(chapter, self.dummy_user)
+                problem.display_name = "Problem"
+                self.draft_store.update_item(problem, self.dummy_user)
+            self.assertEqual(mock_compute.call_count, 1)
+
+            tree = self.draft_store._get_cached_metadata_inheritance_tree(course.id)
+            self.assertTrue(tree[unicode(sequential.location)]['graded'])
+            self.assertTrue(tree[unicode(problem.location)]['graded'])
+            self.assertEqual(tree[unicode(problem.location)]['parent'].values(), [unicode(sequential.location)])
+            self.assertEqual(
+                tree, self.draft_store._expand_inheritance_index(
+                    self.draft_store._compute_metadata_inheritance_tree(course.id)
+                )
+            )
+
+    def test_concurrent_inheritance_updates(self):
+        """
+        Test that the cached inheritance index is computed again when it may miss a concurrent update.
+        """
+        course = self.draft_store.create_course("TestX", "Inheritance", "1234_A2", self.dummy_user)
+        chapter = self.draft_store.create_child(self.dummy_user, course.location, "chapter")
+        other_chapter = self.draft_store.create_child(self.dummy_user, course.location, "chapter")
+        problem = self.draft_store.create_child(self.dummy_user, other_chapter.location, "problem")
+        self.addCleanup(self.draft_store.delete_course, course.id, self.dummy_user)
+
+        with patch.object(self.draft_store, 'metadata_inheritance_cache_subsystem', MemoryCache()):
+            with patch.object(self.draft_store, 'request_cache', Mock(data={})):
+                self.draft_store._get_cached_metadata_inheritance_tree(course.id)
+
+            # Another process updates other_chapter, but the index it computed is overwritten
+            other_chapter = self.draft_store.get_item(other_chapter.location)
+            other_chapter.graded = True
+            with patch.object(self.draft_store, 'request_cache', Mock(data={})):
+                self.draft_store.update_item(other_chapter, self.dummy_user)
+            stale_index = self.draft_store.metadata_inheritance_cache_subsystem.get(
+                INHERITANCE_INDEX_CACHE_KEY.format(course.id)
+            )
+            self.draft_store.metadata_inheritance_cache_subsystem.set(
+                INHERITANCE_INDEX_CACHE_KEY.format(course.id), (stale_index[0] - 1, stale_index[1])
+            )
+
+            with patch.object(self.draft_store, 'request_cache', Mock(data={})):
+                chapter = self.draft_store.get_item(chapter.location)
+                chapter.graded = True
+                with patch.object(
+                    self.draft_store, '_compute_metadata_inheritance_tree',
+                    wraps=self.draft_store._compute_metadata_inheritance_tree
+                ) as mock_compute:
+                    self.draft_store.update_item(chapter, self.dummy_user)
+                # the whole index was computed again
+                mock_compute.assert_called_once_with(course.id)
+
+            with patch.object(self.draft_store, 'request_cache', Mock(data={})):
+                tree = self.draft_store._get_cached_metadata_inheritance_tree(course.id)
+            self.assertTrue(tree[unicode(problem.location)]['graded'])
+
+    def test_inheritance_tree_kept_in_process(self):
+        """
+        Test that the inheritance tree isn't expanded again while the cached index is current.
+        """
+        course = self.draft_store.create_course("TestX", "Inheritance", "1234_A3", self.dummy_user)
+        self.draft_store.create_child(self.dummy_user, course.location, "chapter")
+        self.addCleanup(self.draft_store.delete_course, course.id, self.dummy_user)
+
+        with patch.object(self.draft_store, 'metadata_inheritance_cache_subsystem', MemoryCache()):
+            with patch.object(self.draft_store, 'request_cache', Mock(data={})):
+                tree = self.draft_store._get_cached_metadata_inheritance_tree(course.id)
+
+            with patch.object(self.draft_store, 'request_cache', Mock(data={})):
+                with patch.object(self.draft_store, '_expand_inheritance_index') as mock_expand:
+                    with patch.object(self.draft_store, '_load_inheritance_index') as mock_load:
+                        self.assertIs(self.draft_store._get_cached_metadata_inheritance_tree(course.id), tree)
+            self.assertFalse(mock_expand.called)
+            self.assertFalse(mock_load.called)
+
+            # A change by another process makes the tree of this process stale
+            self.draft_store.metadata_inheritance_cache_subsystem.incr(
+                INHERITANCE_INDEX_VERSION_CACHE_KEY.format(course.id)
+            )
+            with patch.object(self.draft_store, 'request_cache', Mock(data={})):
+                new_tree = self.draft_store._get_cached_metadata_inheritance_tree(course.id)
+            self.assertIsNot(new_tree, tree)
+            self.assertEqual(new_tree, tree)
+
 
 class TestMongoModuleStoreWithNoAssetCollection(TestMongoModuleStore):
     '''
@@ -28,6 +28,8 @@ from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.x_module import XModuleMixin
 from xmodule.fields import Date, Timedelta
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
+from xmodule.modulestore.split_mongo.mongo_connection import StructureLRUCache
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.modulestore.tests.factories import check_mongo_calls
@@ -837,6 +839,48 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    def test_process_structure_cache(self):
+        process_cache = StructureLRUCache(10 ** 8)
+        with patch('xmodule.modulestore.split_mongo.mongo_connection.STRUCTURE_CACHE', process_cache):
+            with check_mongo_calls(1):
+                not_cached_structure = self._get_structure(self.new_course)
+
+            # The dummy shared cache doesn't cache, but the process cache does
+            with check_mongo_calls(0):
+                cached_structure = self._get_structure(self.new_course)
+            self.assertEqual(cached_structure, not_cached_structure)
+            self.assertEqual((process_cache.hits, process_cache.misses), (1, 1))
+
+            # Changes to the blocks of a structure don't leak into the cache
+            block = cached_structure['blocks'][cached_structure['root']]
+            block.fields['display_name'] = 'Changed'
+            block.definition_loaded = True
+            block = self._get_structure(self.new_course)['blocks'][cached_structure['root']]
+            self.assertNotEqual(block.fields.get('display_name'), 'Changed')
+            self.assertFalse(block.definition_loaded)
+
+    def test_process_structure_cache_compressed(self):
+        process_cache = StructureLRUCache(10 ** 8, compress=True)
+        with patch('xmodule.modulestore.split_mongo.mongo_connection.STRUCTURE_CACHE', process_cache):
+            not_cached_structure = self._get_structure(self.new_course)
+            with check_mongo_calls(0):
+                cached_structure = self._get_structure(self.new_course)
+        self.assertEqual(cached_structure, not_cached_structure)
+
+    def test_process_structure_cache_size(self):
+        structure = self._get_structure(self.new_course)
+        process_cache = StructureLRUCache(10 ** 8)
+        process_cache.set('first', structure)
+        size = process_cache.size
+        self.assertGreater(size, 0)
+
+        # Only room for one structure
+        process_cache.max_bytes = size * 3 / 2
+        process_cache.set('second', structure)
+        self.assertIsNone(process_cache.get('first'))
+        self.assertEqual(process_cache.get('second'), structure)
+        self.assertEqual(process_cache.size, size)
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
@@ -1075,6 +1119,46 @@ class SplitModuleItemTests(SplitModuleTest):
         parent = modulestore().get_parent_location(locator)
         self.assertIsNone(parent)
 
+    def test_structure_index(self):
+        # pylint: disable=protected-access
+        locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        structure = modulestore()._lookup_course(locator).structure
+        index = StructureIndex(structure)
+        self.assertEqual(len(index.all_blocks), 7)
+        self.assertItemsEqual(
+            index.blocks_of_type('chapter'),
+            [BlockKey('chapter', 'chapter1'), BlockKey('chapter', 'chapter2'), BlockKey('chapter', 'chapter3')]
+        )
+        self.assertEqual(index.blocks_named('chapter1'), [BlockKey('chapter', 'chapter1')])
+        self.assertEqual(index.parents(BlockKey('chapter', 'chapter1')), [BlockKey('course', 'head12345')])
+        self.assertEqual(index.parents(BlockKey('course', 'head12345')), [])
+        self.assertEqual(index.candidates({'block_type': 'garbage'}, {}), [])
+        self.assertEqual(len(index.candidates({'block_type': re.compile('chap')}, {})), 7)
+
+        # The indexes of a version are shared
+        self.assertIs(
+            modulestore().get_structure_index(locator, structure),
+            modulestore().get_structure_index(locator, modulestore()._lookup_course(locator).structure),
+        )
+
+    def test_get_parents_in_bulk_operation(self):
+        user = random.getrandbits(32)
+        course = modulestore().create_course('test_org', 'test_index', 'test_run', user, BRANCH_NAME_DRAFT)
+        course_key = course.id.version_agnostic()
+        chapter = modulestore().create_child(user, course.location, 'chapter')
+        self.assertEqual(modulestore().get_parent_location(chapter.location).block_id, course.location.block_id)
+        with modulestore().bulk_operations(course_key):
+            sequential = modulestore().create_child(user, chapter.location.version_agnostic(), 'sequential')
+            # The structure being edited isn't served from stale indexes
+            self.assertEqual(
+                modulestore().get_parent_location(sequential.location.version_agnostic()).block_id,
+                chapter.location.block_id
+            )
+            self.assertEqual(len(modulestore().get_items(course_key, qualifiers={'category': 'sequential'})), 1)
+            modulestore().create_child(user, chapter.location.version_agnostic(), 'sequential')
+            self.assertEqual(len(modulestore().get_items(course_key, qualifiers={'category': 'sequential'})), 2)
+        self.assertEqual(len(modulestore().get_items(course_key, qualifiers={'category': 'sequential'})), 2)
+
     @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
     def test_get_children(self, _from_json):
         """
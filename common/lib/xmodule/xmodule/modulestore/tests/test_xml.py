@@ -148,3 +148,25 @@ class TestXMLModuleStore(unittest.TestCase):
         other_parent = store.get_item(other_parent_loc)
         # children rather than get_children b/c the instance returned by get_children != shared_item
         self.assertIn(shared_item_loc, other_parent.children)
+
+    def test_get_items(self):
+        """
+        Test that get_items finds the same items through the category and name indexes
+        """
+        store = XMLModuleStore(DATA_DIR, source_dirs=['toy'], xblock_mixins=(XModuleMixin,))
+        course_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+        all_items = store.get_items(course_key)
+
+        for category in ['chapter', 'html', 'about', 'course_info', 'static_tab', 'no_such_category']:
+            self.assertItemsEqual(
+                store.get_items(course_key, qualifiers={'category': category}),
+                [item for item in all_items if item.location.category == category]
+            )
+
+        items = store.get_items(course_key, qualifiers={'category': 'chapter', 'name': 'Overview'})
+        self.assertEqual([item.location for item in items], [course_key.make_usage_key('chapter', 'Overview')])
+        self.assertEqual(store.get_items(course_key, qualifiers={'category': 'html', 'name': 'Overview'}), [])
+        self.assertEqual(
+            store.get_items(course_key, qualifiers={'category': 'chapter'}, settings={'display_name': 'Overview'}),
+            items
+        )
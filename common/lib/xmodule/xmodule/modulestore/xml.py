@@ -232,6 +232,7 @@ class ImportSystem(XMLParsingSystem, MakoDescriptorSystem):
                 if descriptor != other_copy:
                     log.warning("%s has more than one definition", descriptor.scope_ids.usage_id)
             xmlstore.modules[course_id][descriptor.scope_ids.usage_id] = descriptor
+            xmlstore._clear_item_index(course_id)  # pylint: disable=protected-access
 
             if descriptor.has_children:
                 for child in descriptor.get_children():
@@ -353,6 +354,7 @@ class XMLModuleStore(ModuleStoreReadBase):
 
         self.data_dir = path(data_dir)
         self.modules = defaultdict(dict)  # course_id -> dict(location -> XBlock)
+        self._item_indexes = {}  # course_id -> (dict(category -> [location]), dict(name -> [location]))
         self.courses = {}  # course_dir -> XBlock for the course
         self.errored_courses = {}  # course_dir -> errorlog, for dirs that failed to load
 
@@ -418,6 +420,7 @@ class XMLModuleStore(ModuleStoreReadBase):
             course_descriptor.parent = None
             course_id = self.id_from_descriptor(course_descriptor)
             self._course_errors[course_id] = errorlog
+            self._get_item_index(course_id)
 
     def __unicode__(self):
         '''
@@ -734,6 +737,7 @@ class XMLModuleStore(ModuleStoreReadBase):
                         module.save()
 
                         self.modules[course_descriptor.id][module.scope_ids.usage_id] = module
+                        self._clear_item_index(course_descriptor.id)
                 except Exception as exc:  # pylint: disable=broad-except
                     logging.exception("Failed to load %s. Skipping... \
                             Exception: %s", filepath, unicode(exc))
@@ -806,12 +810,41 @@ class XMLModuleStore(ModuleStoreReadBase):
                 for fields in [settings, content, qualifiers]
             )
 
-        for mod_loc, module in self.modules[course_id].iteritems():
+        modules = self.modules[course_id]
+        if name or category:
+            by_category, by_name = self._get_item_index(course_id)
+            locations = by_name.get(name, []) if name else by_category.get(category, [])
+        else:
+            locations = modules.iterkeys()
+
+        for mod_loc in locations:
+            module = modules[mod_loc]
             if _block_matches_all(mod_loc, module):
                 items.append(module)
 
         return items
 
+    def _get_item_index(self, course_id):
+        """
+        Return the locations of the items in the course keyed by category, and
+        keyed by name, built once the course is loaded.
+        """
+        item_index = self._item_indexes.get(course_id)
+        if item_index is None:
+            by_category = defaultdict(list)
+            by_name = defaultdict(list)
+            for location in self.modules[course_id]:
+                by_category[location.category].append(location)
+                by_name[location.name].append(location)
+            item_index = self._item_indexes[course_id] = (dict(by_category), dict(by_name))
+        return item_index
+
+    def _clear_item_index(self, course_id):
+        """
+        Forget the index of the items in the course, after items are added to it.
+        """
+        self._item_indexes.pop(course_id, None)
+
     def make_course_key(self, org, course, run):
         """
         Return a valid :class:`~opaque_keys.edx.locator.CourseLocator` for this modulestore
@@ -164,6 +164,24 @@ class ContentTest(unittest.TestCase):
 
         self.assertEqual(total_length, last_byte - first_byte + 1)
 
+    def test_static_content_stream_chunk_size(self):
+        """
+        Test StaticContentStream reads the stream in chunks of chunk_size bytes
+        """
+        item = FakeGridFsItem(SAMPLE_STRING)
+        static_content_stream = StaticContentStream('loc', 'name', 'type', item, length=item.length, chunk_size=100)
+
+        chunks = list(static_content_stream.stream_data_in_range(150, 1000))
+        self.assertEqual(''.join(chunks), SAMPLE_STRING[150:1001])
+        self.assertEqual(len(chunks[0]), 100)
+
+    def test_static_content_stream_data_in_range(self):
+        """
+        Test StaticContent stream_data_in_range function, for data in memory
+        """
+        content = StaticContent('loc', 'name', 'type', SAMPLE_STRING, length=len(SAMPLE_STRING))
+        self.assertEqual(''.join(content.stream_data_in_range(100, 1500)), SAMPLE_STRING[100:1501])
+
     def test_static_content_write_js(self):
         """
         Test that only one filename starts with 000.
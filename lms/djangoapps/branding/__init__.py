@@ -39,6 +39,28 @@ def get_visible_courses():
         return [course for course in courses if course.location.org not in org_filter_out_set]
 
 
+def get_visible_courses_filters():
+    """
+    Return the keyword arguments of CourseOverview.objects.catalog that select
+    the courses which should be visible in this branded instance, like
+    get_visible_courses does.
+    """
+    filtered_by_org = microsite.get_value('course_org_filter')
+    if filtered_by_org:
+        return {'orgs': [filtered_by_org]}
+
+    subdomain = microsite.get_value('subdomain', 'default')
+    if hasattr(settings, 'COURSE_LISTINGS') and subdomain in settings.COURSE_LISTINGS and not settings.DEBUG:
+        filtered_visible_ids = [
+            SlashSeparatedCourseKey.from_deprecated_string(c) for c in settings.COURSE_LISTINGS[subdomain]
+        ]
+        if filtered_visible_ids:
+            return {'course_ids': filtered_visible_ids}
+
+    # Filter out any courses in an "org" that has been declared to be in a Microsite
+    return {'exclude_orgs': list(microsite.get_all_orgs())}
+
+
 def get_university_for_request():
     """
     Return the university name specified for the domain, or None
@@ -257,6 +257,19 @@ class CourseAuthorization(models.Model):
         except cls.DoesNotExist:
             return False
 
+    @classmethod
+    def instructor_email_enabled_courses(cls, course_ids):
+        """
+        Returns the set of the given course ids for which email is enabled,
+        with a single query.
+        """
+        if not settings.FEATURES['REQUIRE_COURSE_EMAIL_AUTH']:
+            return frozenset(course_ids)
+
+        return frozenset(
+            record.course_id for record in cls.objects.filter(course_id__in=course_ids, email_enabled=True)
+        )
+
     def __unicode__(self):
         not_en = "Not "
         if self.email_enabled:
@@ -23,6 +23,9 @@ class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
     :class:`~courseware.field_overrides.FieldOverrideProvider` which allows for
     overrides to be made on a per user basis.
     """
+    # The fields a coach can change when scheduling a CCX.
+    overridden_fields = ('start', 'due', 'visible_to_staff_only', 'grading_policy')
+
     def get(self, block, name, default):
         """
         Just call the get_override_for_ccx method if there is a ccx
@@ -42,7 +45,7 @@ class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
             msg = "Unable to get course id when calculating ccx overide for block type %r"
             log.error(msg, type(block))
         if course_key is not None:
-            ccx = get_current_ccx(course_key)
+            ccx = _get_current_ccx_for_user(self.user, course_key)
         if ccx:
             return get_override_for_ccx(ccx, block, name, default)
         return default
@@ -72,6 +75,21 @@ def get_current_ccx(course_key):
     return CustomCourseForEdX.objects.get(pk=course_key.ccx)
 
 
+def _get_current_ccx_for_user(user, course_key):
+    """
+    Return the ccx that is active for this course, as `get_current_ccx`.
+
+    This is called for every field read, so the ccx is kept on the `user`
+    object whose blocks are being read, along with the overrides loaded for
+    it, and is dropped with it.
+    """
+    if not hasattr(user, '_current_ccxs'):
+        user._current_ccxs = {}  # pylint: disable=protected-access
+    if course_key not in user._current_ccxs:  # pylint: disable=protected-access
+        user._current_ccxs[course_key] = get_current_ccx(course_key)  # pylint: disable=protected-access
+    return user._current_ccxs[course_key]  # pylint: disable=protected-access
+
+
 def get_override_for_ccx(ccx, block, name, default=None):
     """
     Gets the value of the overridden field for the `ccx`.  `block` and `name`
@@ -94,21 +112,52 @@ def _get_overrides_for_ccx(ccx, block):
     """
     overrides = {}
     # block as passed in may have a location specific to a CCX, we must strip
-    # that for this query
+    # that for this lookup
     location = block.location
     if isinstance(block.location, CCXBlockUsageLocator):
         location = block.location.to_block_locator()
-    query = CcxFieldOverride.objects.filter(
-        ccx=ccx,
-        location=location
-    )
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for field_name, value in _get_all_overrides_for_ccx(ccx).get(_location_key(location), {}).iteritems():
+        field = block.fields[field_name]
+        overrides[field_name] = field.from_json(json.loads(value))
     return overrides
 
 
+def _get_all_overrides_for_ccx(ccx):
+    """
+    Returns all the overrides set for this CCX, as a dictionary of JSON field
+    values keyed by location, as stored in the database, and field name.
+
+    The overrides are loaded with a single query, and kept on the `ccx`
+    object, so that rendering or grading many blocks doesn't cost a query per
+    block.
+    """
+    all_overrides = getattr(ccx, '_field_overrides', None)
+    if all_overrides is None:
+        all_overrides = {}
+        query = CcxFieldOverride.objects.filter(ccx=ccx).values_list('location', 'field', 'value')
+        for location, field_name, value in query:
+            all_overrides.setdefault(unicode(location), {})[field_name] = value
+        ccx._field_overrides = all_overrides  # pylint: disable=protected-access
+    return all_overrides
+
+
+def _location_key(location):
+    """
+    Returns `location` the way it is stored in the database.
+    """
+    location_field = CcxFieldOverride._meta.get_field('location')  # pylint: disable=protected-access
+    return location_field.get_prep_value(location)
+
+
+def _clear_overrides_for_ccx(ccx, block):
+    """
+    Forgets the overrides loaded for the `ccx`.
+    """
+    ccx._field_overrides = None  # pylint: disable=protected-access
+    if hasattr(block, '_ccx_overrides'):
+        block._ccx_overrides.pop(ccx.id, None)  # pylint: disable=protected-access
+
+
 @transaction.commit_on_success
 def override_field_for_ccx(ccx, block, name, value):
     """
@@ -132,8 +181,7 @@ def override_field_for_ccx(ccx, block, name, value):
             field=name)
         override.value = value
     override.save()
-    if hasattr(block, '_ccx_overrides'):
-        del block._ccx_overrides[ccx.id]  # pylint: disable=protected-access
+    _clear_overrides_for_ccx(ccx, block)
 
 
 def clear_override_for_ccx(ccx, block, name):
@@ -149,8 +197,7 @@ def clear_override_for_ccx(ccx, block, name):
             location=block.location,
             field=name).delete()
 
-        if hasattr(block, '_ccx_overrides'):
-            del block._ccx_overrides[ccx.id]  # pylint: disable=protected-access
+        _clear_overrides_for_ccx(ccx, block)
 
     except CcxFieldOverride.DoesNotExist:
         pass
@@ -113,6 +113,20 @@ class TestFieldOverrides(ModuleStoreTestCase):
             dummy2 = chapter.start
             dummy3 = chapter.start
 
+    def test_overrides_are_loaded_once(self):
+        """
+        Test that all the overrides of the ccx are loaded by one query.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapters = self.ccx.course.get_children()
+        for chapter in chapters:
+            override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+        with self.assertNumQueries(1):
+            for chapter in chapters:
+                self.assertEquals(chapter.start, ccx_start)
+                for sequential in chapter.get_children():
+                    self.assertEquals(sequential.start, ccx_start)
+
     def test_override_is_inherited(self):
         """
         Test that sequentials inherit overridden start date from chapter.
@@ -188,19 +188,43 @@ def certificate_status_for_student(student, course_id):
     try:
         generated_certificate = GeneratedCertificate.objects.get(
             user=student, course_id=course_id)
-        d = {'status': generated_certificate.status,
-             'mode': generated_certificate.mode}
-        if generated_certificate.grade:
-            d['grade'] = generated_certificate.grade
-        if generated_certificate.status == CertificateStatuses.downloadable:
-            d['download_url'] = generated_certificate.download_url
-
-        return d
+        return _certificate_status(generated_certificate)
     except GeneratedCertificate.DoesNotExist:
         pass
     return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
 
 
+def certificate_statuses_for_student(student, course_ids):
+    """
+    Returns, with a single query, a dictionary mapping each of `course_ids` to
+    what `certificate_status_for_student` returns for it, and the set of
+    those courses the student has a certificate in.
+    """
+    statuses = {
+        course_id: {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
+        for course_id in course_ids
+    }
+    certificate_course_ids = set()
+    for generated_certificate in GeneratedCertificate.objects.filter(user=student, course_id__in=course_ids):
+        statuses[generated_certificate.course_id] = _certificate_status(generated_certificate)
+        certificate_course_ids.add(generated_certificate.course_id)
+    return statuses, certificate_course_ids
+
+
+def _certificate_status(generated_certificate):
+    """
+    The status dictionary of `certificate_status_for_student` for an existing certificate.
+    """
+    d = {'status': generated_certificate.status,
+         'mode': generated_certificate.mode}
+    if generated_certificate.grade:
+        d['grade'] = generated_certificate.grade
+    if generated_certificate.status == CertificateStatuses.downloadable:
+        d['download_url'] = generated_certificate.download_url
+
+    return d
+
+
 def certificate_info_for_user(user, course_id, grade, user_is_whitelisted=None):
     """
     Returns the certificate info for a user for grade report.
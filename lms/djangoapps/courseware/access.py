@@ -35,7 +35,7 @@ from external_auth.models import ExternalAuthMap
 from courseware.masquerade import get_masquerade_role, is_masquerading_as_student
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from student import auth
-from student.models import CourseEnrollmentAllowed
+from student.models import CourseAccessRole, CourseEnrollmentAllowed
 from student.roles import (
     GlobalStaff, CourseStaffRole, CourseInstructorRole,
     OrgStaffRole, OrgInstructorRole, CourseBetaTesterRole
@@ -403,6 +403,78 @@ def _has_access_course_overview(user, action, course_overview):
         raise ValueError(u"Unknown action for object type 'CourseOverview': '{}'".format(action))
 
 
+CATALOG_ACTIONS = ('see_exists', 'see_in_catalog', 'see_about_page')
+
+
+def catalog_filters_for_user(user, action):
+    """
+    Returns the keyword arguments of CourseOverviewManager.catalog which select
+    the courses on which the user has `action` access, as has_access does for
+    their descriptors, so that the database can filter the course catalog.
+
+    Arguments:
+        user (User): the user whose access we are checking. May be anonymous.
+        action (str): one of CATALOG_ACTIONS.
+    """
+    if action not in CATALOG_ACTIONS:
+        raise ValueError(u"Unknown catalog action: '{}'".format(action))
+    if not user:
+        user = AnonymousUser()
+    if GlobalStaff().has_user(user):
+        return {}
+
+    # Course staff can see their courses whatever the action
+    include_course_ids = set()
+    include_orgs = set()
+    beta_course_ids = set()
+    if user.is_authenticated() and user.is_active:
+        roles = CourseAccessRole.objects.filter(
+            user=user, role__in=(CourseStaffRole.ROLE, CourseInstructorRole.ROLE, CourseBetaTesterRole.ROLE)
+        ).values_list('role', 'org', 'course_id')
+        for role, org, course_id in roles:
+            if role == CourseBetaTesterRole.ROLE:
+                if course_id:
+                    beta_course_ids.add(course_id)
+            elif course_id:
+                include_course_ids.add(course_id)
+            elif org:
+                include_orgs.add(org)
+
+    if action == 'see_in_catalog':
+        filters = {'visibilities': [CATALOG_VISIBILITY_CATALOG_AND_ABOUT]}
+    elif action == 'see_about_page':
+        filters = {'visibilities': [CATALOG_VISIBILITY_CATALOG_AND_ABOUT, CATALOG_VISIBILITY_ABOUT]}
+    else:
+        filters = {
+            'open_only': True,
+            'ignore_start_dates': settings.FEATURES['DISABLE_START_DATES'] or in_preview_mode(),
+        }
+        if settings.FEATURES.get('RESTRICT_ENROLL_BY_REG_METHOD'):
+            filters['enrollment_domains'] = (
+                list(ExternalAuthMap.objects.filter(user=user).values_list('external_domain', flat=True))
+                if user.is_authenticated() else []
+            )
+        if user.is_authenticated():
+            # Users allowed to enroll in a course can always see it
+            include_course_ids.update(
+                CourseEnrollmentAllowed.objects.filter(email=user.email).values_list('course_id', flat=True)
+            )
+        if beta_course_ids and not filters['ignore_start_dates']:
+            # Beta testers can see their courses before they start
+            now = datetime.now(UTC())
+            include_course_ids.update(
+                overview.id for overview in CourseOverview.objects.filter(id__in=beta_course_ids)
+                if not overview.visible_to_staff_only and (
+                    overview.start is None or
+                    now > _adjust_start_date_for_beta_testers(user, overview, overview.id)
+                )
+            )
+
+    filters['include_course_ids'] = include_course_ids
+    filters['include_orgs'] = include_orgs
+    return filters
+
+
 def _has_access_error_desc(user, action, descriptor, course_key):
     """
     Only staff should see error descriptors.
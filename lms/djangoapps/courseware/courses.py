@@ -1,11 +1,16 @@
 from collections import defaultdict
+from datetime import datetime
 from fs.errors import ResourceNotFoundError
+import hashlib
 import logging
 import inspect
 
 from path import path
+from pytz import UTC
+from django.core.cache import cache
 from django.http import Http404
 from django.conf import settings
+from django.utils.translation import get_language
 
 from edxmako.shortcuts import render_to_string
 from xmodule.modulestore import ModuleStoreEnum
@@ -18,9 +23,12 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.x_module import STUDENT_VIEW
 from microsite_configuration import microsite
 
-from courseware.access import has_access
+from courseware.access import has_access, catalog_filters_for_user, CATALOG_ACTIONS
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module
+from openedx.core.djangoapps.content.course_overviews.models import (
+    CourseOverview, CATALOG_SORT_BY_ANNOUNCEMENT, CATALOG_SORT_BY_START_DATE
+)
 from student.models import CourseEnrollment
 import branding
 
@@ -116,6 +124,8 @@ def get_course_with_access(user, action, course_key, depth=0, check_if_enrolled=
 def course_image_url(course):
     """Try to look up the image url for the course.  If it's not found,
     log an error and return the dead link"""
+    if isinstance(course, CourseOverview):
+        return course.course_image_url
     if course.static_asset_path or modulestore().get_modulestore_type(course.id) == ModuleStoreEnum.Type.xml:
         # If we are a static course with the course_image attribute
         # set different than the default, return that path so that
@@ -397,6 +407,70 @@ def sort_by_start_date(courses):
     return courses
 
 
+def get_sorted_courses(user, domain=None, limit=None):
+    """
+    Returns the courses available to the user, sorted by start date or by
+    announcement as configured, and limited to the first `limit` courses if
+    given.
+
+    If the ENABLE_COURSE_CATALOG_QUERIES feature is enabled, these are the
+    CourseOverviews of the courses, filtered, sorted and limited by the
+    database, rather than course descriptors.
+    """
+    sort_by_start = microsite.get_value(
+        "ENABLE_COURSE_SORTING_BY_START_DATE",
+        settings.FEATURES["ENABLE_COURSE_SORTING_BY_START_DATE"]
+    )
+    permission_name = microsite.get_value(
+        'COURSE_CATALOG_VISIBILITY_PERMISSION',
+        settings.COURSE_CATALOG_VISIBILITY_PERMISSION
+    )
+    if (
+            not settings.FEATURES.get('ENABLE_COURSE_CATALOG_QUERIES') or
+            permission_name not in CATALOG_ACTIONS or
+            settings.FEATURES.get('ACCESS_REQUIRE_STAFF_FOR_COURSE')
+    ):
+        courses = get_courses(user, domain)
+        courses = sort_by_start_date(courses) if sort_by_start else sort_by_announcement(courses)
+        return courses[:limit] if limit is not None else courses
+
+    filters = branding.get_visible_courses_filters()
+    filters.update(catalog_filters_for_user(user, permission_name))
+    courses = CourseOverview.objects.catalog(
+        datetime.now(UTC),
+        sort_by=CATALOG_SORT_BY_START_DATE if sort_by_start else CATALOG_SORT_BY_ANNOUNCEMENT,
+        **filters
+    )
+    if limit is not None:
+        courses = courses[:limit]
+    return list(courses)
+
+
+def render_course_listing(courses):
+    """
+    Returns the HTML of the listing items of the given courses.
+
+    The listing of CourseOverviews is cached for COURSE_LISTING_CACHE_TIMEOUT
+    seconds, per microsite, language and list of courses, so it is shared by
+    all the users who see the same catalog. It is cached until a course is
+    published.
+    """
+    timeout = settings.COURSE_LISTING_CACHE_TIMEOUT
+    if not timeout or not all(isinstance(course, CourseOverview) for course in courses):
+        return render_to_string('course_listing.html', {'courses': courses})
+
+    key_hash = hashlib.md5(u'|'.join(
+        [CourseOverview.get_catalog_version(), get_language() or u''] +
+        [unicode(course.id) for course in courses]
+    ).encode('utf-8')).hexdigest()
+    cache_key = u'course_listing.{}.{}'.format(microsite.get_value('microsite_config_key', 'default'), key_hash)
+    html = cache.get(cache_key)
+    if html is None:
+        html = render_to_string('course_listing.html', {'courses': courses})
+        cache.set(cache_key, html, timeout)
+    return html
+
+
 def get_cms_course_link(course, page='course'):
     """
     Returns a link to course_index for editing the course in cms,
@@ -17,14 +17,21 @@ by `authored_data`, e.g. course content and settings stored in Mongo.
 import threading
 
 from abc import ABCMeta, abstractmethod
+from collections import defaultdict
 from contextlib import contextmanager
+from time import time
+
 from django.conf import settings
+import dogstats_wrapper as dog_stats_api
 from request_cache.middleware import RequestCache
 from xblock.field_data import FieldData
 from xmodule.modulestore.inheritance import InheritanceMixin
 
 NOTSET = object()
-ENABLED_OVERRIDE_PROVIDERS_KEY = "courseware.field_overrides.enabled_providers"
+ENABLED_OVERRIDE_PROVIDERS_KEY = "courseware.field_overrides.enabled_providers.{}"
+
+# How many provider lookups to count in a thread before reporting them.
+STATS_REPORT_INTERVAL = 1000
 
 
 def resolve_dotted(name):
@@ -91,21 +98,20 @@ class OverrideFieldData(FieldData):
     def _providers_for_course(cls, course):
         """
         Return a filtered list of enabled providers based
-        on the course passed in. Cache this result per request to avoid
-        needing to call the provider filter api hundreds of times.
+        on the course passed in. Cache this result per request and course to
+        avoid needing to call the provider filter api hundreds of times.
 
         Arguments:
             course: The course XBlock
         """
         request_cache = RequestCache.get_request_cache()
-        enabled_providers = request_cache.data.get(
-            ENABLED_OVERRIDE_PROVIDERS_KEY, NOTSET
-        )
+        cache_key = ENABLED_OVERRIDE_PROVIDERS_KEY.format(getattr(course, 'id', None))
+        enabled_providers = request_cache.data.get(cache_key, NOTSET)
         if enabled_providers == NOTSET:
             enabled_providers = tuple(
                 (provider_class for provider_class in cls.provider_classes if provider_class.enabled_for(course))
             )
-            request_cache.data[ENABLED_OVERRIDE_PROVIDERS_KEY] = enabled_providers
+            request_cache.data[cache_key] = enabled_providers
 
         return enabled_providers
 
@@ -113,14 +119,33 @@ class OverrideFieldData(FieldData):
         self.fallback = fallback
         self.providers = tuple(provider(user) for provider in providers)
 
+        # The names of the fields some provider may override, or None if
+        # a provider may override any field.
+        self.overridden_fields = frozenset()
+        for provider in self.providers:
+            if provider.overridden_fields is None:
+                self.overridden_fields = None
+                break
+            self.overridden_fields |= frozenset(provider.overridden_fields)
+
+    def may_override(self, name):
+        """
+        Could a provider override the field identified by `name`?
+        """
+        return self.overridden_fields is None or name in self.overridden_fields
+
     def get_override(self, block, name):
         """
         Checks for an override for the field identified by `name` in `block`.
         Returns the overridden value or `NOTSET` if no override is found.
         """
-        if not overrides_disabled():
+        if self.may_override(name) and not overrides_disabled():
             for provider in self.providers:
+                if provider.overridden_fields is not None and name not in provider.overridden_fields:
+                    continue
+                start = time()
                 value = provider.get(block, name, NOTSET)
+                _STATS.record(provider, value is not NOTSET, time() - start)
                 if value is not NOTSET:
                     return value
         return NOTSET
@@ -138,7 +163,7 @@ class OverrideFieldData(FieldData):
         self.fallback.delete(block, name)
 
     def has(self, block, name):
-        if not self.providers:
+        if not self.providers or not self.may_override(name):
             return self.fallback.has(block, name)
 
         has = self.get_override(block, name)
@@ -160,7 +185,7 @@ class OverrideFieldData(FieldData):
     def default(self, block, name):
         # The `default` method is overloaded by the field storage system to
         # also handle inheritance.
-        if self.providers and not overrides_disabled():
+        if self.providers and self.may_override(name) and not overrides_disabled():
             inheritable = InheritanceMixin.fields.keys()
             if name in inheritable:
                 for ancestor in _lineage(block):
@@ -170,6 +195,45 @@ class OverrideFieldData(FieldData):
         return self.fallback.default(block, name)
 
 
+class _OverrideStats(threading.local):
+    """
+    Counts the lookups, hits and time spent of each override provider in a
+    thread, and reports them to datadog every `STATS_REPORT_INTERVAL`
+    lookups, rather than for every field read.
+    """
+    def __init__(self):
+        super(_OverrideStats, self).__init__()
+        self.lookups = 0
+        self.providers = defaultdict(lambda: [0, 0, 0.0])
+
+    def record(self, provider, hit, duration):
+        """
+        Count a lookup by `provider`, which took `duration` seconds.
+        """
+        stats = self.providers[provider.__class__.__name__]
+        stats[0] += 1
+        stats[1] += hit
+        stats[2] += duration
+        self.lookups += 1
+        if self.lookups >= STATS_REPORT_INTERVAL:
+            self.report()
+
+    def report(self):
+        """
+        Send the counts to datadog, and reset them.
+        """
+        for provider_name, (lookups, hits, duration) in self.providers.iteritems():
+            tags = [u'provider:{}'.format(provider_name)]
+            dog_stats_api.increment('courseware.field_overrides.lookups', lookups, tags=tags)
+            dog_stats_api.increment('courseware.field_overrides.hits', hits, tags=tags)
+            dog_stats_api.histogram('courseware.field_overrides.time', duration, tags=tags)
+        self.lookups = 0
+        self.providers.clear()
+
+
+_STATS = _OverrideStats()
+
+
 class _OverridesDisabled(threading.local):
     """
     A thread local used to manage state of overrides being disabled or not.
@@ -213,6 +277,10 @@ class FieldOverrideProvider(object):
     """
     __metaclass__ = ABCMeta
 
+    # The names of the fields this provider may override. `OverrideFieldData`
+    # doesn't ask the provider about any other field. None means any field.
+    overridden_fields = None
+
     def __init__(self, user):
         self.user = user
 
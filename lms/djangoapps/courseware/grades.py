@@ -6,23 +6,39 @@ import json
 import logging
 
 from contextlib import contextmanager
+from django.conf import settings
 from django.db import transaction
 from django.test.client import RequestFactory
 
 import dogstats_wrapper as dog_stats_api
 
 from courseware import courses
-from courseware.model_data import FieldDataCache
+from courseware.model_data import FieldDataCache, ScoresClient
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
-from .models import StudentModule
+from .models import StudentModule, chunks
 from opaque_keys import InvalidKeyError
-from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
+from openedx.core.djangoapps.grading_policy.utils import MaxScoresCache
 from openedx.core.djangoapps.signals.signals import GRADES_UPDATED
 
 
 log = logging.getLogger("edx.courseware")
 
+# Number of students whose state iterate_grades_for loads at once
+BATCH_GRADING_CHUNK_SIZE = 100
+
+# Number of StudentModule rows answer_distributions reads at once
+ANSWER_DISTRIBUTION_CHUNK_SIZE = 1000
+
+# The key under which answer_distributions counts the answers that are not
+# among the most frequent ones of a problem part. Answers are always unicode,
+# so it can't be mistaken for one.
+OTHER_ANSWERS = None
+
+# How the answers counted under OTHER_ANSWERS appear in answer distribution CSVs
+OTHER_ANSWERS_LABEL = u"(other answers)"
+
 
 def descriptor_affects_grading(block_types_affecting_grading, descriptor):
     """
@@ -54,82 +70,207 @@ def field_data_cache_for_grading(course, user):
     )
 
 
-def answer_distributions(course_key):
+class BatchGradingContext(object):
     """
-    Given a course_key, return answer distributions in the form of a dictionary
-    mapping:
+    Course-wide state used to grade many students of the same course.
 
-      (problem url_name, problem display_name, problem_id) -> {dict: answer -> count}
+    The descriptors that could affect grading and their max scores are looked
+    up once for the course, and the `StudentModule` rows of a whole chunk of
+    students are loaded with one query (per 500 locations) by
+    `prefetch_students`, instead of with separate queries for every student.
+    """
+    def __init__(self, course):
+        self.course = course
+        descriptor_filter = partial(descriptor_affects_grading, course.block_types_affecting_grading)
+        self.descriptors = FieldDataCache.descriptor_descendents(course, descriptor_filter=descriptor_filter)
+        self.usage_keys = frozenset(descriptor.scope_ids.usage_id for descriptor in self.descriptors)
+        self.scorable_locations = frozenset(
+            descriptor.location for descriptor in self.descriptors if descriptor.has_score
+        )
+        self.max_scores_cache = MaxScoresCache.create_for_course(course)
+        self.max_scores_cache.fetch_from_remote(self.scorable_locations)
+        self._user_state = {}
+        self._scores = {}
 
-    Answer distributions are found by iterating through all StudentModule
-    entries for a given course with type="problem" and a grade that is not null.
-    This means that we only count LoncapaProblems that people have submitted.
-    Other types of items like ORA or sequences will not be collected. Empty
-    Loncapa problem state that gets created from runnig the progress page is
-    also not counted.
+    def prefetch_students(self, students):
+        """
+        Load the state and scores of all of `students` (a list of Users),
+        replacing whatever was loaded for the previous chunk of students.
+        """
+        self._user_state = defaultdict(dict)
+        self._scores = defaultdict(dict)
+        student_modules = StudentModule.objects.chunked_filter(
+            'module_state_key__in',
+            list(self.usage_keys),
+            course_id=self.course.id,
+            student_id__in=[student.id for student in students],
+        )
+        for student_module in student_modules:
+            usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
+            state = json.loads(student_module.state) if student_module.state is not None else {}
+            self._user_state[student_module.student_id][usage_key] = state
+            if usage_key in self.scorable_locations:
+                self._scores[student_module.student_id][usage_key] = ScoresClient.Score(
+                    student_module.grade, student_module.max_grade
+                )
 
-    This method accesses the StudentModule table directly instead of using the
-    CapaModule abstraction. The main reason for this is so that we can generate
-    the report without any side-effects -- we don't have to worry about answer
-    distribution potentially causing re-evaluation of the student answer. This
-    also allows us to use the read-replica database, which reduces risk of bad
-    locking behavior. And quite frankly, it makes this a lot less confusing.
+    def field_data_cache(self, student):
+        """
+        Return the FieldDataCache for grading `student`, which must have been
+        passed to the latest call of `prefetch_students`.
+        """
+        return FieldDataCache.cache_for_prefetched_user_state(
+            self.course.id, student, self.descriptors, self.usage_keys, self._user_state.get(student.id, {})
+        )
 
-    Also, we're pulling all available records from the database for this course
-    rather than crawling through a student's course-tree -- the latter could
-    potentially cause us trouble with A/B testing. The distribution report may
-    not be aware of problems that are not visible to the user being used to
-    generate the report.
+    def scores_client(self, student):
+        """
+        Return the ScoresClient for grading `student`, which must have been
+        passed to the latest call of `prefetch_students`.
+        """
+        client = ScoresClient(self.course.id, student.id)
+        client.set_scores(self._scores.get(student.id, {}))
+        return client
 
-    This method will try to use a read-replica database if one is available.
+
+class AnswerCounts(object):
+    """
+    Counts the answers given to a problem part approximately, with the
+    Space-Saving algorithm, keeping at most twice `max_answers` distinct
+    answers in memory.
+
+    While there is room, every new answer is counted exactly. Once there
+    isn't, a new answer replaces one of the least counted answers and
+    inherits its count, which becomes the maximum overcount (the error) of
+    the new answer. So the count of each answer is an upper bound of the
+    number of times it was given, and the count minus its error is a lower
+    bound. The error of any answer is at most the total number of answers
+    divided by twice `max_answers`, and any answer given more often than that
+    is counted. If there never were more distinct answers than fit, all
+    errors are zero and the counts are exact.
+    """
+    __slots__ = ('max_answers', 'total', 'counts', 'errors', 'answers_by_count', 'min_count')
+
+    def __init__(self, max_answers):
+        self.max_answers = max_answers
+        self.total = 0
+        self.counts = {}
+        self.errors = {}
+        # The answers having each count, to find one of the least counted
+        # answers in constant time
+        self.answers_by_count = {}
+        self.min_count = 0
+
+    def add(self, answer):
+        """
+        Count one more `answer`.
+        """
+        self.total += 1
+        count = self.counts.get(answer)
+        if count is None:
+            if len(self.counts) < 2 * self.max_answers:
+                count, error = 0, 0
+            else:
+                count = error = self.min_count
+                replaced_answer = self.answers_by_count[count].pop()
+                del self.counts[replaced_answer]
+                del self.errors[replaced_answer]
+                self.answers_by_count[count].add(answer)
+            self.errors[answer] = error
+        self._increment(answer, count)
+
+    def _increment(self, answer, count):
+        """
+        Increment the count of `answer`, which is `count`.
+        """
+        answers = self.answers_by_count.get(count)
+        if answers is not None:
+            answers.discard(answer)
+            if not answers:
+                del self.answers_by_count[count]
+        self.answers_by_count.setdefault(count + 1, set()).add(answer)
+        self.counts[answer] = count + 1
+        if count == 0 or (count == self.min_count and count not in self.answers_by_count):
+            self.min_count = count + 1
+
+    def most_common(self):
+        """
+        Return `(answer, count, error)` for the `max_answers` most counted
+        answers, most counted first, followed by `(OTHER_ANSWERS, count, error)`
+        for all the others if there were any.
+        """
+        ranked = sorted(self.counts.iteritems(), key=lambda (answer, count): (-count, answer))
+        result = [(answer, count, self.errors[answer]) for answer, count in ranked[:self.max_answers]]
+        # The answers not listed were given at least this many times, and at
+        # most as many more times as the listed answers may be overcounted.
+        other_count = self.total - sum(count for __, count, __ in result)
+        other_error = sum(error for __, __, error in result)
+        if other_count or other_error:
+            result.append((OTHER_ANSWERS, other_count + other_error, other_error))
+        return result
+
+
+def _answer_counts(course_key):
+    """
+    Return a dictionary mapping
+
+      (problem url_name, problem display_name, problem_id) -> AnswerCounts
+
+    for all the problems submitted in the course. See `answer_distributions`.
     """
-    # dict: { module.module_state_key : (url_name, display_name) }
+    # dict: { module_state_key string : (url_name, display_name) }
     state_keys_to_problem_info = {}  # For caching, used by url_and_display_name
 
-    def url_and_display_name(usage_key):
+    def url_and_display_name(module_state_key):
         """
-        For a given usage_key, return the problem's url and display_name.
+        For a given module_state_key, return the problem's url and display_name.
         Handle modulestore access and caching. This method ignores permissions.
 
         Raises:
-            InvalidKeyError: if the usage_key does not parse
+            InvalidKeyError: if the module_state_key does not parse
             ItemNotFoundError: if there is no content that corresponds
-                to this usage_key.
+                to this module_state_key.
         """
         problem_store = modulestore()
-        if usage_key not in state_keys_to_problem_info:
+        if module_state_key not in state_keys_to_problem_info:
+            usage_key = UsageKey.from_string(module_state_key).map_into_course(course_key)
             problem = problem_store.get_item(usage_key)
             problem_info = (problem.url_name, problem.display_name_with_default)
-            state_keys_to_problem_info[usage_key] = problem_info
+            state_keys_to_problem_info[module_state_key] = problem_info
 
-        return state_keys_to_problem_info[usage_key]
+        return state_keys_to_problem_info[module_state_key]
 
-    # Iterate through all problems submitted for this course in no particular
-    # order, and build up our answer_counts dict that we will eventually return
-    answer_counts = defaultdict(lambda: defaultdict(int))
-    for module in StudentModule.all_submitted_problems_read_only(course_key):
+    # Iterate through all problems submitted for this course a chunk of rows at
+    # a time, and count the answers of each problem part as we go, so that only
+    # the counts are kept in memory.
+    max_answers = settings.ANSWER_DISTRIBUTION_MAX_ANSWERS
+    answer_counts = {}
+    rows = StudentModule.submitted_problem_states_read_only(course_key, chunk_size=ANSWER_DISTRIBUTION_CHUNK_SIZE)
+    for module_id, student_id, module_state_key, state in rows:
         try:
-            state_dict = json.loads(module.state) if module.state else {}
+            state_dict = json.loads(state) if state else {}
             raw_answers = state_dict.get("student_answers", {})
         except ValueError:
             log.error(
                 u"Answer Distribution: Could not parse module state for StudentModule id=%s, course=%s",
-                module.id,
+                module_id,
                 course_key,
             )
             continue
 
         try:
-            url, display_name = url_and_display_name(module.module_state_key.map_into_course(course_key))
+            url, display_name = url_and_display_name(module_state_key)
             # Each problem part has an ID that is derived from the
             # module.module_state_key (with some suffix appended)
             for problem_part_id, raw_answer in raw_answers.items():
+                key = (url, display_name, problem_part_id)
+                if key not in answer_counts:
+                    answer_counts[key] = AnswerCounts(max_answers)
                 # Convert whatever raw answers we have (numbers, unicode, None, etc.)
                 # to be unicode values. Note that if we get a string, it's always
                 # unicode and not str -- state comes from the json decoder, and that
                 # always returns unicode for strings.
-                answer = unicode(raw_answer)
-                answer_counts[(url, display_name, problem_part_id)][answer] += 1
+                answer_counts[key].add(unicode(raw_answer))
 
         except (ItemNotFoundError, InvalidKeyError):
             msg = "Answer Distribution: Item {} referenced in StudentModule {} " + \
@@ -138,22 +279,88 @@ def answer_distributions(course_key):
                   "was later deleted from the course. This answer will be " + \
                   "omitted from the answer distribution CSV."
             log.warning(
-                msg.format(module.module_state_key, module.id, module.student_id, course_key)
+                msg.format(module_state_key, module_id, student_id, course_key)
             )
             continue
 
     return answer_counts
 
 
+def answer_distributions(course_key):
+    """
+    Given a course_key, return answer distributions in the form of a dictionary
+    mapping:
+
+      (problem url_name, problem display_name, problem_id) -> {dict: answer -> count}
+
+    Answer distributions are found by iterating through all StudentModule
+    entries for a given course with type="problem" and a grade that is not null.
+    This means that we only count LoncapaProblems that people have submitted.
+    Other types of items like ORA or sequences will not be collected. Empty
+    Loncapa problem state that gets created from runnig the progress page is
+    also not counted.
+
+    Only the `settings.ANSWER_DISTRIBUTION_MAX_ANSWERS` most frequent answers
+    of each problem part are listed, the others are counted together under
+    `OTHER_ANSWERS`. The counts are exact unless a problem part got more than
+    twice that many distinct answers. Then they are upper bounds of the
+    number of times each answer was given, see `AnswerCounts`, and
+    `answer_distribution_rows` for their error bounds.
+
+    This method accesses the StudentModule table directly instead of using the
+    CapaModule abstraction. The main reason for this is so that we can generate
+    the report without any side-effects -- we don't have to worry about answer
+    distribution potentially causing re-evaluation of the student answer. This
+    also allows us to use the read-replica database, which reduces risk of bad
+    locking behavior. And quite frankly, it makes this a lot less confusing.
+
+    Also, we're pulling all available records from the database for this course
+    rather than crawling through a student's course-tree -- the latter could
+    potentially cause us trouble with A/B testing. The distribution report may
+    not be aware of problems that are not visible to the user being used to
+    generate the report.
+
+    This method will try to use a read-replica database if one is available.
+    """
+    return {
+        key: {answer: count for answer, count, __ in counts.most_common()}
+        for key, counts in _answer_counts(course_key).iteritems()
+    }
+
+
+def answer_distribution_rows(course_key):
+    """
+    Yield the rows of the answer distribution CSV of a course: a header row,
+    then `[url_name, display name, answer id, answer, count, max overcount]`
+    for each answer counted by `answer_distributions`, by problem part and
+    most frequent answer first. The answers counted under `OTHER_ANSWERS` are
+    labeled `OTHER_ANSWERS_LABEL`.
+
+    The number of times an answer was given is between `count - max overcount`
+    and `count`.
+    """
+    yield ['url_name', 'display name', 'answer id', 'answer', 'count', 'max overcount']
+    answer_counts = _answer_counts(course_key)
+    for key in sorted(answer_counts):
+        url_name, display_name, answer_id = key
+        for answer, count, error in answer_counts[key].most_common():
+            if answer is OTHER_ANSWERS:
+                answer = OTHER_ANSWERS_LABEL
+            yield [url_name, display_name, answer_id, answer, count, error]
+
+
 @transaction.commit_manually
-def grade(student, request, course, keep_raw_scores=False, field_data_cache=None, scores_client=None):
+def grade(student, request, course, keep_raw_scores=False, field_data_cache=None, scores_client=None,
+          max_scores_cache=None):
     """
     Wraps "_grade" with the manual_transaction context manager just in case
     there are unanticipated errors.
     Send a signal to update the minimum grade requirement status.
     """
     with manual_transaction():
-        grade_summary = course.grading.grade(student, request, course, keep_raw_scores, field_data_cache, scores_client)
+        grade_summary = course.grading.grade(
+            student, request, course, keep_raw_scores, field_data_cache, scores_client, max_scores_cache
+        )
         responses = GRADES_UPDATED.send_robust(
             sender=None,
             username=request.user.username,
@@ -219,25 +426,42 @@ def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
     # grading that student.
     request = RequestFactory().get('/')
 
-    for student in students:
-        with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
-            try:
-                request.user = student
-                # Grading calls problem rendering, which calls masquerading,
-                # which checks session vars -- thus the empty session dict below.
-                # It's not pretty, but untangling that is currently beyond the
-                # scope of this feature.
-                request.session = {}
-                gradeset = grade(student, request, course, keep_raw_scores)
-                yield student, gradeset, ""
-            except Exception as exc:  # pylint: disable=broad-except
-                # Keep marching on even if this student couldn't be graded for
-                # some reason, but log it for future reference.
-                log.exception(
-                    'Cannot grade student %s (%s) in course %s because of exception: %s',
-                    student.username,
-                    student.id,
-                    course.id,
-                    exc.message
-                )
-                yield student, {}, exc.message
+    with manual_transaction():
+        batch_context = BatchGradingContext(course)
+
+    for students_chunk in chunks(students, BATCH_GRADING_CHUNK_SIZE):
+        with manual_transaction():
+            batch_context.prefetch_students(students_chunk)
+
+        for student in students_chunk:
+            with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
+                try:
+                    request.user = student
+                    # Grading calls problem rendering, which calls masquerading,
+                    # which checks session vars -- thus the empty session dict below.
+                    # It's not pretty, but untangling that is currently beyond the
+                    # scope of this feature.
+                    request.session = {}
+                    gradeset = grade(
+                        student,
+                        request,
+                        course,
+                        keep_raw_scores,
+                        field_data_cache=batch_context.field_data_cache(student),
+                        scores_client=batch_context.scores_client(student),
+                        max_scores_cache=batch_context.max_scores_cache,
+                    )
+                    yield student, gradeset, ""
+                except Exception as exc:  # pylint: disable=broad-except
+                    # Keep marching on even if this student couldn't be graded for
+                    # some reason, but log it for future reference.
+                    log.exception(
+                        'Cannot grade student %s (%s) in course %s because of exception: %s',
+                        student.username,
+                        student.id,
+                        course.id,
+                        exc.message
+                    )
+                    yield student, {}, exc.message
+
+        batch_context.max_scores_cache.push_to_remote()
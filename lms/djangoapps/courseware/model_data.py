@@ -25,6 +25,7 @@ import json
 from abc import abstractmethod, ABCMeta
 from collections import defaultdict, namedtuple
 from .models import (
+    PersistentSectionGrade,
     StudentModule,
     XModuleUserStateSummaryField,
     XModuleStudentPrefsField,
@@ -36,6 +37,7 @@ from opaque_keys.edx.block_types import BlockTypeKeyV1
 from opaque_keys.edx.asides import AsideUsageKeyV1
 from contracts import contract, new_contract
 
+from django.conf import settings
 from django.db import DatabaseError
 
 from xblock.runtime import KeyValueStore
@@ -353,6 +355,21 @@ class UserStateCache(object):
         self.course_id = course_id
         self.user = user
         self._client = DjangoXBlockUserStateClient(self.user)
+        self._prefetched_keys = frozenset()
+        self._prefetched_state = {}
+
+    def prime(self, usage_keys, block_field_state):
+        """
+        Supply state that the caller has already loaded in bulk, so that
+        :meth:`cache_fields` doesn't query for it again.
+
+        Arguments:
+            usage_keys (set of :class:`UsageKey`): The usage keys whose state was loaded.
+            block_field_state (dict): Maps those of ``usage_keys`` that have stored
+                state to their field state. Keys that are missing have no stored state.
+        """
+        self._prefetched_keys = frozenset(usage_keys)
+        self._prefetched_state = block_field_state
 
     def cache_fields(self, fields, xblocks, aside_types):  # pylint: disable=unused-argument
         """
@@ -364,9 +381,14 @@ class UserStateCache(object):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
+        usage_keys = _all_usage_keys(xblocks, aside_types)
+        for usage_key in usage_keys & self._prefetched_keys:
+            if usage_key in self._prefetched_state:
+                self._cache[usage_key] = self._prefetched_state[usage_key]
+
         block_field_state = self._client.get_many(
             self.user.username,
-            _all_usage_keys(xblocks, aside_types),
+            usage_keys - self._prefetched_keys,
         )
         for usage_key, field_state in block_field_state:
             self._cache[usage_key] = field_state
@@ -501,6 +523,9 @@ class UserStateCache(object):
             student_module.max_grade = max_score
             student_module.save()
 
+        if settings.FEATURES.get('ENABLE_PERSISTENT_GRADES'):
+            PersistentSectionGrade.invalidate_for_block(user_id, usage_key)
+
     def __len__(self):
         return len(self._cache)
 
@@ -767,6 +792,14 @@ class FieldDataCache(object):
             descriptor_filter is a function that accepts a descriptor and return whether the field data
                 should be cached
         """
+        self.add_descriptors_to_cache(self.descriptor_descendents(descriptor, depth, descriptor_filter))
+
+    @staticmethod
+    def descriptor_descendents(descriptor, depth=None, descriptor_filter=lambda descriptor: True):
+        """
+        Return the list of descriptors that :meth:`add_descriptor_descendents`
+        would add to the cache for the same arguments.
+        """
 
         def get_child_descriptors(descriptor, depth, descriptor_filter):
             """
@@ -792,9 +825,7 @@ class FieldDataCache(object):
             return descriptors
 
         with modulestore().bulk_operations(descriptor.location.course_key):
-            descriptors = get_child_descriptors(descriptor, depth, descriptor_filter)
-
-        self.add_descriptors_to_cache(descriptors)
+            return get_child_descriptors(descriptor, depth, descriptor_filter)
 
     @classmethod
     def cache_for_descriptor_descendents(cls, course_id, user, descriptor, depth=None,
@@ -814,6 +845,21 @@ class FieldDataCache(object):
         cache.add_descriptor_descendents(descriptor, depth, descriptor_filter)
         return cache
 
+    @classmethod
+    def cache_for_prefetched_user_state(cls, course_id, user, descriptors, usage_keys, block_field_state):
+        """
+        course_id: the course in the context of which we want StudentModules.
+        user: the django user for whom to load modules.
+        descriptors: the XModuleDescriptors to cache field data for.
+        usage_keys: the usage keys for which `block_field_state` was loaded in bulk.
+        block_field_state: a dict mapping usage keys to the user's stored state, see
+            :meth:`UserStateCache.prime`.
+        """
+        cache = FieldDataCache([], course_id, user)
+        cache.cache[Scope.user_state].prime(usage_keys, block_field_state)
+        cache.add_descriptors_to_cache(descriptors)
+        return cache
+
     def _fields_to_cache(self, descriptors):
         """
         Returns a map of scopes to fields in that scope that should be cached
@@ -1011,6 +1057,16 @@ class ScoresClient(object):
             )
         return self._locations_to_scores.get(location)
 
+    def set_scores(self, locations_to_scores):
+        """
+        Use scores that were fetched in bulk instead of calling fetch_scores().
+
+        `locations_to_scores` maps locations (with full course run information)
+        to `ScoresClient.Score` tuples.
+        """
+        self._locations_to_scores.update(locations_to_scores)
+        self._has_fetched = True
+
     @classmethod
     def from_field_data_cache(cls, fd_cache):
         """Create a ScoresClient from a populated FieldDataCache."""
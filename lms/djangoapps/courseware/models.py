@@ -12,20 +12,28 @@ file and check it in at the same time as your model changes. To do that,
 ASSUMPTIONS: modules have unique IDs, even across different module_types
 
 """
+import json
 import logging
 import itertools
 
 from django.contrib.auth.models import User
 from django.conf import settings
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import models, transaction, IntegrityError
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver, Signal
+from django.utils import timezone
 
 from model_utils.models import TimeStampedModel
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey, UsageKey
+from openedx.core.djangoapps.course_groups.models import CourseUserGroup, CourseUserGroupPartitionGroup
+from openedx.core.djangoapps.user_api.models import UserCourseTag
 from student.models import user_by_anonymous_id
 from submissions.models import score_set, score_reset
 
 from xmodule_django.models import CourseKeyField, LocationKeyField, BlockTypeKeyField  # pylint: disable=import-error
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.exceptions import ItemNotFoundError
 log = logging.getLogger(__name__)
 
 log = logging.getLogger("edx.courseware")
@@ -129,6 +137,30 @@ class StudentModule(models.Model):
         else:
             return queryset
 
+    @classmethod
+    def submitted_problem_states_read_only(cls, course_id, chunk_size=1000):
+        """
+        Yield `(id, student_id, module_state_key, state)` tuples for the
+        problems submitted in a given course, like
+        `all_submitted_problems_read_only`, without loading the whole course's
+        state at once. `module_state_key` is the string stored in the database.
+
+        The rows are read in chunks of `chunk_size` in primary key order, each
+        chunk starting after the last id of the previous one, so that reading
+        far into the table costs no more than reading its first chunk.
+        """
+        queryset = cls.all_submitted_problems_read_only(course_id).order_by('id').values_list(
+            'id', 'student_id', 'module_state_key', 'state'
+        )
+        last_id = 0
+        while True:
+            rows = list(queryset.filter(id__gt=last_id)[:chunk_size])
+            for row in rows:
+                yield row
+            if len(rows) < chunk_size:
+                return
+            last_id = rows[-1][0]
+
     def __repr__(self):
         return 'StudentModule<%r>' % ({
             'course_id': self.course_id,
@@ -296,6 +328,161 @@ class StudentFieldOverride(TimeStampedModel):
     value = models.TextField(default='null')
 
 
+class PersistentSectionGrade(TimeStampedModel):
+    """
+    Precomputed scores of a single graded section (a subsection or a vertical,
+    depending on the grading type of the platform) for a given user.
+
+    Rows are written by the grading code the first time a section is graded
+    and are invalidated as soon as the score of any block within the section
+    changes, so only the affected section has to be regraded on the next
+    `grade()` call. Rows computed against an older version of the course
+    content are ignored.
+
+    Every invalidation increments the version of the row, creating the row if
+    needed, and grades are only saved if the version of the row hasn't changed
+    since it was read before grading. Otherwise a grade computed from student
+    state read before a concurrent score change could be saved after that
+    change, and never be regraded.
+    """
+    user = models.ForeignKey(User, db_index=True)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    usage_key = LocationKeyField(max_length=255, db_index=True)
+
+    # Version of the course content the scores were computed against, or
+    # empty if the scores have been invalidated.
+    course_version = models.CharField(max_length=255)
+
+    # False if the student never interacted with any scorable block in the section.
+    attempted = models.BooleanField(default=False)
+
+    # Scores of every block in the section, stored as a JSON list of
+    # [earned, possible, graded, display_name, location] lists.
+    scores = models.TextField(default='[]')
+
+    # Incremented by every change to the row.
+    version = models.IntegerField(default=0)
+
+    class Meta(object):  # pylint: disable=missing-docstring
+        unique_together = (('user', 'course_id', 'usage_key'),)
+
+    @classmethod
+    def read_grades(cls, user_id, course_key):
+        """
+        Return a dict mapping section usage keys to the `PersistentSectionGrade`
+        of the user for every section of the course, including the invalidated
+        and outdated ones.
+        """
+        return {
+            grade.usage_key.map_into_course(course_key): grade
+            for grade in cls.objects.filter(user_id=user_id, course_id=course_key)
+        }
+
+    @classmethod
+    def save_grade(cls, user_id, course_key, usage_key, course_version, attempted, scores, version=None):
+        """
+        Create or update the persisted grade of the user for a section, unless
+        it changed since it was read.
+
+        `scores` is a list of (earned, possible, graded, display_name, location)
+        tuples. `version` is the version of the row read before grading, or
+        None if there was no row.
+
+        Returns whether the grade was saved.
+        """
+        serialized_scores = json.dumps([
+            [earned, possible, graded, display_name, unicode(location)]
+            for earned, possible, graded, display_name, location in scores
+        ])
+        if version is None:
+            return cls._create(
+                user_id=user_id,
+                course_id=course_key,
+                usage_key=usage_key,
+                course_version=course_version,
+                attempted=attempted,
+                scores=serialized_scores,
+            )
+        return bool(
+            cls.objects.filter(
+                user_id=user_id, course_id=course_key, usage_key=usage_key, version=version
+            ).update(
+                course_version=course_version,
+                attempted=attempted,
+                scores=serialized_scores,
+                version=version + 1,
+                modified=timezone.now(),
+            )
+        )
+
+    @classmethod
+    def _create(cls, **kwargs):
+        """
+        Create a row, and return whether it didn't exist already.
+        """
+        sid = transaction.savepoint()
+        try:
+            cls.objects.create(**kwargs)
+        except IntegrityError:
+            transaction.savepoint_rollback(sid)
+            return False
+        transaction.savepoint_commit(sid)
+        return True
+
+    @classmethod
+    def invalidate_for_block(cls, user_id, usage_key):
+        """
+        Invalidate the persisted grade of the user for the graded section
+        containing the block at `usage_key`, i.e. its closest ancestor of the
+        `settings.GRADING_TYPE` category.
+
+        If the ancestors of the block cannot be determined, all of the user's
+        persisted grades in the course are invalidated.
+        """
+        course_key = usage_key.course_key
+        store = modulestore()
+        section_key = usage_key
+        try:
+            while section_key is not None and section_key.block_type != settings.GRADING_TYPE:
+                section_key = store.get_parent_location(section_key)
+        except ItemNotFoundError:
+            cls.invalidate_for_user(user_id, course_key)
+            return
+        if section_key is None:
+            # The block isn't in any section, so no persisted grade depends on it.
+            return
+
+        # If the section has no row yet, create an invalidated one, which makes
+        # a grade being computed concurrently fail to save.
+        grades = cls.objects.filter(user_id=user_id, course_id=course_key, usage_key=section_key)
+        if not grades.update(course_version='', version=models.F('version') + 1) and not cls._create(
+            user_id=user_id, course_id=course_key, usage_key=section_key, course_version='', version=1
+        ):
+            grades.update(course_version='', version=models.F('version') + 1)
+
+    @classmethod
+    def invalidate_for_user(cls, user_id, course_key):
+        """
+        Invalidate all the persisted grades of the user in the course, e.g.
+        when the blocks the user can see change.
+        """
+        cls.objects.filter(user_id=user_id, course_id=course_key).update(
+            course_version='', version=models.F('version') + 1
+        )
+
+    @classmethod
+    def invalidate_for_users(cls, user_ids, course_key):
+        """
+        Invalidate all the persisted grades of the users in the course.
+
+        Changes to the course content don't need this, as they change the
+        version of the course the grades were computed against.
+        """
+        cls.objects.filter(user_id__in=user_ids, course_id=course_key).update(
+            course_version='', version=models.F('version') + 1
+        )
+
+
 # Signal that indicates that a user's score for a problem has been updated.
 # This signal is generated when a scoring event occurs either within the core
 # platform or in the Submissions module. Note that this signal will be triggered
@@ -313,6 +500,24 @@ SCORE_CHANGED = Signal(
 )
 
 
+def _invalidate_persistent_grades(user_id, course_id, usage_id):
+    """
+    Drop the persisted section grades affected by a score coming from the
+    Submissions API, which only provides unicode course and item ids.
+    """
+    if not settings.FEATURES.get('ENABLE_PERSISTENT_GRADES'):
+        return
+    try:
+        course_key = CourseKey.from_string(course_id)
+        usage_key = UsageKey.from_string(usage_id).map_into_course(course_key)
+    except InvalidKeyError:
+        log.warning(
+            u"Could not invalidate persisted grades for course_id: %s, usage_id: %s", course_id, usage_id
+        )
+        return
+    PersistentSectionGrade.invalidate_for_block(user_id, usage_key)
+
+
 @receiver(score_set)
 def submissions_score_set_handler(sender, **kwargs):  # pylint: disable=unused-argument
     """
@@ -340,6 +545,7 @@ def submissions_score_set_handler(sender, **kwargs):  # pylint: disable=unused-a
     # If any of the kwargs were missing, at least one of the following values
     # will be None.
     if all((user, points_possible, points_earned, course_id, usage_id)):
+        _invalidate_persistent_grades(user.id, course_id, usage_id)
         SCORE_CHANGED.send(
             sender=None,
             points_possible=points_possible,
@@ -379,6 +585,7 @@ def submissions_score_reset_handler(sender, **kwargs):  # pylint: disable=unused
     # If any of the kwargs were missing, at least one of the following values
     # will be None.
     if all((user, course_id, usage_id)):
+        _invalidate_persistent_grades(user.id, course_id, usage_id)
         SCORE_CHANGED.send(
             sender=None,
             points_possible=0,
@@ -392,3 +599,63 @@ def submissions_score_reset_handler(sender, **kwargs):  # pylint: disable=unused
             u"Failed to process score_reset signal from Submissions API. "
             "user: %s, course_id: %s, usage_id: %s", user, course_id, usage_id
         )
+
+
+# The prefix of the keys of the user course tags which assign users to a group
+# of a random user partition.
+PARTITION_TAG_KEY_PREFIX = 'xblock.partition_service.partition_'
+
+
+@receiver(m2m_changed, sender=CourseUserGroup.users.through)
+def cohort_membership_changed_handler(sender, instance, action, reverse, pk_set, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the persisted grades of users who join or leave a cohort, as
+    the content groups linked to the cohort decide which blocks they see.
+    """
+    if not settings.FEATURES.get('ENABLE_PERSISTENT_GRADES'):
+        return
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        # `instance` is a user, and `pk_set` the ids of cohorts
+        if pk_set is None:
+            cohorts = instance.course_groups.all()
+        else:
+            cohorts = CourseUserGroup.objects.filter(pk__in=pk_set)
+        for cohort in cohorts:
+            PersistentSectionGrade.invalidate_for_user(instance.id, cohort.course_id)
+    else:
+        # `instance` is a cohort, and `pk_set` the ids of users
+        if pk_set is None:
+            pk_set = instance.users.values_list('id', flat=True)
+        for user_id in pk_set:
+            PersistentSectionGrade.invalidate_for_user(user_id, instance.course_id)
+
+
+@receiver(post_save, sender=CourseUserGroupPartitionGroup)
+@receiver(post_delete, sender=CourseUserGroupPartitionGroup)
+def cohort_partition_group_changed_handler(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the persisted grades of the users of a cohort when it is linked
+    to another content group.
+    """
+    if not settings.FEATURES.get('ENABLE_PERSISTENT_GRADES'):
+        return
+    try:
+        cohort = instance.course_user_group
+    except CourseUserGroup.DoesNotExist:
+        return
+    PersistentSectionGrade.invalidate_for_users(cohort.users.values_list('id', flat=True), cohort.course_id)
+
+
+@receiver(post_save, sender=UserCourseTag)
+@receiver(post_delete, sender=UserCourseTag)
+def partition_tag_changed_handler(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the persisted grades of a user who is assigned to another group
+    of a random user partition.
+    """
+    if not settings.FEATURES.get('ENABLE_PERSISTENT_GRADES'):
+        return
+    if instance.key.startswith(PARTITION_TAG_KEY_PREFIX):
+        PersistentSectionGrade.invalidate_for_user(instance.user_id, instance.course_id)
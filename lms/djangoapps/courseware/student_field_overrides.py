@@ -14,6 +14,9 @@ class IndividualStudentOverrideProvider(FieldOverrideProvider):
     :class:`~courseware.field_overrides.FieldOverrideProvider` which allows for
     overrides to be made on a per user basis.
     """
+    # Individual due date extensions are the only overrides made per user.
+    overridden_fields = ('due',)
+
     def get(self, block, name, default):
         return get_override_for_user(self.user, block, name, default)
 
@@ -43,19 +46,54 @@ def _get_overrides_for_user(user, block):
     Gets all of the individual student overrides for given user and block.
     Returns a dictionary of field override values keyed by field name.
     """
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=block.location,
-        student_id=user.id,
-    )
+    course_overrides = _get_course_overrides_for_user(user, block.runtime.course_id)
     overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for field_name, value in course_overrides.get(_location_key(block.location), {}).iteritems():
+        field = block.fields[field_name]
+        overrides[field_name] = field.from_json(json.loads(value))
     return overrides
 
 
+def _get_course_overrides_for_user(user, course_id):
+    """
+    Gets all of the individual student overrides for given user in the course,
+    as a dictionary of JSON field values keyed by location, as stored in the
+    database, and field name.
+
+    The overrides are loaded with a single query, and kept on the `user`
+    object, so that rendering or grading many blocks doesn't cost a query per
+    block.
+    """
+    if not hasattr(user, '_student_field_overrides'):
+        user._student_field_overrides = {}  # pylint: disable=protected-access
+    course_overrides = user._student_field_overrides.get(course_id)  # pylint: disable=protected-access
+    if course_overrides is None:
+        course_overrides = {}
+        query = StudentFieldOverride.objects.filter(
+            course_id=course_id, student_id=user.id,
+        ).values_list('location', 'field', 'value')
+        for location, field_name, value in query:
+            course_overrides.setdefault(unicode(location), {})[field_name] = value
+        user._student_field_overrides[course_id] = course_overrides  # pylint: disable=protected-access
+    return course_overrides
+
+
+def _location_key(location):
+    """
+    Returns `location` the way it is stored in the database.
+    """
+    location_field = StudentFieldOverride._meta.get_field('location')  # pylint: disable=protected-access
+    return location_field.get_prep_value(location)
+
+
+def _clear_overrides_for_user(user, block):
+    """
+    Forgets the overrides loaded for the `user` in the course of `block`.
+    """
+    getattr(user, '_student_field_overrides', {}).pop(block.runtime.course_id, None)
+    getattr(block, '_student_overrides', {}).pop(user.id, None)
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -70,6 +108,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    _clear_overrides_for_user(user, block)
 
 
 def clear_override_for_user(user, block, name):
@@ -87,3 +126,4 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    _clear_overrides_for_user(user, block)
@@ -4,6 +4,7 @@ import itertools
 import pytz
 
 from django.test import TestCase
+from django.core.management import call_command
 from django.core.urlresolvers import reverse
 from mock import Mock, patch
 from nose.plugins.attrib import attr
@@ -516,3 +517,58 @@ class CourseOverviewAccessTestCase(ModuleStoreTestCase):
         overview = CourseOverview.get_from_id(self.course_default.id)
         with self.assertRaises(ValueError):
             access.has_access(self.user, '_non_existent_action', overview)
+
+
+@attr('shard_1')
+@ddt.ddt
+class CatalogFiltersTestCase(ModuleStoreTestCase):
+    """
+    Tests confirming that the catalog queries select the courses on which
+    has_access grants the catalog actions.
+    """
+
+    def setUp(self):
+        super(CatalogFiltersTestCase, self).setUp()
+
+        today = datetime.datetime.now(pytz.UTC)
+        last_week = today - datetime.timedelta(days=7)
+        next_week = today + datetime.timedelta(days=7)
+
+        self.courses = [
+            CourseFactory.create(start=last_week),
+            CourseFactory.create(start=next_week, invitation_only=True, days_early_for_beta=10),
+            CourseFactory.create(start=next_week, enrollment_end=last_week),
+            CourseFactory.create(start=last_week, enrollment_end=last_week, visible_to_staff_only=True),
+            CourseFactory.create(start=next_week, catalog_visibility=CATALOG_VISIBILITY_ABOUT),
+            CourseFactory.create(start=next_week, catalog_visibility=CATALOG_VISIBILITY_NONE),
+        ]
+
+        self.user_normal = UserFactory.create()
+        self.user_anonymous = AnonymousUserFactory.create()
+        self.user_beta_tester = BetaTesterFactory.create(course_key=self.courses[1].id)
+        self.user_course_staff = StaffFactory.create(course_key=self.courses[3].id)
+        self.user_staff = UserFactory.create(is_staff=True)
+        self.user_enrollment_allowed = UserFactory.create()
+        CourseEnrollmentAllowedFactory(email=self.user_enrollment_allowed.email, course_id=self.courses[2].id)
+
+        call_command('update_course_overviews', all=True)
+
+    @ddt.data(*itertools.product(
+        [
+            'user_normal', 'user_anonymous', 'user_beta_tester', 'user_course_staff', 'user_staff',
+            'user_enrollment_allowed'
+        ],
+        access.CATALOG_ACTIONS,
+    ))
+    @ddt.unpack
+    def test_catalog_filters(self, user_attr_name, action):
+        user = getattr(self, user_attr_name)
+        filters = access.catalog_filters_for_user(user, action)
+        self.assertEqual(
+            set(overview.id for overview in CourseOverview.objects.catalog(datetime.datetime.now(pytz.UTC), **filters)),
+            set(course.id for course in self.courses if access.has_access(user, action, course))
+        )
+
+    def test_unknown_action(self):
+        with self.assertRaises(ValueError):
+            access.catalog_filters_for_user(self.user_normal, 'load')
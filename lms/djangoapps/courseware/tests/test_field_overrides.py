@@ -2,15 +2,18 @@
 Tests for `field_overrides` module.
 """
 import unittest
+from mock import patch
 from nose.plugins.attrib import attr
 
 from django.test.utils import override_settings
+from request_cache.middleware import RequestCache
 from xblock.field_data import DictFieldData
 from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.django_utils import (
     ModuleStoreTestCase,
 )
 
+from .. import field_overrides
 from ..field_overrides import (
     disable_overrides,
     FieldOverrideProvider,
@@ -94,6 +97,43 @@ class OverrideFieldDataTests(ModuleStoreTestCase):
         data = self.make_one()
         self.assertIsInstance(data, DictFieldData)
 
+    @override_settings(FIELD_OVERRIDE_PROVIDERS=(
+        'courseware.tests.test_field_overrides.TestDeclaredFieldsOverrideProvider',))
+    def test_undeclared_fields_bypass_providers(self):
+        data = self.make_one()
+        with patch.object(TestDeclaredFieldsOverrideProvider, 'get', autospec=True) as provider_get:
+            provider_get.return_value = 'fu'
+            self.assertEqual(data.get('block', 'foo'), 'fu')
+            self.assertEqual(data.get('block', 'bees'), 'knees')
+            self.assertTrue(data.has('block', 'bees'))
+            self.assertFalse(data.has('block', 'oh'))
+        self.assertEqual(provider_get.call_count, 1)
+
+    def test_providers_are_cached_per_course(self):
+        RequestCache.clear_request_cache()
+        other_course = CourseFactory.create()
+        with patch.object(TestOverrideProvider, 'enabled_for', side_effect=lambda course: course == self.course):
+            for __ in range(2):
+                self.assertEqual(OverrideFieldData.wrap(TESTUSER, self.course, DictFieldData({})).get(
+                    'block', 'foo'), 'fu')
+                self.assertIsInstance(OverrideFieldData.wrap(TESTUSER, other_course, DictFieldData({})),
+                                      DictFieldData)
+            self.assertEqual(TestOverrideProvider.enabled_for.call_count, 2)
+
+    @patch.object(field_overrides, 'STATS_REPORT_INTERVAL', 3)
+    @patch.object(field_overrides, '_STATS', field_overrides._OverrideStats())  # pylint: disable=protected-access
+    @patch.object(field_overrides, 'dog_stats_api')
+    def test_stats(self, dog_stats_api):
+        data = self.make_one()
+        data.get('block', 'foo')
+        data.get('block', 'bees')
+        self.assertFalse(dog_stats_api.increment.called)
+        data.get('block', 'oh')
+        tags = ['provider:TestOverrideProvider']
+        dog_stats_api.increment.assert_any_call('courseware.field_overrides.lookups', 3, tags=tags)
+        dog_stats_api.increment.assert_any_call('courseware.field_overrides.hits', 2, tags=tags)
+        self.assertTrue(dog_stats_api.histogram.called)
+
 
 @attr('shard_1')
 class ResolveDottedTests(unittest.TestCase):
@@ -132,3 +172,10 @@ class TestOverrideProvider(FieldOverrideProvider):
     @classmethod
     def enabled_for(cls, course):
         return True
+
+
+class TestDeclaredFieldsOverrideProvider(TestOverrideProvider):
+    """
+    A `FieldOverrideProvider` which only overrides 'foo'.
+    """
+    overridden_fields = ('foo',)
@@ -2,20 +2,31 @@
 Test grade calculation.
 """
 from django.http import Http404
+from django.test import TestCase
 from django.test.client import RequestFactory
+from django.test.utils import override_settings
 
 from mock import patch
 from nose.plugins.attrib import attr
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from xblock.fields import Scope
 
-from courseware.grades import field_data_cache_for_grading, grade, iterate_grades_for
+from courseware.grades import (
+    OTHER_ANSWERS, OTHER_ANSWERS_LABEL, AnswerCounts, BatchGradingContext, field_data_cache_for_grading, grade,
+    iterate_grades_for
+)
+from courseware.model_data import DjangoKeyValueStore, FieldDataCache
+from courseware.models import PersistentSectionGrade
+from courseware.tests.factories import StudentModuleFactory
+from openedx.core.djangoapps.course_groups.models import CourseUserGroupPartitionGroup
+from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
 from student.tests.factories import UserFactory
 from student.models import CourseEnrollment
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 
-def _grade_with_errors(student, request, course, keep_raw_scores=False):
+def _grade_with_errors(student, request, course, keep_raw_scores=False, **kwargs):
     """This fake grade method will throw exceptions for student3 and
     student4, but allow any other students to go through normal grading.
 
@@ -26,7 +37,7 @@ def _grade_with_errors(student, request, course, keep_raw_scores=False):
     if student.username in ['student3', 'student4']:
         raise Exception("I don't like {}".format(student.username))
 
-    return grade(student, request, course, keep_raw_scores=keep_raw_scores)
+    return grade(student, request, course, keep_raw_scores=keep_raw_scores, **kwargs)
 
 
 @attr('shard_1')
@@ -153,3 +164,241 @@ class TestFieldDataCacheScorableLocations(ModuleStoreTestCase):
         self.assertNotIn('html', block_types)
         self.assertNotIn('discussion', block_types)
         self.assertIn('problem', block_types)
+
+
+@attr('shard_1')
+class TestBatchGradingContext(ModuleStoreTestCase):
+    """
+    Make sure grading many students with a shared BatchGradingContext gives
+    the same results as grading them one at a time.
+    """
+    def setUp(self):
+        super(TestBatchGradingContext, self).setUp()
+        course = CourseFactory.create()
+        chapter = ItemFactory.create(category='chapter', parent=course)
+        sequential = ItemFactory.create(category='sequential', parent=chapter, graded=True, format='Homework')
+        vertical = ItemFactory.create(category='vertical', parent=sequential, graded=True, format='Homework')
+        ItemFactory.create(category='video', parent=vertical)
+        self.problem = ItemFactory.create(category='problem', parent=vertical)
+        self.course = self.store.get_course(course.id)
+
+        self.students = [UserFactory.create() for __ in range(3)]
+        for index, student in enumerate(self.students[:2]):
+            CourseEnrollment.enroll(student, self.course.id)
+            StudentModuleFactory.create(
+                student=student,
+                course_id=self.course.id,
+                module_state_key=self.problem.location,
+                module_type='problem',
+                state='{"attempts": %d}' % (index + 1),
+                grade=index,
+                max_grade=1,
+            )
+
+    def test_prefetched_state_and_scores(self):
+        """State and scores come from the bulk query, and only for their own student."""
+        context = BatchGradingContext(self.course)
+        self.assertNotIn('video', set(loc.block_type for loc in context.scorable_locations))
+        with self.assertNumQueries(1):
+            context.prefetch_students(self.students)
+
+        scores_client = context.scores_client(self.students[1])
+        self.assertEqual(scores_client.get(self.problem.location), (1, 1))
+        self.assertIsNone(context.scores_client(self.students[2]).get(self.problem.location))
+        self.assertEqual(
+            context.field_data_cache(self.students[1]).cache[Scope.user_state].get(
+                DjangoKeyValueStore.Key(Scope.user_state, self.students[1].id, self.problem.location, 'attempts')
+            ),
+            2
+        )
+
+    def test_batch_grades_match_single_grades(self):
+        """iterate_grades_for returns the same grades as grading each student alone."""
+        request = RequestFactory().get('/')
+        request.session = {}
+        for student, gradeset, err_msg in iterate_grades_for(self.course, self.students):
+            self.assertEqual(err_msg, "")
+            request.user = student
+            self.assertEqual(gradeset['percent'], grade(student, request, self.course)['percent'])
+
+
+@attr('shard_1')
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_PERSISTENT_GRADES': True})
+class TestPersistentSectionGrades(ModuleStoreTestCase):
+    """
+    Make sure section grades are persisted and reused until a score changes.
+    """
+    def setUp(self):
+        super(TestPersistentSectionGrades, self).setUp()
+        self.student = UserFactory.create()
+        course = CourseFactory.create()
+        chapter = ItemFactory.create(category='chapter', parent=course)
+        sequential = ItemFactory.create(category='sequential', parent=chapter, graded=True, format='Homework')
+        self.vertical = ItemFactory.create(category='vertical', parent=sequential, graded=True, format='Homework')
+        self.problem = ItemFactory.create(category='problem', parent=self.vertical)
+        self.course = self.store.get_course(course.id)
+
+        CourseEnrollment.enroll(self.student, self.course.id)
+
+    def _request(self, student):
+        """A fake request of the student."""
+        request = RequestFactory().get('/')
+        request.user = student
+        request.session = {}
+        return request
+
+    def _grade(self):
+        """Grade the student with a fake request."""
+        return grade(self.student, self._request(self.student), self.course)
+
+    def test_unattempted_section_is_persisted(self):
+        """Sections the student never worked on are persisted as not attempted."""
+        self._grade()
+        persisted = PersistentSectionGrade.objects.get(user=self.student, course_id=self.course.id)
+        self.assertFalse(persisted.attempted)
+        self.assertEqual(persisted.course_version, self.course.subtree_edited_on.isoformat())
+
+    def test_persisted_grades_skip_student_state(self):
+        """Once every section is persisted, no student state is loaded to grade."""
+        first = self._grade()
+        with patch('openedx.core.djangoapps.grading_policy.sequential.field_data_cache_for_grading') as seq_mock:
+            with patch('openedx.core.djangoapps.grading_policy.vertical.field_data_cache_for_grading') as vert_mock:
+                second = self._grade()
+        self.assertFalse(seq_mock.called)
+        self.assertFalse(vert_mock.called)
+        self.assertEqual(first['percent'], second['percent'])
+        self.assertEqual(first['grade'], second['grade'])
+
+    def _valid_grades(self):
+        """The persisted grades of the student that are valid for the course."""
+        return PersistentSectionGrade.objects.filter(
+            user=self.student, course_version=self.course.subtree_edited_on.isoformat()
+        )
+
+    def test_score_change_invalidates_section(self):
+        """A score change invalidates the persisted grade of the enclosing sections."""
+        self._grade()
+        PersistentSectionGrade.invalidate_for_block(self.student.id, self.problem.location)
+        self.assertFalse(self._valid_grades().exists())
+
+    @override_settings(GRADING_TYPE='vertical')
+    def test_score_change_only_touches_its_section(self):
+        """Invalidation only creates a row for the graded section of the block, not its other ancestors."""
+        PersistentSectionGrade.invalidate_for_block(self.student.id, self.problem.location)
+        self.assertEqual(
+            [usage_key.map_into_course(self.course.id) for usage_key in PersistentSectionGrade.objects.filter(
+                user=self.student
+            ).values_list('usage_key', flat=True)],
+            [self.vertical.location]
+        )
+
+    def test_set_score_regrades_section(self):
+        """Setting a score through the field data cache makes the next grade() regrade."""
+        self._grade()
+        field_data_cache = FieldDataCache([self.problem], self.course.id, self.student)
+        field_data_cache.set_score(self.student.id, self.problem.location, 1, 1)
+        self.assertFalse(self._valid_grades().exists())
+
+        with patch('openedx.core.djangoapps.grading_policy.sequential.field_data_cache_for_grading',
+                   side_effect=field_data_cache_for_grading) as seq_mock:
+            with patch('openedx.core.djangoapps.grading_policy.vertical.field_data_cache_for_grading',
+                       side_effect=field_data_cache_for_grading) as vert_mock:
+                self._grade()
+        self.assertTrue(seq_mock.called or vert_mock.called)
+        self.assertTrue(self._valid_grades().exists())
+
+    def test_grade_computed_before_invalidation_is_not_saved(self):
+        """A grade computed from student state read before a score change is discarded."""
+        self._grade()
+        previous_grades = PersistentSectionGrade.read_grades(self.student.id, self.course.id)
+        PersistentSectionGrade.invalidate_for_block(self.student.id, self.problem.location)
+        for usage_key, previous_grade in previous_grades.iteritems():
+            self.assertFalse(PersistentSectionGrade.save_grade(
+                self.student.id,
+                self.course.id,
+                usage_key,
+                previous_grade.course_version,
+                False,
+                [],
+                version=previous_grade.version,
+            ))
+        self.assertFalse(self._valid_grades().exists())
+
+    def test_grade_started_before_first_invalidation_is_not_saved(self):
+        """Sections without a persisted grade yet are guarded as well."""
+        PersistentSectionGrade.invalidate_for_block(self.student.id, self.problem.location)
+        for usage_key in PersistentSectionGrade.read_grades(self.student.id, self.course.id):
+            self.assertFalse(PersistentSectionGrade.save_grade(
+                self.student.id, self.course.id, usage_key, self.course.subtree_edited_on.isoformat(), False, []
+            ))
+        self.assertFalse(self._valid_grades().exists())
+
+    def test_cohort_change_invalidates_grades(self):
+        """Moving the student to another cohort can change the content they see."""
+        cohort = CohortFactory.create(course_id=self.course.id)
+        self._grade()
+        self.assertTrue(self._valid_grades().exists())
+        cohort.users.add(self.student)
+        self.assertFalse(self._valid_grades().exists())
+
+        self._grade()
+        self.assertTrue(self._valid_grades().exists())
+        cohort.users.remove(self.student)
+        self.assertFalse(self._valid_grades().exists())
+
+    def test_cohort_content_group_change_invalidates_its_users(self):
+        """Linking a cohort to another content group only affects the users of the cohort."""
+        cohort = CohortFactory.create(course_id=self.course.id, users=[self.student])
+        other_student = UserFactory.create()
+        CourseEnrollment.enroll(other_student, self.course.id)
+        self._grade()
+        grade(other_student, self._request(other_student), self.course)
+        self.assertEqual(self._valid_grades().count(), 1)
+
+        CourseUserGroupPartitionGroup.objects.create(course_user_group=cohort, partition_id=0, group_id=0)
+        self.assertFalse(self._valid_grades().exists())
+        self.assertTrue(PersistentSectionGrade.objects.filter(
+            user=other_student, course_version=self.course.subtree_edited_on.isoformat()
+        ).exists())
+
+
+class TestAnswerCounts(TestCase):
+    """
+    Tests of the approximate counting of answers of answer distributions.
+    """
+    def _count(self, max_answers, answers):
+        """Count `answers` and return their most common ones."""
+        counts = AnswerCounts(max_answers)
+        for answer in answers:
+            counts.add(answer)
+        return counts.most_common()
+
+    def test_exact_counts(self):
+        self.assertEqual(
+            self._count(1, [u'b', u'a', u'b']),
+            [(u'b', 2, 0), (OTHER_ANSWERS, 1, 0)]
+        )
+
+    def test_error_bounds(self):
+        answers = u'z a b c d z z z a b'.split()
+        most_common = self._count(2, answers)
+        self.assertEqual(len(most_common), 3)
+        for answer, count, error in most_common[:2]:
+            self.assertLessEqual(count - error, answers.count(answer))
+            self.assertGreaterEqual(count, answers.count(answer))
+            self.assertLessEqual(error, len(answers) / 4)
+        answer, count, error = most_common[2]
+        self.assertIs(answer, OTHER_ANSWERS)
+        other_count = len(answers) - sum(answers.count(listed) for listed, __, __ in most_common[:2])
+        self.assertLessEqual(count - error, other_count)
+        self.assertGreaterEqual(count, other_count)
+
+    def test_other_answers_label_is_an_answer(self):
+        self.assertEqual(
+            self._count(1, [OTHER_ANSWERS_LABEL, u'a', u'a']),
+            [(u'a', 2, 0), (OTHER_ANSWERS, 1, 0)]
+        )
+        self.assertEqual(
+            self._count(2, [OTHER_ANSWERS_LABEL, u'a', u'a']),
+            [(u'a', 2, 0), (OTHER_ANSWERS_LABEL, 1, 0)]
+        )
@@ -10,6 +10,7 @@ from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
 from django.test.client import RequestFactory
+from django.test.utils import override_settings
 from mock import patch
 from nose.plugins.attrib import attr
 
@@ -1162,6 +1163,40 @@ class TestAnswerDistributions(TestSubmittingProblems):
                 }
             )
 
+    @patch.object(grades, 'ANSWER_DISTRIBUTION_CHUNK_SIZE', 1)
+    def test_chunked_reads(self):
+        self.submit_question_answer('p1', {'2_1': u'Correct'})
+        self.submit_question_answer('p2', {'2_1': u'Incorrect'})
+        self.submit_question_answer('p3', {'2_1': u'Correct'})
+
+        self.assertEqual(len(grades.answer_distributions(self.course.id)), 3)
+
+    @override_settings(ANSWER_DISTRIBUTION_MAX_ANSWERS=1)
+    def test_other_answers(self):
+        self.submit_question_answer('p1', {'2_1': u'Incorrect'})
+        student_module = StudentModule.objects.get(course_id=self.course.id, student=self.student_user)
+        answer_id = '{}_2_1'.format(self.p1_html_id)
+        for user, answer in [(UserFactory.create(), u'Correct'), (UserFactory.create(), u'Correct')]:
+            state = json.loads(student_module.state)
+            state["student_answers"][answer_id] = answer
+            StudentModule.objects.create(
+                course_id=self.course.id, student=user, module_type='problem',
+                module_state_key=student_module.module_state_key, state=json.dumps(state), grade=0, max_grade=1
+            )
+
+        self.assertEqual(
+            grades.answer_distributions(self.course.id),
+            {('p1', 'p1', answer_id): {u'Correct': 2, grades.OTHER_ANSWERS: 1}}
+        )
+        self.assertEqual(
+            list(grades.answer_distribution_rows(self.course.id)),
+            [
+                ['url_name', 'display name', 'answer id', 'answer', 'count', 'max overcount'],
+                ['p1', 'p1', answer_id, u'Correct', 2, 0],
+                ['p1', 'p1', answer_id, grades.OTHER_ANSWERS_LABEL, 1, 0],
+            ]
+        )
+
 
 @attr('shard_1')
 class TestConditionalContent(TestSubmittingProblems):
@@ -33,10 +33,10 @@ from markupsafe import escape
 from courseware import grades
 from courseware.access import has_access, in_preview_mode, _adjust_start_date_for_beta_testers
 from courseware.courses import (
-    get_courses, get_course,
+    get_course,
     get_studio_url, get_course_with_access,
-    sort_by_announcement,
-    sort_by_start_date,
+    get_sorted_courses,
+    render_course_listing,
 )
 from courseware.masquerade import setup_masquerade
 from openedx.core.djangoapps.credit.api import (
@@ -126,17 +126,15 @@ def courses(request):
     courses_list = []
     course_discovery_meanings = getattr(settings, 'COURSE_DISCOVERY_MEANINGS', {})
     if not settings.FEATURES.get('ENABLE_COURSE_DISCOVERY'):
-        courses_list = get_courses(request.user, request.META.get('HTTP_HOST'))
-
-        if microsite.get_value("ENABLE_COURSE_SORTING_BY_START_DATE",
-                               settings.FEATURES["ENABLE_COURSE_SORTING_BY_START_DATE"]):
-            courses_list = sort_by_start_date(courses_list)
-        else:
-            courses_list = sort_by_announcement(courses_list)
+        courses_list = get_sorted_courses(request.user, request.META.get('HTTP_HOST'))
 
     return render_to_response(
         "courseware/courses.html",
-        {'courses': courses_list, 'course_discovery_meanings': course_discovery_meanings}
+        {
+            'courses': courses_list,
+            'course_listing_html': render_course_listing(courses_list),
+            'course_discovery_meanings': course_discovery_meanings,
+        }
     )
 
 
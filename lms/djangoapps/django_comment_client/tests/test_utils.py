@@ -3,9 +3,11 @@ import datetime
 import json
 import mock
 from nose.plugins.attrib import attr
+import requests
 from pytz import UTC
 from django.utils.timezone import UTC as django_utc
 
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.test import TestCase, RequestFactory
 from edxmako import add_lookup
@@ -13,12 +15,14 @@ from edxmako import add_lookup
 from django_comment_client.tests.factories import RoleFactory
 from django_comment_client.tests.unicode import UnicodeTestMixin
 import django_comment_client.utils as utils
+from lms.lib.comment_client import utils as cc_utils
 
 from courseware.tests.factories import InstructorFactory
 from courseware.tabs import get_course_tab_list
 from openedx.core.djangoapps.course_groups.cohorts import set_course_cohort_settings
 from student.tests.factories import UserFactory, AdminFactory, CourseEnrollmentFactory
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase
+from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
@@ -762,6 +766,65 @@ class CategoryMapTestCase(CategoryMapTestMixin, ModuleStoreTestCase):
         )
 
 
+@attr('shard_1')
+class DiscussionIndexTestCase(ModuleStoreTestCase):
+    """
+    Tests for `get_discussion_index` and the access checks made with it.
+    """
+    def setUp(self):
+        super(DiscussionIndexTestCase, self).setUp()
+        cache.clear()
+        self.course = CourseFactory.create(start=datetime.datetime(2012, 2, 3, tzinfo=UTC))
+        self.student = UserFactory.create()
+        CourseEnrollmentFactory.create(user=self.student, course_id=self.course.id)
+        self.staff = InstructorFactory(course_key=self.course.id)
+
+    def create_discussion(self, discussion_id, **kwargs):  # pylint: disable=missing-docstring
+        return ItemFactory.create(
+            parent_location=self.course.location,
+            category="discussion",
+            discussion_id=discussion_id,
+            discussion_category="Chapter",
+            discussion_target="Discussion",
+            **kwargs
+        )
+
+    def accessible_ids(self, user):  # pylint: disable=missing-docstring
+        return sorted(
+            topic.discussion_id for topic in utils.get_accessible_discussion_modules(self.course, user)
+        )
+
+    def test_index_is_cached(self):
+        self.create_discussion("discussion1")
+        index = utils.get_discussion_index(self.course)
+        self.assertEqual([topic.discussion_id for topic in index], ["discussion1"])
+
+        with mock.patch.object(modulestore(), 'get_items') as mock_get_items:
+            self.assertEqual(utils.get_discussion_index(self.course), index)
+        self.assertFalse(mock_get_items.called)
+
+    def test_index_rebuilt_on_publish(self):
+        self.create_discussion("discussion1")
+        utils.get_discussion_index(self.course)
+        self.create_discussion("discussion2")
+        self.assertEqual(
+            sorted(topic.discussion_id for topic in utils.get_discussion_index(self.course)),
+            ["discussion1", "discussion2"]
+        )
+
+    def test_restricted_discussions_check_access(self):
+        self.create_discussion("open")
+        self.create_discussion("staff_only", visible_to_staff_only=True)
+        self.create_discussion("future", start=datetime.datetime(2030, 1, 1, tzinfo=UTC))
+        restricted = dict(
+            (topic.discussion_id, topic.restricted) for topic in utils.get_discussion_index(self.course)
+        )
+        self.assertEqual(restricted, {"open": False, "staff_only": True, "future": False})
+
+        self.assertEqual(self.accessible_ids(self.student), ["open"])
+        self.assertEqual(self.accessible_ids(self.staff), ["future", "open", "staff_only"])
+
+
 @attr('shard_1')
 class ContentGroupCategoryMapTestCase(CategoryMapTestMixin, ContentGroupTestCase):
     """
@@ -983,3 +1046,54 @@ class DiscussionTabTestCase(ModuleStoreTestCase):
 
         with self.settings(FEATURES={'CUSTOM_COURSES_EDX': True}):
             self.assertFalse(self.discussion_tab_present(self.enrolled_user))
+
+
+class CommentClientUtilsTestCase(TestCase):
+    """
+    Tests for the comments service HTTP client.
+    """
+    def make_response(self, data):
+        """
+        A mock comments service response, containing `data`.
+        """
+        return mock.Mock(status_code=200, text=json.dumps(data), json=mock.Mock(return_value=data))
+
+    def test_endpoint_name(self):
+        self.assertEqual(
+            cc_utils.endpoint_name('http://localhost:4567/api/v1/threads/5525a2ba8a0a4d5f69000005/comments?x=1'),
+            '/api/v1/threads/:id/comments'
+        )
+        self.assertEqual(
+            cc_utils.endpoint_name('http://localhost:4567/api/v1/users/17/active_threads'),
+            '/api/v1/users/:id/active_threads'
+        )
+
+    def test_session_is_shared(self):
+        self.assertIs(cc_utils.get_session(), cc_utils.get_session())
+
+    @mock.patch('requests.Session.request')
+    def test_get_is_retried(self, mock_request):
+        mock_request.side_effect = [requests.exceptions.ConnectionError(), self.make_response({'id': 1})]
+        self.assertEqual(cc_utils.perform_request('get', 'http://localhost:4567/api/v1/threads/1'), {'id': 1})
+        self.assertEqual(mock_request.call_count, 2)
+
+    @mock.patch('requests.Session.request')
+    def test_post_is_not_retried(self, mock_request):
+        mock_request.side_effect = [requests.exceptions.ConnectionError(), self.make_response({'id': 1})]
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            cc_utils.perform_request('post', 'http://localhost:4567/api/v1/threads', {'body': 'x'})
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_run_concurrently(self):
+        calls = [lambda value=value: value * 2 for value in range(10)]
+        self.assertEqual(cc_utils.run_concurrently(*calls), [value * 2 for value in range(10)])
+
+    def test_run_concurrently_raises(self):
+        def fail():
+            """
+            Raise an exception.
+            """
+            raise cc_utils.CommentClientRequestError("Not found", 404)
+
+        with self.assertRaises(cc_utils.CommentClientRequestError):
+            cc_utils.run_concurrently(lambda: 1, fail)
@@ -1,10 +1,11 @@
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from datetime import datetime
 import json
 import logging
 
 import pytz
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.db import connection
 from django.http import HttpResponse
@@ -14,12 +15,13 @@ from opaque_keys.edx.locations import i4xEncoder
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.django import modulestore
 
-from django_comment_common.models import Role, FORUM_ROLE_STUDENT
+from django_comment_common.models import Role, FORUM_ROLE_STUDENT, DISCUSSION_INDEX_CACHE_KEY
 from django_comment_client.permissions import check_permissions_by_view, has_permission
 from django_comment_client.settings import MAX_COMMENT_DEPTH
 from edxmako import lookup_template
 
 from courseware.access import has_access
+from xmodule.split_test_module import get_split_user_partitions
 from openedx.core.djangoapps.course_groups.cohorts import (
     get_course_cohort_settings, get_cohort_by_id, get_cohort_id, is_commentable_cohorted, is_course_cohorted
 )
@@ -28,6 +30,13 @@ from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 
 log = logging.getLogger(__name__)
 
+# The fields of an inline discussion module that the forum uses. `restricted`
+# is True if some users may not be allowed to load the module even after it
+# has started.
+DiscussionTopic = namedtuple('DiscussionTopic', [
+    'location', 'discussion_id', 'discussion_category', 'discussion_target', 'sort_key', 'start', 'restricted',
+])
+
 
 def extract(dic, keys):
     return {k: dic.get(k) for k in keys}
@@ -62,11 +71,19 @@ def has_forum_access(uname, course_id, rolename):
     return role.users.filter(username=uname).exists()
 
 
-def get_accessible_discussion_modules(course, user, include_all=False):  # pylint: disable=invalid-name
+def get_discussion_index(course):
     """
-    Return a list of all valid discussion modules in this course that
-    are accessible to the given user.
+    Return a `DiscussionTopic` for each valid discussion module in this course.
+
+    The index is cached for the course's version, and cleared when the course
+    is published, so that the modules don't have to be loaded on every request.
     """
+    cache_key = DISCUSSION_INDEX_CACHE_KEY.format(course_id=course.id)
+    version = getattr(course, 'subtree_edited_on', None)
+    cached = cache.get(cache_key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
     all_modules = modulestore().get_items(course.id, qualifiers={'category': 'discussion'})
 
     def has_required_keys(module):
@@ -76,9 +93,46 @@ def get_accessible_discussion_modules(course, user, include_all=False):  # pylin
                 return False
         return True
 
+    def is_restricted(module):
+        """
+        Whether staff visibility or group access rules apply to `module`.
+        """
+        if module.visible_to_staff_only:
+            return True
+        if len(module.user_partitions) == len(get_split_user_partitions(module.user_partitions)):
+            return False
+        return any(group_ids is not None for group_ids in module.merged_group_access.values())
+
+    index = [
+        DiscussionTopic(
+            location=module.location,
+            discussion_id=module.discussion_id,
+            discussion_category=module.discussion_category,
+            discussion_target=module.discussion_target,
+            sort_key=module.sort_key,
+            start=module.start,
+            restricted=is_restricted(module),
+        )
+        for module in all_modules
+        if has_required_keys(module)
+    ]
+    cache.set(cache_key, (version, index))
+    return index
+
+
+def get_accessible_discussion_modules(course, user, include_all=False):  # pylint: disable=invalid-name
+    """
+    Return a list of the `DiscussionTopic`s of all valid discussion modules in
+    this course that are accessible to the given user.
+
+    Only the modules which may not be accessible to everyone are loaded, to
+    check the user's access to them.
+    """
+    now = datetime.now(UTC())
     return [
-        module for module in all_modules
-        if has_required_keys(module) and (include_all or has_access(user, 'load', module, course.id))
+        topic for topic in get_discussion_index(course)
+        if include_all or (not topic.restricted and (topic.start is None or topic.start < now)) or
+        has_access(user, 'load', modulestore().get_item(topic.location), course.id)
     ]
 
 
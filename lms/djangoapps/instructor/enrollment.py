@@ -13,7 +13,7 @@ from django.core.mail import send_mail
 from django.utils.translation import override as override_language
 
 from student.models import CourseEnrollment, CourseEnrollmentAllowed
-from courseware.models import StudentModule
+from courseware.models import PersistentSectionGrade, StudentModule
 from edxmako.shortcuts import render_to_string
 from lang_pref import LANGUAGE_KEY
 
@@ -241,6 +241,8 @@ def reset_student_attempts(course_id, student, module_state_key, delete_module=F
 
     if delete_module:
         module_to_reset.delete()
+        if settings.FEATURES.get('ENABLE_PERSISTENT_GRADES'):
+            PersistentSectionGrade.invalidate_for_block(student.id, module_state_key)
     else:
         _reset_module_attempts(module_to_reset)
 
@@ -102,6 +102,12 @@ REPORTS_DATA = (
         'instructor_api_endpoint': 'get_students_who_may_enroll',
         'task_api_endpoint': 'instructor_task.api.submit_calculate_may_enroll_csv',
         'extra_instructor_api_kwargs': {},
+    },
+    {
+        'report_type': 'answer distribution',
+        'instructor_api_endpoint': 'answer_distribution_csv',
+        'task_api_endpoint': 'instructor_task.api.submit_calculate_answer_distribution_csv',
+        'extra_instructor_api_kwargs': {},
     }
 )
 
@@ -226,6 +232,7 @@ class TestInstructorAPIDenyLevels(ModuleStoreTestCase, LoginEnrollmentTestCase):
             ('get_enrollment_report', {}),
             ('get_students_who_may_enroll', {}),
             ('get_exec_summary_report', {}),
+            ('answer_distribution_csv', {}),
         ]
         # Endpoints that only Instructors can access
         self.instructor_level_endpoints = [
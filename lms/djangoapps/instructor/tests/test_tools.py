@@ -11,7 +11,9 @@ from django.utils.timezone import utc
 from django.test.utils import override_settings
 from nose.plugins.attrib import attr
 
+from django.contrib.auth.models import User
 from courseware.field_overrides import OverrideFieldData  # pylint: disable=import-error
+from courseware.models import StudentFieldOverride  # pylint: disable=import-error
 from student.tests.factories import UserFactory  # pylint: disable=import-error
 from xmodule.fields import Date
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
@@ -257,6 +259,34 @@ class TestSetDueDateExtension(ModuleStoreTestCase):
             tools.set_due_date_extension(self.course, self.week1, self.user, extended)
             self._clear_field_data_cache()
 
+    def test_overrides_are_loaded_once(self):
+        extended = datetime.datetime(2013, 12, 25, 0, 0, tzinfo=utc)
+        tools.set_due_date_extension(self.course, self.week1, self.user, extended)
+        tools.set_due_date_extension(self.course, self.week2, self.user, extended)
+        self._clear_field_data_cache()
+        # All the overrides of the user in the course are loaded by one query.
+        with self.assertNumQueries(1):
+            self.assertEqual(self.week1.due, extended)
+            self.assertEqual(self.week2.due, extended)
+            self.assertEqual(self.assignment.due, extended)
+
+    def test_overrides_are_loaded_for_each_user_object(self):
+        extended = datetime.datetime(2013, 12, 25, 0, 0, tzinfo=utc)
+        self.assertEqual(self.week1.due, self.due)
+        # An extension set by another process, e.g. before the next task run
+        # by the same worker, is seen by the next user object.
+        StudentFieldOverride.objects.create(
+            course_id=self.course.id,
+            location=self.week1.location,
+            student=self.user,
+            field='due',
+            value=json.dumps(self.week1.fields['due'].to_json(extended)),
+        )
+        week1 = self.store.get_item(self.week1.location)
+        week1._field_data = OverrideFieldData.wrap(  # pylint: disable=protected-access
+            User.objects.get(pk=self.user.pk), self.course, week1._field_data)  # pylint: disable=protected-access
+        self.assertEqual(week1.due, extended)
+
     def test_set_due_date_extension_invalid_date(self):
         extended = datetime.datetime(2009, 1, 1, 0, 0, tzinfo=utc)
         with self.assertRaises(tools.DashboardError):
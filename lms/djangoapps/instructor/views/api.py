@@ -2183,6 +2183,32 @@ def problem_grade_report(request, course_id):
         })
 
 
+@ensure_csrf_cookie
+@cache_control(no_cache=True, no_store=True, must_revalidate=True)
+@require_level('staff')
+def answer_distribution_csv(request, course_id):
+    """
+    Request a CSV of the distribution of the answers to the course's problems.
+
+    AlreadyRunningError is raised if the report is already being generated.
+    """
+    course_key = SlashSeparatedCourseKey.from_deprecated_string(course_id)
+    try:
+        instructor_task.api.submit_calculate_answer_distribution_csv(request, course_key)
+        success_status = _(
+            "Your answer distribution report is being generated! "
+            "You can view the status of the generation task in the 'Pending Tasks' section.")
+        return JsonResponse({"status": success_status})
+    except AlreadyRunningError:
+        already_running_status = _(
+            "An answer distribution report is already being generated. "
+            "Check the 'Pending Tasks' table for the status of the task. "
+            "When completed, the report will be available for download in the table below.")
+        return JsonResponse({
+            "status": already_running_status
+        })
+
+
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @require_level('staff')
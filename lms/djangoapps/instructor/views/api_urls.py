@@ -91,6 +91,8 @@ urlpatterns = patterns(
         'instructor.views.api.calculate_grades_csv', name="calculate_grades_csv"),
     url(r'problem_grade_report$',
         'instructor.views.api.problem_grade_report', name="problem_grade_report"),
+    url(r'answer_distribution_csv$',
+        'instructor.views.api.answer_distribution_csv', name="answer_distribution_csv"),
 
     # Financial Report downloads..
     url(r'^list_financial_report_downloads$',
@@ -1077,20 +1077,15 @@ def get_answers_distribution(request, course_key):
 
     Return a dict with two keys:
     'header': a header row
-    'data': a list of rows
+    'data': a generator of the other rows, see `grades.answer_distribution_rows`
     """
     course = get_course_with_access(request.user, 'staff', course_key)
 
-    course_answer_distributions = grades.answer_distributions(course.id)
+    rows = grades.answer_distribution_rows(course.id)
 
     dist = {}
-    dist['header'] = ['url_name', 'display name', 'answer id', 'answer', 'count']
-
-    dist['data'] = [
-        [url_name, display_name, answer_id, a, answers[a]]
-        for (url_name, display_name, answer_id), answers in sorted(course_answer_distributions.items())
-        for a in answers
-    ]
+    dist['header'] = next(rows)
+    dist['data'] = rows
     return dist
 
 
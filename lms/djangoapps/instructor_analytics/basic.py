@@ -15,6 +15,7 @@ from django.core.urlresolvers import reverse
 import xmodule.graders as xmgraders
 from django.core.exceptions import ObjectDoesNotExist
 from microsite_configuration import microsite
+from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from student.models import CourseEnrollmentAllowed
 
 
@@ -36,6 +37,9 @@ AVAILABLE_FEATURES = STUDENT_FEATURES + PROFILE_FEATURES
 COURSE_REGISTRATION_FEATURES = ('code', 'course_id', 'created_by', 'created_at', 'is_valid')
 COUPON_FEATURES = ('code', 'course_id', 'percentage_discount', 'description', 'expiration_date', 'is_active')
 
+# Number of enrolled students whose features are read at once
+ENROLLED_STUDENTS_CHUNK_SIZE = 2000
+
 
 def sale_order_record_features(course_id, features):
     """
@@ -168,54 +172,68 @@ def enrolled_students_features(course_key, features):
         {'username': 'username3', 'first_name': 'firstname3'}
     ]
     """
+    return list(iter_enrolled_students_features(course_key, features))
+
+
+def iter_enrolled_students_features(course_key, features, chunk_size=ENROLLED_STUDENTS_CHUNK_SIZE):
+    """
+    Yield the dictionaries of `enrolled_students_features` one at a time, in
+    order of user id, without loading all the students of the course at once.
+
+    The students are read `chunk_size` at a time, each chunk starting after
+    the last user id of the previous one. Only the columns of the requested
+    features are fetched, as values rather than model instances.
+    """
+    student_features = [x for x in STUDENT_FEATURES if x in features]
+    profile_features = [x for x in PROFILE_FEATURES if x in features]
+
+    # For data extractions on the 'meta' field
+    # the feature name should be in the format of 'meta.foo' where
+    # 'foo' is the keyname in the meta dictionary
+    meta_features = [(feature, feature.split('.')[1]) for feature in features if 'meta.' in feature]
     include_cohort_column = 'cohort' in features
 
+    columns = ['id'] + [feature for feature in student_features if feature != 'id']
+    columns.extend('profile__' + feature for feature in profile_features)
+    if meta_features and 'meta' not in profile_features:
+        columns.append('profile__meta')
+
     students = User.objects.filter(
         courseenrollment__course_id=course_key,
         courseenrollment__is_active=1,
-    ).order_by('username').select_related('profile')
-
-    if include_cohort_column:
-        students = students.prefetch_related('course_groups')
-
-    def extract_student(student, features):
-        """ convert student to dictionary """
-        student_features = [x for x in STUDENT_FEATURES if x in features]
-        profile_features = [x for x in PROFILE_FEATURES if x in features]
-
-        # For data extractions on the 'meta' field
-        # the feature name should be in the format of 'meta.foo' where
-        # 'foo' is the keyname in the meta dictionary
-        meta_features = []
-        for feature in features:
-            if 'meta.' in feature:
-                meta_key = feature.split('.')[1]
-                meta_features.append((feature, meta_key))
-
-        student_dict = dict((feature, getattr(student, feature))
-                            for feature in student_features)
-        profile = student.profile
-        if profile is not None:
-            profile_dict = dict((feature, getattr(profile, feature))
-                                for feature in profile_features)
-            student_dict.update(profile_dict)
-
-            # now featch the requested meta fields
-            meta_dict = json.loads(profile.meta) if profile.meta else {}
-            for meta_feature, meta_key in meta_features:
-                student_dict[meta_feature] = meta_dict.get(meta_key)
-
-        if include_cohort_column:
-            # Note that we use student.course_groups.all() here instead of
-            # student.course_groups.filter(). The latter creates a fresh query,
-            # therefore negating the performance gain from prefetch_related().
-            student_dict['cohort'] = next(
-                (cohort.name for cohort in student.course_groups.all() if cohort.course_id == course_key),
-                "[unassigned]"
-            )
-        return student_dict
-
-    return [extract_student(student, features) for student in students]
+    ).order_by('id').values(*columns)
+
+    last_id = 0
+    while True:
+        chunk = list(students.filter(id__gt=last_id)[:chunk_size])
+
+        if include_cohort_column and chunk:
+            cohorts = {}
+            memberships = CourseUserGroup.users.through.objects.filter(
+                courseusergroup__course_id=course_key,
+                user_id__in=[row['id'] for row in chunk],
+            ).values_list('user_id', 'courseusergroup__name')
+            for user_id, cohort_name in memberships:
+                cohorts.setdefault(user_id, cohort_name)
+
+        for row in chunk:
+            student_dict = dict((feature, row[feature]) for feature in student_features)
+            student_dict.update((feature, row['profile__' + feature]) for feature in profile_features)
+
+            # now fetch the requested meta fields
+            if meta_features:
+                meta = row['profile__meta']
+                meta_dict = json.loads(meta) if meta else {}
+                for meta_feature, meta_key in meta_features:
+                    student_dict[meta_feature] = meta_dict.get(meta_key)
+
+            if include_cohort_column:
+                student_dict['cohort'] = cohorts.get(row['id'], "[unassigned]")
+            yield student_dict
+
+        if len(chunk) < chunk_size:
+            return
+        last_id = chunk[-1]['id']
 
 
 def list_may_enroll(course_key, features):
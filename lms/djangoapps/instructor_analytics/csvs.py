@@ -64,19 +64,29 @@ def format_dictlist(dictlist, features):
     }
     """
 
-    def dict_to_entry(dct):
-        """ Convert dictionary to a list for a csv row """
-        relevant_items = [(k, v) for (k, v) in dct.items() if k in features]
-        ordered = sorted(relevant_items, key=lambda (k, v): header.index(k))
-        vals = [v for (_, v) in ordered]
-        return vals
+    header = features
+    datarows = [_dict_to_entry(dct, features) for dct in dictlist]
+
+    return header, datarows
+
 
+def format_dictiter(dictiter, features):
+    """
+    Like `format_dictlist`, but `dictiter` may be any iterable of
+    dictionaries, such as a generator, and `datarows` is a generator which
+    formats them one at a time.
+    """
     header = features
-    datarows = map(dict_to_entry, dictlist)
+    datarows = (_dict_to_entry(dct, features) for dct in dictiter)
 
     return header, datarows
 
 
+def _dict_to_entry(dct, features):
+    """ Convert dictionary to a list for a csv row, in the order of `features` """
+    return [dct[feature] for feature in features if feature in dct]
+
+
 def format_instances(instances, features):
     """
     Convert a list of instances into a header list and datarows list.
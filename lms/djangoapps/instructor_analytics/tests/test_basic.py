@@ -14,7 +14,7 @@ from shoppingcart.models import (
 )
 from course_modes.models import CourseMode
 from instructor_analytics.basic import (
-    sale_record_features, sale_order_record_features, enrolled_students_features,
+    sale_record_features, sale_order_record_features, enrolled_students_features, iter_enrolled_students_features,
     course_registration_features, coupon_codes_features, list_may_enroll,
     AVAILABLE_FEATURES, STUDENT_FEATURES, PROFILE_FEATURES
 )
@@ -115,6 +115,18 @@ class TestAnalyticsBasic(ModuleStoreTestCase):
             else:
                 self.assertEqual(report['cohort'], '[unassigned]')
 
+    def test_iter_enrolled_students_features_in_chunks(self):
+        query_features = ('id', 'username', 'name', 'meta.position')
+        userreports = iter_enrolled_students_features(self.course_key, query_features, chunk_size=7)
+        # One query for each chunk of 7 of the 30 students
+        with self.assertNumQueries(5):
+            userreports = list(userreports)
+        self.assertEqual([report['id'] for report in userreports], sorted(user.id for user in self.users))
+        for report, user in zip(userreports, sorted(self.users, key=lambda user: user.id)):
+            self.assertEqual(report['username'], user.username)
+            self.assertEqual(report['name'], user.profile.name)
+            self.assertEqual(report['meta.position'], "edX expert {}".format(user.id))
+
     def test_available_features(self):
         self.assertEqual(len(AVAILABLE_FEATURES), len(STUDENT_FEATURES + PROFILE_FEATURES))
         self.assertEqual(set(AVAILABLE_FEATURES), set(STUDENT_FEATURES + PROFILE_FEATURES))
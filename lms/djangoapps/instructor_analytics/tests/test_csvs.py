@@ -3,7 +3,7 @@
 from django.test import TestCase
 from nose.tools import raises
 
-from instructor_analytics.csvs import create_csv_response, format_dictlist, format_instances
+from instructor_analytics.csvs import create_csv_response, format_dictlist, format_dictiter, format_instances
 
 
 class TestAnalyticsCSVS(TestCase):
@@ -71,6 +71,13 @@ class TestAnalyticsFormatDictlist(TestCase):
         self.assertEqual(header, [])
         self.assertEqual(datarows, [])
 
+    def test_format_dictiter(self):
+        dictiter = ({'label1': 'value-{},1'.format(i), 'label2': 'value-{},2'.format(i)} for i in range(2))
+        header, datarows = format_dictiter(dictiter, ['label2', 'label1'])
+
+        self.assertEqual(header, ['label2', 'label1'])
+        self.assertEqual(list(datarows), [['value-0,2', 'value-0,1'], ['value-1,2', 'value-1,1']])
+
     def test_create_csv_response(self):
         header = ['Name', 'Email']
         datarows = [['Jim', 'jim@edy.org'], ['Jake', 'jake@edy.org'], ['Jeeves', 'jeeves@edy.org']]
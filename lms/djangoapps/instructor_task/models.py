@@ -19,6 +19,7 @@ import csv
 import json
 import hashlib
 import os.path
+import tempfile
 import urllib
 
 from boto.s3.connection import S3Connection
@@ -193,9 +194,8 @@ class InstructorTask(models.Model):
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. `store_rows()` consumes its rows one at a time, so reports can be
+    passed in as generators rather than as the whole dataset.
     """
     @classmethod
     def from_config(cls, config_name):
@@ -218,6 +218,14 @@ class ReportStore(object):
         for row in rows:
             yield [unicode(item).encode('utf-8') for item in row]
 
+    def _get_utf8_decoded_rows(self, rows):
+        """
+        Given an iterable of `rows` read from a utf-8 encoded CSV file,
+        yield rows of unicode strings.
+        """
+        for row in rows:
+            yield [item.decode('utf-8') for item in row]
+
 
 class S3ReportStore(ReportStore):
     """
@@ -313,19 +321,48 @@ class S3ReportStore(ReportStore):
     def store_rows(self, course_id, filename, rows):
         """
         Given a `course_id`, `filename`, and `rows` (each row is an iterable of
-        strings), create a buffer that is a gzip'd csv file, and then `store()`
-        that buffer.
+        strings), write a gzip'd csv file and upload it like `store()` does.
+
+        `rows` may be a generator: the rows are written one at a time to a
+        temporary file rather than to memory, so that large reports don't have
+        to fit in the worker's memory.
 
         Even though we store it in gzip format, browsers will transparently
         download and decompress it. Filenames should end in `.csv`, not `.gz`.
         """
-        output_buffer = StringIO()
-        gzip_file = GzipFile(fileobj=output_buffer, mode="wb")
-        csvwriter = csv.writer(gzip_file)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        gzip_file.close()
+        with tempfile.TemporaryFile() as output_file:
+            gzip_file = GzipFile(fileobj=output_file, mode="wb")
+            csvwriter = csv.writer(gzip_file)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            gzip_file.close()
+
+            key = self.key_for(course_id, filename)
+            key.content_encoding = 'gzip'
+            key.content_type = 'text/csv'
+            key.set_contents_from_file(
+                output_file,
+                headers={
+                    "Content-Encoding": 'gzip',
+                    "Content-Type": 'text/csv',
+                },
+                rewind=True
+            )
+
+    def read_rows(self, course_id, filename):
+        """
+        Yield the rows of a CSV file previously stored with `store_rows()`.
+        Nothing is yielded if the file does not exist.
+        """
+        key = self.bucket.get_key(self.key_for(course_id, filename).key)
+        if key is None:
+            return
+        gzip_file = GzipFile(fileobj=StringIO(key.get_contents_as_string()), mode="rb")
+        for row in self._get_utf8_decoded_rows(csv.reader(gzip_file)):
+            yield row
 
-        self.store(course_id, filename, output_buffer)
+    def delete(self, course_id, filename):
+        """Delete the file `filename` of the course, if it exists."""
+        self.key_for(course_id, filename).delete()
 
     def links_for(self, course_id):
         """
@@ -383,24 +420,47 @@ class LocalFSReportStore(ReportStore):
         assumed to be a StringIO objecd (or anything that can flush its contents
         to string using `.getvalue()`).
         """
-        full_path = self.path_to(course_id, filename)
-        directory = os.path.dirname(full_path)
-        if not os.path.exists(directory):
-            os.mkdir(directory)
-
-        with open(full_path, "wb") as f:
+        with self._open_for_writing(course_id, filename) as f:
             f.write(buff.getvalue())
 
     def store_rows(self, course_id, filename, rows):
         """
         Given a course_id, filename, and rows (each row is an iterable of strings),
-        write this data out.
+        write this data out. The rows are written to the file one at a time, so
+        `rows` may be a generator.
         """
-        output_buffer = StringIO()
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+        with self._open_for_writing(course_id, filename) as f:
+            csvwriter = csv.writer(f)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
 
-        self.store(course_id, filename, output_buffer)
+    def _open_for_writing(self, course_id, filename):
+        """
+        Open the file `filename` of the course for writing, creating the
+        course's directory if needed.
+        """
+        full_path = self.path_to(course_id, filename)
+        directory = os.path.dirname(full_path)
+        if not os.path.exists(directory):
+            os.mkdir(directory)
+        return open(full_path, "wb")
+
+    def read_rows(self, course_id, filename):
+        """
+        Yield the rows of a CSV file previously stored with `store_rows()`.
+        Nothing is yielded if the file does not exist.
+        """
+        full_path = self.path_to(course_id, filename)
+        if not os.path.exists(full_path):
+            return
+        with open(full_path, "rb") as f:
+            for row in self._get_utf8_decoded_rows(csv.reader(f)):
+                yield row
+
+    def delete(self, course_id, filename):
+        """Delete the file `filename` of the course, if it exists."""
+        full_path = self.path_to(course_id, filename)
+        if os.path.exists(full_path):
+            os.remove(full_path)
 
     def links_for(self, course_id):
         """
@@ -36,10 +36,12 @@ from instructor_task.tasks_helper import (
     delete_problem_module_state,
     upload_grades_csv,
     upload_problem_grade_report,
+    perform_grade_report_chunk,
     upload_students_csv,
     cohort_students_and_upload,
     upload_enrollment_report,
     upload_may_enroll_csv,
+    upload_answer_distribution_csv,
     upload_exec_summary_report,
     generate_students_certificates,
 )
@@ -177,6 +179,18 @@ def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_grade_report_chunk(entry_id, report_name, student_ids, timestamp, part_index, subtask_status_dict):
+    """
+    Grade a chunk of the students of a grade report that was split into
+    subtasks by `calculate_grades_csv` or `calculate_problem_grade_report`.
+
+    The progress of the chunk is recorded in the parent InstructorTask, and
+    the subtask completing last merges the partial reports.
+    """
+    return perform_grade_report_chunk(entry_id, report_name, student_ids, timestamp, part_index, subtask_status_dict)
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_students_features_csv(entry_id, xmodule_instance_args):
     """
@@ -226,6 +240,18 @@ def calculate_may_enroll_csv(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_answer_distribution_csv(entry_id, xmodule_instance_args):
+    """
+    Compute the distribution of the answers to a course's problems and
+    upload the CSV to an S3 bucket for download.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = ugettext_noop('generated')
+    task_fn = partial(upload_answer_distribution_csv, xmodule_instance_args)
+    return run_main_task(entry_id, task_fn, action_name)
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def generate_certificates(entry_id, xmodule_instance_args):
     """
@@ -4,11 +4,13 @@ running state of a course.
 
 """
 import json
+import sys
+import traceback
 from collections import OrderedDict
 from datetime import datetime
 from django.conf import settings
 from eventtracking import tracker
-from itertools import chain
+from itertools import chain, count, islice
 from time import time
 import unicodecsv
 import logging
@@ -41,13 +43,19 @@ from certificates.models import (
 )
 from certificates.api import generate_user_certificates
 from courseware.courses import get_course_by_id, get_problems_in_section
-from courseware.grades import iterate_grades_for
+from courseware.grades import iterate_grades_for, answer_distribution_rows
 from courseware.models import StudentModule
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module_for_descriptor_internal
-from instructor_analytics.basic import enrolled_students_features, list_may_enroll
-from instructor_analytics.csvs import format_dictlist
+from instructor_analytics.basic import iter_enrolled_students_features, list_may_enroll
+from instructor_analytics.csvs import format_dictlist, format_dictiter
 from instructor_task.models import ReportStore, InstructorTask, PROGRESS
+from instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status,
+)
 from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
@@ -168,6 +176,13 @@ class UpdateProblemModuleStateError(Exception):
     pass
 
 
+class GradeReportMergeError(Exception):
+    """
+    Error signaling that the partial CSVs of a grade report cannot be merged.
+    """
+    pass
+
+
 def _get_current_task():
     """
     Stub to make it easier to test without actually running Celery.
@@ -644,7 +659,7 @@ def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": report_name})
 
 
-def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):  # pylint: disable=too-many-statements
+def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
     """
     For a given `course_id`, generate a grades CSV file for all students that
     are enrolled, and store using a `ReportStore`. Once created, the files can
@@ -653,15 +668,19 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
     that are visible in ReportStore will be complete ones.
 
+    Courses with more than `settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK`
+    enrolled students are graded in parallel by subtasks, see
+    `queue_grade_report_subtasks`.
+
     As we start to add more CSV downloads, it will probably be worthwhile to
     make a more general CSVDoc class instead of building out the rows like we
     do here.
     """
     start_time = time()
     start_date = datetime.now(UTC)
-    status_interval = 100
     enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
-    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
+    total_enrolled_students = enrolled_students.count()
+    task_progress = TaskProgress(action_name, total_enrolled_students, start_time)
 
     fmt = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Input: {task_input}'
     task_info_string = fmt.format(
@@ -672,6 +691,55 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     )
     TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
+    if _should_split_grade_report(total_enrolled_students):
+        return queue_grade_report_subtasks(_entry_id, 'grade_report', enrolled_students, action_name, start_date)
+
+    current_step = {'step': 'Calculating Grades'}
+    TASK_LOG.info(
+        u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s',
+        task_info_string,
+        action_name,
+        current_step,
+        total_enrolled_students
+    )
+    rows, err_rows = _grade_report_rows(
+        course_id, enrolled_students, task_progress, current_step, task_info_string=task_info_string
+    )
+    TASK_LOG.info(
+        u'%s, Task type: %s, Current step: %s, Grade calculation completed for students: %s/%s',
+        task_info_string,
+        action_name,
+        current_step,
+        task_progress.attempted,
+        total_enrolled_students
+    )
+
+    # By this point, we've got the rows we're going to stuff into our CSV files.
+    current_step = {'step': 'Uploading CSVs'}
+    task_progress.update_task_state(extra_meta=current_step)
+    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
+
+    # Perform the actual upload
+    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
+
+    # If there are any error rows (don't count the header), write them out as well
+    if len(err_rows) > 1:
+        upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
+
+    # One last update before we close out...
+    TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
+    return task_progress.update_task_state(extra_meta=current_step)
+
+
+def _grade_report_rows(course_id, students, task_progress, current_step, task_info_string=u''):
+    """
+    Grade `students` and return the rows of the grade report for them as a
+    tuple `(rows, err_rows)`. Both lists start with their header row, except
+    that `rows` is empty if no student could be graded.
+
+    Updates `task_progress` for every student graded.
+    """
+    status_interval = 100
     course = get_course_by_id(course_id)
     course_is_cohorted = is_course_cohorted(course.id)
     cohorts_header = ['Cohort Name'] if course_is_cohorted else []
@@ -687,18 +755,8 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     header = None
     rows = []
     err_rows = [["id", "username", "error_msg"]]
-    current_step = {'step': 'Calculating Grades'}
 
-    total_enrolled_students = enrolled_students.count()
-    student_counter = 0
-    TASK_LOG.info(
-        u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s',
-        task_info_string,
-        action_name,
-        current_step,
-        total_enrolled_students
-    )
-    for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students):
+    for student, gradeset, err_msg in iterate_grades_for(course_id, students):
         # Periodically update task status (this is a cache write)
         if task_progress.attempted % status_interval == 0:
             task_progress.update_task_state(extra_meta=current_step)
@@ -706,14 +764,13 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
 
         # Now add a log entry after each student is graded to get a sense
         # of the task's progress
-        student_counter += 1
         TASK_LOG.info(
             u'%s, Task type: %s, Current step: %s, Grade calculation in-progress for students: %s/%s',
             task_info_string,
-            action_name,
+            task_progress.action_name,
             current_step,
-            student_counter,
-            total_enrolled_students
+            task_progress.attempted,
+            task_progress.total
         )
 
         if gradeset:
@@ -772,30 +829,219 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             task_progress.failed += 1
             err_rows.append([student.id, student.username, err_msg])
 
-    TASK_LOG.info(
-        u'%s, Task type: %s, Current step: %s, Grade calculation completed for students: %s/%s',
-        task_info_string,
+    return rows, err_rows
+
+
+def _grade_report_error_rows(students, err_msg):
+    """
+    Return the rows of the grade report error CSV reporting `err_msg` for
+    every one of `students`, starting with its header row.
+    """
+    return [["id", "username", "error_msg"]] + [[student.id, student.username, err_msg] for student in students]
+
+
+def _should_split_grade_report(num_students):
+    """
+    Return True if a grade report for `num_students` students should be
+    generated in parallel by subtasks.
+    """
+    students_per_task = settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK
+    return bool(students_per_task) and num_students > students_per_task
+
+
+def _grade_report_part_name(report_name, timestamp, part_index):
+    """
+    Return the filename of a partial grade report written by a subtask.
+    """
+    return u"{report_name}_{timestamp}_part{part_index:05d}.csv".format(
+        report_name=report_name,
+        timestamp=timestamp,
+        part_index=part_index,
+    )
+
+
+def queue_grade_report_subtasks(entry_id, report_name, students, action_name, start_date):
+    """
+    Split the grade report `report_name` into chunks of
+    `settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK` students and queue a subtask
+    for each of them.
+
+    Each subtask grades its chunk and writes a partial CSV to the
+    `GRADES_DOWNLOAD_PARTS` report store. The subtask that completes last
+    merges the partial CSVs into the final report, see
+    `merge_grade_report_parts`.
+
+    Returns the task progress as stored in the InstructorTask object.
+    """
+    # Imported here because instructor_task.tasks imports this module.
+    from instructor_task.tasks import calculate_grade_report_chunk
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    # As for bulk email, subtasks may already have been queued if this task
+    # got requeued after a loss of connection with the broker.
+    if entry.subtasks and entry.task_output:
+        TASK_LOG.warning(u"Task %s has already queued its grade report subtasks!", entry.task_id)
+        return json.loads(entry.task_output)
+
+    timestamp = start_date.strftime("%Y-%m-%d-%H%M")
+    part_indexes = count()
+
+    def _create_grade_report_subtask(student_list, initial_subtask_status):
+        """Creates a subtask to grade the given chunk of students."""
+        return calculate_grade_report_chunk.subtask(
+            (
+                entry_id,
+                report_name,
+                [student['pk'] for student in student_list],
+                timestamp,
+                next(part_indexes),
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    return queue_subtasks_for_query(
+        entry,
         action_name,
-        current_step,
-        student_counter,
-        total_enrolled_students
+        _create_grade_report_subtask,
+        [students.order_by('id')],
+        [],
+        settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK,
+        students.count(),
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
-    current_step = {'step': 'Uploading CSVs'}
-    task_progress.update_task_state(extra_meta=current_step)
-    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
 
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
+def perform_grade_report_chunk(entry_id, report_name, student_ids, timestamp, part_index, subtask_status_dict):
+    """
+    Grade the students with ids `student_ids` for the grade report
+    `report_name` and store their rows as a partial CSV. Merges all the
+    partial CSVs of the report if this is the last subtask to complete.
 
-    # If there are any error rows (don't count the header), write them out as well
-    if len(err_rows) > 1:
-        upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
+    The parent InstructorTask is left in progress until the merge sets its
+    final state.
 
-    # One last update before we close out...
-    TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
-    return task_progress.update_task_state(extra_meta=current_step)
+    Returns the final status of the subtask as a dict.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_id = entry.course_id
+    task_progress = TaskProgress(json.loads(entry.task_output)['action_name'], len(student_ids), time())
+    current_step = {'step': 'Calculating Grades'}
+    students = User.objects.filter(id__in=student_ids).order_by('id')
+
+    parts_store = ReportStore.from_config('GRADES_DOWNLOAD_PARTS')
+    part_name = _grade_report_part_name(report_name, timestamp, part_index)
+    err_part_name = _grade_report_part_name(report_name + '_err', timestamp, part_index)
+    try:
+        rows, err_rows = GRADE_REPORT_ROWS[report_name](course_id, students, task_progress, current_step)
+        parts_store.store_rows(course_id, part_name, rows)
+        parts_store.store_rows(course_id, err_part_name, err_rows)
+    except Exception as exc:
+        exc_info = sys.exc_info()
+        TASK_LOG.exception(
+            u"Grade report subtask %s for instructor task %d failed unexpectedly!", current_task_id, entry_id
+        )
+        # Report every student of the chunk as an error, so that none of them
+        # is missing from both reports. If even this fails, the missing part
+        # makes the merge fail.
+        try:
+            parts_store.delete(course_id, part_name)
+            parts_store.store_rows(
+                course_id,
+                err_part_name,
+                GRADE_REPORT_ERROR_ROWS[report_name](students, u"Grading failed: {}".format(exc)),
+            )
+        except Exception:  # pylint: disable=broad-except
+            TASK_LOG.exception(
+                u"Grade report subtask %s for instructor task %d could not store its error rows!",
+                current_task_id, entry_id
+            )
+        subtask_status.increment(failed=len(student_ids), state=FAILURE)
+        if update_subtask_status(entry_id, current_task_id, subtask_status, complete_parent=False):
+            merge_grade_report_parts(entry_id, report_name, timestamp)
+        raise exc_info[0], exc_info[1], exc_info[2]
+
+    task_progress.update_task_state(extra_meta={'step': 'Uploading partial CSV'})
+    subtask_status.increment(succeeded=task_progress.succeeded, failed=task_progress.failed, state=SUCCESS)
+    if update_subtask_status(entry_id, current_task_id, subtask_status, complete_parent=False):
+        merge_grade_report_parts(entry_id, report_name, timestamp)
+    return subtask_status.to_dict()
+
+
+def _merged_report_rows(report_store, course_id, filenames):
+    """
+    Yield the rows of the partial CSVs `filenames` in order, keeping only the
+    header row of the first non-empty one.
+    """
+    header_seen = False
+    for filename in filenames:
+        rows = report_store.read_rows(course_id, filename)
+        header = next(rows, None)
+        if header is None:
+            continue
+        if not header_seen:
+            header_seen = True
+            yield header
+        for row in rows:
+            yield row
+
+
+def merge_grade_report_parts(entry_id, report_name, timestamp):
+    """
+    Stream the partial CSVs written by the subtasks of a grade report into
+    the final report (and error report), then delete them. Sets the final
+    state of the InstructorTask: SUCCESS once the reports are uploaded, or
+    FAILURE if the merge fails.
+
+    Every subtask writes a partial error report, which at least has a header
+    row. If one of them is missing, the students of that subtask would be
+    missing from both reports, so no report is uploaded and
+    `GradeReportMergeError` is raised.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_id = entry.course_id
+    num_parts = json.loads(entry.subtasks)['total']
+    start_date = datetime.strptime(timestamp, "%Y-%m-%d-%H%M")
+    parts_store = ReportStore.from_config('GRADES_DOWNLOAD_PARTS')
+    filenames = {
+        csv_name: [_grade_report_part_name(csv_name, timestamp, index) for index in range(num_parts)]
+        for csv_name in (report_name, report_name + '_err')
+    }
+
+    try:
+        missing_parts = [
+            filename for filename in filenames[report_name + '_err']
+            if next(parts_store.read_rows(course_id, filename), None) is None
+        ]
+        if missing_parts:
+            raise GradeReportMergeError(
+                u"Partial CSVs {} of instructor task {} are missing".format(u", ".join(missing_parts), entry_id)
+            )
+
+        TASK_LOG.info(u"Merging %s partial CSVs of %s for instructor task %d", num_parts, report_name, entry_id)
+        for csv_name in (report_name, report_name + '_err'):
+            rows = _merged_report_rows(parts_store, course_id, filenames[csv_name])
+            # Only upload reports that have rows besides their header.
+            first_rows = list(islice(rows, 2))
+            if len(first_rows) > 1:
+                upload_csv_to_report_store(chain(first_rows, rows), csv_name, course_id, start_date)
+    except Exception as exc:
+        TASK_LOG.exception(u"Merging the grade report of instructor task %d failed!", entry_id)
+        entry.task_output = InstructorTask.create_output_for_failure(exc, traceback.format_exc())
+        entry.task_state = FAILURE
+        entry.save_now()
+        raise
+    else:
+        entry.task_state = SUCCESS
+        entry.save_now()
+    finally:
+        for filename in chain.from_iterable(filenames.itervalues()):
+            parts_store.delete(course_id, filename)
 
 
 def _order_problems(blocks):
@@ -853,33 +1099,62 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
     """
     Generate a CSV containing all students' problem grades within a given
     `course_id`.
+
+    Courses with more than `settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK`
+    enrolled students are graded in parallel by subtasks, see
+    `queue_grade_report_subtasks`.
     """
     start_time = time()
     start_date = datetime.now(UTC)
-    status_interval = 100
     enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
     task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
 
+    if not CourseStructure.objects.filter(course_id=course_id).exists():
+        return task_progress.update_task_state(
+            extra_meta={'step': 'Generating course structure. Please refresh and try again.'}
+        )
+
+    if _should_split_grade_report(task_progress.total):
+        return queue_grade_report_subtasks(
+            _entry_id, 'problem_grade_report', enrolled_students, action_name, start_date
+        )
+
+    current_step = {'step': 'Calculating Grades'}
+    rows, error_rows = _problem_grade_report_rows(course_id, enrolled_students, task_progress, current_step)
+
+    # Perform the upload if any students have been successfully graded
+    if len(rows) > 1:
+        upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
+    # If there are any error rows, write them out as well
+    if len(error_rows) > 1:
+        upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
+
+    return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
+
+
+def _problem_grade_report_rows(course_id, students, task_progress, current_step):
+    """
+    Grade `students` and return the rows of the problem grade report for them
+    as a tuple `(rows, error_rows)`. Both lists start with their header row.
+
+    Updates `task_progress` for every student graded.
+    """
+    status_interval = 100
+
     # This struct encapsulates both the display names of each static item in the
     # header row as values as well as the django User field names of those items
     # as the keys.  It is structured in this way to keep the values related.
     header_row = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
 
-    try:
-        course_structure = CourseStructure.objects.get(course_id=course_id)
-        blocks = course_structure.ordered_blocks
-        problems = _order_problems(blocks)
-    except CourseStructure.DoesNotExist:
-        return task_progress.update_task_state(
-            extra_meta={'step': 'Generating course structure. Please refresh and try again.'}
-        )
+    course_structure = CourseStructure.objects.get(course_id=course_id)
+    blocks = course_structure.ordered_blocks
+    problems = _order_problems(blocks)
 
     # Just generate the static fields for now.
     rows = [list(header_row.values()) + ['Final Grade'] + list(chain.from_iterable(problems.values()))]
     error_rows = [list(header_row.values()) + ['error_msg']]
-    current_step = {'step': 'Calculating Grades'}
 
-    for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students, keep_raw_scores=True):
+    for student, gradeset, err_msg in iterate_grades_for(course_id, students, keep_raw_scores=True):
         student_fields = [getattr(student, field_name) for field_name in header_row]
         task_progress.attempted += 1
 
@@ -913,14 +1188,30 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
         if task_progress.attempted % status_interval == 0:
             task_progress.update_task_state(extra_meta=current_step)
 
-    # Perform the upload if any students have been successfully graded
-    if len(rows) > 1:
-        upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
-    # If there are any error rows, write them out as well
-    if len(error_rows) > 1:
-        upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
+    return rows, error_rows
+
+
+def _problem_grade_report_error_rows(students, err_msg):
+    """
+    Return the rows of the problem grade report error CSV reporting `err_msg`
+    for every one of `students`, starting with its header row.
+    """
+    return [['Student ID', 'Email', 'Username', 'error_msg']] + [
+        [student.id, student.email, student.username, err_msg] for student in students
+    ]
 
-    return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
+
+# Functions building the rows of the grade reports that can be split into subtasks.
+GRADE_REPORT_ROWS = {
+    'grade_report': _grade_report_rows,
+    'problem_grade_report': _problem_grade_report_rows,
+}
+
+# Functions building the error rows of those reports for students who couldn't be graded.
+GRADE_REPORT_ERROR_ROWS = {
+    'grade_report': _grade_report_error_rows,
+    'problem_grade_report': _problem_grade_report_error_rows,
+}
 
 
 def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
@@ -937,22 +1228,25 @@ def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input
     current_step = {'step': 'Calculating Profile Info'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # compute the student features table and format it
+    # compute the student features table, and write it to the report as it is
+    # computed rather than holding it all in memory
     query_features = task_input.get('features')
-    student_data = enrolled_students_features(course_id, query_features)
-    header, rows = format_dictlist(student_data, query_features)
+    student_data = iter_enrolled_students_features(course_id, query_features)
+    header, rows = format_dictiter(student_data, query_features)
 
-    task_progress.attempted = task_progress.succeeded = len(rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
-
-    rows.insert(0, header)
-
-    current_step = {'step': 'Uploading CSV'}
-    task_progress.update_task_state(extra_meta=current_step)
+    def counted(rows):
+        """ Count the rows as they are uploaded. """
+        for row in rows:
+            task_progress.attempted += 1
+            yield row
 
     # Perform the upload
-    upload_csv_to_report_store(rows, 'student_profile_info', course_id, start_date)
+    upload_csv_to_report_store(chain([header], counted(rows)), 'student_profile_info', course_id, start_date)
+
+    task_progress.succeeded = task_progress.attempted
+    task_progress.skipped = task_progress.total - task_progress.attempted
 
+    current_step = {'step': 'Uploaded CSV'}
     return task_progress.update_task_state(extra_meta=current_step)
 
 
@@ -1108,6 +1402,26 @@ def upload_may_enroll_csv(_xmodule_instance_args, _entry_id, course_id, task_inp
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def upload_answer_distribution_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+    """
+    For a given `course_id`, generate a CSV file of the distribution of the
+    answers submitted to the course's problems, and store it using a
+    `ReportStore`. The rows are written to the report as they are computed.
+    """
+    start_time = time()
+    start_date = datetime.now(UTC)
+    num_reports = 1
+    task_progress = TaskProgress(action_name, num_reports, start_time)
+    current_step = {'step': 'Calculating answer distribution'}
+    task_progress.update_task_state(extra_meta=current_step)
+
+    upload_csv_to_report_store(answer_distribution_rows(course_id), 'answer_distribution', course_id, start_date)
+
+    task_progress.attempted = task_progress.succeeded = num_reports
+    current_step = {'step': 'Uploaded CSV'}
+    return task_progress.update_task_state(extra_meta=current_step)
+
+
 def get_executive_report(course_id):
     """
     Returns dict containing information about the course executive summary.
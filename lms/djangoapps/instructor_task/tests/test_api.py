@@ -18,6 +18,7 @@ from instructor_task.api import (
     submit_cohort_students,
     submit_detailed_enrollment_features_csv,
     submit_calculate_may_enroll_csv,
+    submit_calculate_answer_distribution_csv,
     submit_executive_summary_report,
     generate_certificates_for_all_students,
 )
@@ -230,6 +231,13 @@ class InstructorTaskCourseSubmitTest(TestReportMixin, InstructorTaskCourseTestCa
         )
         self._test_resubmission(api_call)
 
+    def test_submit_calculate_answer_distribution(self):
+        api_call = lambda: submit_calculate_answer_distribution_csv(
+            self.create_task_request(self.instructor),
+            self.course.id
+        )
+        self._test_resubmission(api_call)
+
     def test_submit_cohort_students(self):
         api_call = lambda: submit_cohort_students(
             self.create_task_request(self.instructor),
@@ -3,6 +3,7 @@ Tests for instructor_task/models.py.
 """
 
 from cStringIO import StringIO
+from gzip import GzipFile
 import mock
 import time
 from datetime import datetime
@@ -25,6 +26,13 @@ class MockKey(object):
         """ Expected method on a Key object. """
         self.bucket.store_key(self)
 
+    def set_contents_from_file(self, fp, headers, rewind=False):  # pylint: disable=unused-argument
+        """ Expected method on a Key object. """
+        if rewind:
+            fp.seek(0)
+        self.contents = fp.read()
+        self.bucket.store_key(self)
+
     def generate_url(self, expires_in):  # pylint: disable=unused-argument
         """ Expected method on a Key object. """
         return "http://fake-edx-s3.edx.org/"
@@ -93,6 +101,18 @@ class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase
         """ Create and return a LocalFSReportStore. """
         return LocalFSReportStore.from_config(config_name='GRADES_DOWNLOAD')
 
+    def test_read_rows(self):
+        """
+        Test that rows stored with store_rows() can be read back and deleted.
+        """
+        report_store = self.create_report_store()
+        rows = [[u'username', u'grade'], [u'ni\xf1o', u'0.5']]
+        report_store.store_rows(self.course_id, 'report.csv', rows)
+        self.assertEqual(list(report_store.read_rows(self.course_id, 'report.csv')), rows)
+
+        report_store.delete(self.course_id, 'report.csv')
+        self.assertEqual(list(report_store.read_rows(self.course_id, 'report.csv')), [])
+
 
 @mock.patch('instructor_task.models.S3Connection', new=MockS3Connection)
 @mock.patch('instructor_task.models.Key', new=MockKey)
@@ -105,3 +125,16 @@ class S3ReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase):
     def create_report_store(self):
         """ Create and return a S3ReportStore. """
         return S3ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+
+    def test_store_rows_from_generator(self):
+        """
+        Test that store_rows() uploads the rows of a generator as a gzip'd CSV.
+        """
+        report_store = self.create_report_store()
+        report_store.store_rows(self.course_id, 'report.csv', ([u'row', unicode(i)] for i in range(3)))
+        key = report_store.bucket.keys[-1]
+        self.assertEqual(key.content_encoding, 'gzip')
+        self.assertEqual(
+            GzipFile(fileobj=StringIO(key.contents)).read(),
+            'row,0\r\nrow,1\r\nrow,2\r\n'
+        )
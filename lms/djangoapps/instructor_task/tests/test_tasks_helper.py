@@ -7,8 +7,11 @@ Tests that CSV grade report generation works with unicode emails.
 
 """
 import ddt
+from celery.states import SUCCESS, FAILURE
+import json
 from mock import Mock, patch
 import tempfile
+from uuid import uuid4
 import unicodecsv
 from django.core.urlresolvers import reverse
 from django.test.utils import override_settings
@@ -30,13 +33,19 @@ from student.models import CourseEnrollment, CourseEnrollmentAllowed, ManualEnro
 from verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.partitions.partitions import Group, UserPartition
-from instructor_task.models import ReportStore
+from instructor_task.models import InstructorTask, ReportStore
+from instructor_task.tests.factories import InstructorTaskFactory
 from instructor_task.tasks_helper import (
+    GRADE_REPORT_ROWS,
+    GradeReportMergeError,
+    _grade_report_rows,
     cohort_students_and_upload,
+    merge_grade_report_parts,
     upload_grades_csv,
     upload_problem_grade_report,
     upload_students_csv,
     upload_may_enroll_csv,
+    upload_answer_distribution_csv,
     upload_enrollment_report,
     upload_exec_summary_report,
     generate_students_certificates,
@@ -86,6 +95,127 @@ class TestInstructorGradeReport(TestReportMixin, InstructorTaskCourseTestCase):
         report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
         self.assertTrue(any('grade_report_err' in item[0] for item in report_store.links_for(self.course.id)))
 
+    @override_settings(GRADES_DOWNLOAD_STUDENTS_PER_TASK=2)
+    def test_grade_report_split_into_subtasks(self):
+        """
+        Test that a grade report graded by several subtasks is merged into a
+        single CSV and that the progress of every chunk is recorded.
+        """
+        usernames = [u'student{0}'.format(i) for i in range(5)]
+        for username in usernames:
+            self.create_student(username, u'{0}@example.com'.format(username))
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_type='grade_course',
+        )
+
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            upload_grades_csv(None, entry.id, self.course.id, None, 'graded')
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertEqual(json.loads(entry.subtasks)['succeeded'], 3)
+        self.assertDictContainsSubset(
+            {'attempted': 5, 'succeeded': 5, 'failed': 0}, json.loads(entry.task_output)
+        )
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        self.assertEqual(len(links), 1)
+        with open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            self.assertEqual(
+                sorted(row['username'] for row in unicodecsv.DictReader(csv_file)),
+                usernames
+            )
+
+    @override_settings(GRADES_DOWNLOAD_STUDENTS_PER_TASK=2)
+    def test_failed_subtask_reports_its_students_as_errors(self):
+        """
+        Test that the students of a subtask which fails are listed in the
+        error report rather than missing from both reports.
+        """
+        usernames = [u'student{0}'.format(i) for i in range(5)]
+        for username in usernames:
+            self.create_student(username, u'{0}@example.com'.format(username))
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_type='grade_course',
+        )
+
+        def grade_report_rows(course_id, students, task_progress, current_step):
+            """Fail to grade the chunk of student2."""
+            if any(student.username == u'student2' for student in students):
+                raise Exception(u'Grading chunk failed')
+            return _grade_report_rows(course_id, students, task_progress, current_step)
+
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            with patch.dict(GRADE_REPORT_ROWS, {'grade_report': grade_report_rows}):
+                upload_grades_csv(None, entry.id, self.course.id, None, 'graded')
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        reports = {
+            'grade_report_err' if 'grade_report_err' in filename else 'grade_report': filename
+            for filename, __ in report_store.links_for(self.course.id)
+        }
+        with open(report_store.path_to(self.course.id, reports['grade_report'])) as csv_file:
+            self.assertEqual(
+                sorted(row['username'] for row in unicodecsv.DictReader(csv_file)),
+                [u'student0', u'student1', u'student4']
+            )
+        with open(report_store.path_to(self.course.id, reports['grade_report_err'])) as csv_file:
+            err_rows = list(unicodecsv.DictReader(csv_file))
+        self.assertEqual(sorted(row['username'] for row in err_rows), [u'student2', u'student3'])
+        self.assertTrue(all(u'Grading chunk failed' in row['error_msg'] for row in err_rows))
+
+    @override_settings(GRADES_DOWNLOAD_STUDENTS_PER_TASK=2)
+    def test_failed_merge_fails_the_task(self):
+        """
+        Test that the task is only marked as successful once its report is
+        uploaded, and as failed if the merge of the partial CSVs fails.
+        """
+        for username in [u'student{0}'.format(i) for i in range(3)]:
+            self.create_student(username, u'{0}@example.com'.format(username))
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_type='grade_course',
+        )
+
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            with patch('instructor_task.tasks_helper.upload_csv_to_report_store') as mock_upload:
+                mock_upload.side_effect = IOError(u'Report store is unavailable')
+                upload_grades_csv(None, entry.id, self.course.id, None, 'graded')
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(json.loads(entry.task_output)['message'], u'Report store is unavailable')
+
+    def test_merge_fails_on_missing_parts(self):
+        """
+        Test that no report is uploaded when the partial CSVs of a subtask are
+        missing.
+        """
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_type='grade_course',
+            subtasks=json.dumps({'total': 2}),
+        )
+        parts_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD_PARTS')
+        parts_store.store_rows(
+            self.course.id, u'grade_report_2015-01-01-0000_part00000.csv', [[u'id', u'username'], [1, u'student']]
+        )
+        parts_store.store_rows(
+            self.course.id, u'grade_report_err_2015-01-01-0000_part00000.csv', [[u'id', u'username', u'error_msg']]
+        )
+
+        with self.assertRaises(GradeReportMergeError):
+            merge_grade_report_parts(entry.id, 'grade_report', '2015-01-01-0000')
+        self.assertEqual(InstructorTask.objects.get(pk=entry.id).task_state, FAILURE)
+        self.assertEqual(ReportStore.from_config(config_name='GRADES_DOWNLOAD').links_for(self.course.id), [])
+        self.assertEqual(parts_store.links_for(self.course.id), [])
+
     def _verify_cell_data_for_user(self, username, course_id, column_header, expected_cell_content):
         """
         Verify cell data in the grades CSV for a particular user.
@@ -930,6 +1060,31 @@ class TestListMayEnroll(TestReportMixin, InstructorTaskCourseTestCase):
         self.assertDictContainsSubset({'attempted': num_enrollments, 'succeeded': num_enrollments, 'failed': 0}, result)
 
 
+class TestAnswerDistributionReport(TestReportMixin, InstructorTaskModuleTestCase):
+    """
+    Tests that the answer distribution CSV is generated and stored.
+    """
+    def setUp(self):
+        super(TestAnswerDistributionReport, self).setUp()
+        self.initialize_course()
+        self.define_option_problem(u'Problem1')
+        self.student = self.create_student(u'student')
+
+    def test_success(self):
+        self.submit_student_answer(self.student.username, u'Problem1', ['Option 1', 'Option 2'])
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            result = upload_answer_distribution_csv(None, None, self.course.id, None, 'generated')
+        self.assertDictContainsSubset({'attempted': 1, 'succeeded': 1, 'failed': 0}, result)
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        report_csv_filename = report_store.links_for(self.course.id)[0][0]
+        rows = list(report_store.read_rows(self.course.id, report_csv_filename))
+        self.assertEqual(
+            rows[0], [u'url_name', u'display name', u'answer id', u'answer', u'count', u'max overcount']
+        )
+        self.assertEqual([row[3:] for row in rows[1:]], [[u'Option 1', u'1', u'0'], [u'Option 2', u'1', u'0']])
+
+
 class MockDefaultStorage(object):
     """Mock django's DefaultStorage"""
     def __init__(self):
@@ -1,6 +1,8 @@
 """
 Serializer for video outline
 """
+from django.conf import settings
+from django.core.cache import cache
 from rest_framework.reverse import reverse
 
 from xmodule.modulestore.mongo.base import BLOCK_TYPES_WITH_CHILDREN
@@ -15,10 +17,16 @@ from edxval.api import (
     get_video_info_for_course_and_profiles, ValInternalError
 )
 
+OUTLINE_CACHE_KEY = u"mobile_api.video_outlines.{course_id}.{start_block}.{video_profiles}.{base_url}"
+
 
 class BlockOutline(object):
     """
     Serializes course videos, pulling data from VAL and the video modules.
+
+    Which blocks a user sees depends on their access, but the entry of each
+    block in the outline doesn't, so the entries are cached for the course's
+    version for `settings.VIDEO_OUTLINE_CACHE_TIMEOUT` seconds.
     """
     def __init__(self, course_id, start_block, block_types, request, video_profiles):
         """Create a BlockOutline using `start_block` as a starting point."""
@@ -26,14 +34,64 @@ class BlockOutline(object):
         self.block_types = block_types
         self.course_id = course_id
         self.request = request  # needed for making full URLS
+        self.video_profiles = video_profiles
         self.local_cache = {}
+        self._course = None
+        self._field_data_cache = None
+
+    @property
+    def course(self):
+        """
+        The course of the outline, loaded at most once.
+        """
+        if self._course is None:
+            if self.start_block.category == 'course':
+                self._course = self.start_block
+            else:
+                self._course = get_course_by_id(self.course_id)
+        return self._course
+
+    def _load_course_videos(self):
+        """
+        Load the course's encoded videos from VAL, unless they are already loaded.
+        """
+        if 'course_videos' in self.local_cache:
+            return
         try:
             self.local_cache['course_videos'] = get_video_info_for_course_and_profiles(
-                unicode(course_id), video_profiles
+                unicode(self.course_id), self.video_profiles
             )
         except ValInternalError:  # pragma: nocover
             self.local_cache['course_videos'] = {}
 
+    def _create_module(self, descriptor):
+        """
+        Factory method for creating and binding a module for the given descriptor.
+
+        The user's state is loaded for all the blocks with dynamic children
+        under `start_block` the first time a module is created, rather than
+        once per block.
+        """
+        if self._field_data_cache is None:
+            self._field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+                self.course_id, self.request.user, self.start_block,
+                descriptor_filter=lambda descriptor: descriptor.has_dynamic_children(),
+            )
+        return get_module_for_descriptor(
+            self.request.user, self.request, descriptor, self._field_data_cache, self.course_id, course=self.course
+        )
+
+    def _cache_key(self):
+        """
+        Returns the key the outline's entries are cached under.
+        """
+        return OUTLINE_CACHE_KEY.format(
+            course_id=self.course_id,
+            start_block=self.start_block.location,
+            video_profiles=u','.join(self.video_profiles),
+            base_url=self.request.build_absolute_uri('/'),
+        )
+
     def __iter__(self):
         def parent_or_requested_block_type(usage_key):
             """
@@ -44,23 +102,22 @@ class BlockOutline(object):
                 usage_key.block_type in BLOCK_TYPES_WITH_CHILDREN
             )
 
-        def create_module(descriptor):
-            """
-            Factory method for creating and binding a module for the given descriptor.
-            """
-            field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
-                self.course_id, self.request.user, descriptor, depth=0,
-            )
-            course = get_course_by_id(self.course_id)
-            return get_module_for_descriptor(
-                self.request.user, self.request, descriptor, field_data_cache, self.course_id, course=course
-            )
+        cache_timeout = settings.VIDEO_OUTLINE_CACHE_TIMEOUT
+        version = getattr(self.course, 'subtree_edited_on', None)
+        entries = {}
+        if cache_timeout and version is not None:
+            cached = cache.get(self._cache_key())
+            if cached is not None and cached[0] == version:
+                entries = cached[1]
+        entries_added = False
 
         with modulestore().bulk_operations(self.course_id):
-            child_to_parent = {}
+            # The ancestors of each block on the stack, from start_block down
+            block_ancestors = {self.start_block: []}
             stack = [self.start_block]
             while stack:
                 curr_block = stack.pop()
+                ancestors = block_ancestors.pop(curr_block)
 
                 if curr_block.hide_from_toc:
                     # For now, if the 'hide_from_toc' setting is set on the block, do not traverse down
@@ -75,48 +132,60 @@ class BlockOutline(object):
                     if not has_access(self.request.user, 'load', curr_block, course_key=self.course_id):
                         continue
 
-                    summary_fn = self.block_types[curr_block.category]
-                    block_path = list(path(curr_block, child_to_parent, self.start_block))
-                    unit_url, section_url = find_urls(self.course_id, curr_block, child_to_parent, self.request)
-
-                    yield {
-                        "path": block_path,
-                        "named_path": [b["name"] for b in block_path],
-                        "unit_url": unit_url,
-                        "section_url": section_url,
-                        "summary": summary_fn(self.course_id, curr_block, self.request, self.local_cache)
-                    }
+                    entry_key = unicode(curr_block.location)
+                    entry = entries.get(entry_key)
+                    if entry is None:
+                        self._load_course_videos()
+                        summary_fn = self.block_types[curr_block.category]
+                        block_path = path(ancestors, self.start_block)
+                        unit_url, section_url = find_urls(self.course_id, ancestors, self.request)
+                        entry = entries[entry_key] = {
+                            "path": block_path,
+                            "named_path": [b["name"] for b in block_path],
+                            "unit_url": unit_url,
+                            "section_url": section_url,
+                            "summary": summary_fn(self.course_id, curr_block, self.request, self.local_cache)
+                        }
+                        entries_added = True
+
+                    yield entry
 
                 if curr_block.has_children:
                     children = get_dynamic_descriptor_children(
                         curr_block,
                         self.request.user.id,
-                        create_module,
+                        self._create_module,
                         usage_key_filter=parent_or_requested_block_type
                     )
+                    child_ancestors = ancestors + [curr_block]
                     for block in reversed(children):
                         stack.append(block)
-                        child_to_parent[block] = curr_block
+                        block_ancestors[block] = child_ancestors
+
+        if entries_added and cache_timeout and version is not None:
+            cache.set(self._cache_key(), (version, entries), cache_timeout)
 
 
-def path(block, child_to_parent, start_block):
-    """path for block"""
-    block_path = []
-    while block in child_to_parent:
-        block = child_to_parent[block]
-        if block is not start_block:
-            block_path.append({
-                # to be consistent with other edx-platform clients, return the defaulted display name
-                'name': block.display_name_with_default,
-                'category': block.category,
-                'id': unicode(block.location)
-            })
-    return reversed(block_path)
+def path(ancestors, start_block):
+    """
+    Path to a block with the given `ancestors`, excluding `start_block`.
+    """
+    return [
+        {
+            # to be consistent with other edx-platform clients, return the defaulted display name
+            'name': block.display_name_with_default,
+            'category': block.category,
+            'id': unicode(block.location)
+        }
+        for block in ancestors
+        if block is not start_block
+    ]
 
 
-def find_urls(course_id, block, child_to_parent, request):
+def find_urls(course_id, ancestors, request):
     """
-    Find the section and unit urls for a block.
+    Find the section and unit urls for a block with the given `ancestors`,
+    from the course down.
 
     Returns:
         unit_url, section_url:
@@ -124,22 +193,16 @@ def find_urls(course_id, block, child_to_parent, request):
             section_url (str): The url of a section
 
     """
-    block_path = []
-    while block in child_to_parent:
-        block = child_to_parent[block]
-        block_path.append(block)
-
-    block_list = list(reversed(block_path))
-    block_count = len(block_list)
+    block_count = len(ancestors)
 
-    chapter_id = block_list[1].location.block_id if block_count > 1 else None
-    section = block_list[2] if block_count > 2 else None
+    chapter_id = ancestors[1].location.block_id if block_count > 1 else None
+    section = ancestors[2] if block_count > 2 else None
     position = None
 
     if block_count > 3:
         position = 1
         for block in section.children:
-            if block.name == block_list[3].url_name:
+            if block.name == ancestors[3].url_name:
                 break
             position += 1
 
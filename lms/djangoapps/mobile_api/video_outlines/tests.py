@@ -8,6 +8,11 @@ import itertools
 from uuid import uuid4
 from collections import namedtuple
 
+from django.core.cache import cache
+from django.test.utils import override_settings
+from mock import patch
+
+from courseware.model_data import FieldDataCache
 from edxval import api
 from mobile_api.models import MobileApiConfig
 from xmodule.modulestore.tests.factories import ItemFactory
@@ -702,6 +707,52 @@ class TestVideoSummaryList(
             ],
         )
 
+    def test_with_split_blocks_loads_user_state_once(self):
+        self.login_and_enroll()
+        self._setup_split_module("video")
+        other_split_test = ItemFactory.create(
+            parent=self.other_unit,
+            category="split_test",
+            display_name=u"other split test unit",
+            user_partition_id=0,
+        )
+        other_videos = [
+            ItemFactory.create(parent=other_split_test, category="video", display_name=u"other split test block")
+            for __ in range(2)
+        ]
+        other_split_test.group_id_to_child = {
+            str(index): video.location for index, video in enumerate(other_videos)
+        }
+        self.store.update_item(other_split_test, self.user.id)
+
+        with patch.object(
+            FieldDataCache, 'cache_for_descriptor_descendents', wraps=FieldDataCache.cache_for_descriptor_descendents
+        ) as mock_cache_for_descriptor_descendents:
+            video_outline = self.api_response().data
+        self.assertEqual(mock_cache_for_descriptor_descendents.call_count, 1)
+        self.assertEqual(len(video_outline), 2)
+
+    @override_settings(VIDEO_OUTLINE_CACHE_TIMEOUT=60)
+    def test_outline_cached_for_course_version(self):
+        cache.clear()
+        self.login_and_enroll()
+        self._create_video_with_subs()
+        video_outline = self.api_response().data
+
+        with patch('mobile_api.video_outlines.serializers.get_video_info_for_course_and_profiles') as mock_val:
+            self.assertEqual(self.api_response().data, video_outline)
+        self.assertFalse(mock_val.called)
+
+        ItemFactory.create(
+            parent=self.other_unit,
+            category="video",
+            display_name=u"test video omega 2 \u03a9",
+            html5_sources=[self.html5_video_url]
+        )
+        video_outline = self.api_response().data
+        self.assertEqual(len(video_outline), 2)
+        self.assertEqual(video_outline[1]['summary']['video_url'], self.html5_video_url)
+
     def _create_cohorted_video(self, group_id):
         """Creates a cohorted video block, giving access to only the given group_id."""
         video_block = ItemFactory.create(
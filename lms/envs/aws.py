@@ -267,6 +267,7 @@ VIRTUAL_UNIVERSITIES = ENV_TOKENS.get('VIRTUAL_UNIVERSITIES', [])
 META_UNIVERSITIES = ENV_TOKENS.get('META_UNIVERSITIES', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_CLIENT.update(ENV_TOKENS.get("COMMENTS_SERVICE_CLIENT", {}))
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
 ZENDESK_URL = ENV_TOKENS.get("ZENDESK_URL")
 FEEDBACK_SUBMISSION_EMAIL = ENV_TOKENS.get("FEEDBACK_SUBMISSION_EMAIL")
@@ -291,6 +292,8 @@ for name, value in ENV_TOKENS.get("CODE_JAIL", {}).items():
 
 COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
 
+STATIC_CONTENT_DISK_CACHE.update(ENV_TOKENS.get('STATIC_CONTENT_DISK_CACHE', {}))
+
 ASSET_IGNORE_REGEX = ENV_TOKENS.get('ASSET_IGNORE_REGEX', ASSET_IGNORE_REGEX)
 
 # Event Tracking
@@ -431,6 +434,7 @@ XQUEUE_INTERFACE = AUTH_TOKENS['XQUEUE_INTERFACE']
 # use the one from common.py
 MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTORE', MODULESTORE))
 CONTENTSTORE = AUTH_TOKENS.get('CONTENTSTORE', CONTENTSTORE)
+SPLIT_STRUCTURE_CACHE.update(ENV_TOKENS.get('SPLIT_STRUCTURE_CACHE', {}))
 DOC_STORE_CONFIG = AUTH_TOKENS.get('DOC_STORE_CONFIG', DOC_STORE_CONFIG)
 MONGODB_LOG = AUTH_TOKENS.get('MONGODB_LOG', {})
 
@@ -506,6 +510,13 @@ VERIFY_STUDENT = AUTH_TOKENS.get("VERIFY_STUDENT", VERIFY_STUDENT)
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
+GRADES_DOWNLOAD_PARTS = ENV_TOKENS.get(
+    "GRADES_DOWNLOAD_PARTS", dict(GRADES_DOWNLOAD, ROOT_PATH=GRADES_DOWNLOAD['ROOT_PATH'] + '/parts')
+)
+GRADES_DOWNLOAD_STUDENTS_PER_TASK = ENV_TOKENS.get(
+    "GRADES_DOWNLOAD_STUDENTS_PER_TASK", GRADES_DOWNLOAD_STUDENTS_PER_TASK
+)
+ANSWER_DISTRIBUTION_MAX_ANSWERS = ENV_TOKENS.get("ANSWER_DISTRIBUTION_MAX_ANSWERS", ANSWER_DISTRIBUTION_MAX_ANSWERS)
 
 # financial reports
 FINANCIAL_REPORTS = ENV_TOKENS.get("FINANCIAL_REPORTS", FINANCIAL_REPORTS)
@@ -600,6 +611,13 @@ COURSE_ABOUT_VISIBILITY_PERMISSION = ENV_TOKENS.get(
 
 # Enrollment API Cache Timeout
 ENROLLMENT_COURSE_DETAILS_CACHE_TIMEOUT = ENV_TOKENS.get('ENROLLMENT_COURSE_DETAILS_CACHE_TIMEOUT', 60)
+DASHBOARD_DATA_CACHE_TIMEOUT = ENV_TOKENS.get('DASHBOARD_DATA_CACHE_TIMEOUT', DASHBOARD_DATA_CACHE_TIMEOUT)
+COURSE_LISTING_CACHE_TIMEOUT = ENV_TOKENS.get('COURSE_LISTING_CACHE_TIMEOUT', COURSE_LISTING_CACHE_TIMEOUT)
+CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT', CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT
+)
+GEOIP_CACHE_TIMEOUT = ENV_TOKENS.get('GEOIP_CACHE_TIMEOUT', GEOIP_CACHE_TIMEOUT)
+VIDEO_OUTLINE_CACHE_TIMEOUT = ENV_TOKENS.get('VIDEO_OUTLINE_CACHE_TIMEOUT', VIDEO_OUTLINE_CACHE_TIMEOUT)
 
 # PDF RECEIPT/INVOICE OVERRIDES
 PDF_RECEIPT_TAX_ID = ENV_TOKENS.get('PDF_RECEIPT_TAX_ID', PDF_RECEIPT_TAX_ID)
@@ -63,6 +63,7 @@ GRADES_DOWNLOAD = {
     'BUCKET': 'edx-grades',
     'ROOT_PATH': os.path.join(mkdtemp(), 'edx-s3', 'grades'),
 }
+GRADES_DOWNLOAD_PARTS = dict(GRADES_DOWNLOAD, ROOT_PATH=GRADES_DOWNLOAD['ROOT_PATH'] + '/parts')
 
 # Configure the LMS to use our stub XQueue implementation
 XQUEUE_INTERFACE['url'] = 'http://localhost:8040'
@@ -61,6 +61,16 @@ DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
 }
 
+# HTTP client for the comments service. Connections are kept alive in a pool
+# of POOL_SIZE connections per process, idempotent requests are retried
+# MAX_RETRIES times when connecting fails, and `run_concurrently` runs up to
+# MAX_WORKERS calls at once.
+COMMENTS_SERVICE_CLIENT = {
+    'POOL_SIZE': 10,
+    'MAX_RETRIES': 1,
+    'MAX_WORKERS': 4,
+}
+
 
 # Features
 FEATURES = {
@@ -399,6 +409,11 @@ FEATURES = {
     # Course discovery feature
     'ENABLE_COURSE_DISCOVERY': False,
 
+    # Query the course catalog from the course overviews, rather than loading
+    # and checking every course of the modulestore. Run the
+    # update_course_overviews management command with --all before enabling it.
+    'ENABLE_COURSE_CATALOG_QUERIES': False,
+
     # Software secure fake page feature flag
     'ENABLE_SOFTWARE_SECURE_FAKE': False,
 
@@ -422,6 +437,9 @@ FEATURES = {
 
     # Enable the max score cache to speed up grading
     'ENABLE_MAX_SCORE_CACHE': True,
+
+    # Persist per-section grades and only regrade the sections whose scores changed
+    'ENABLE_PERSISTENT_GRADES': False,
 }
 
 # Ignore static asset files on import which match this pattern
@@ -465,6 +483,9 @@ NODE_PATH = ':'.join(node_paths)
 # For geolocation ip database
 GEOIP_PATH = REPO_ROOT / "common/static/data/geoip/GeoIP.dat"
 GEOIPV6_PATH = REPO_ROOT / "common/static/data/geoip/GeoIPv6.dat"
+# How long the country of an IP address is cached in process, in seconds.
+# 0 disables it.
+GEOIP_CACHE_TIMEOUT = 60 * 60
 
 # Where to look for a status message
 STATUS_MESSAGE_PATH = ENV_ROOT / "status_message.json"
@@ -766,6 +787,16 @@ MODULESTORE = {
     }
 }
 
+# Keep the most recently used split modulestore course structures in each
+# process, decoded, in front of the 'course_structure_cache' cache. See
+# xmodule.modulestore.split_mongo.mongo_connection.StructureLRUCache.
+SPLIT_STRUCTURE_CACHE = {
+    # Pickled size of the structures to keep, in bytes. 0 disables the cache.
+    'MAX_BYTES': 0,
+    # Keep the structures compressed, saving memory but not decoding time.
+    'COMPRESS': False,
+}
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -779,6 +810,24 @@ CODE_JAIL = {
         # How many CPU seconds can jailed code use?
         'CPU': 1,
     },
+
+    # Run capa code in a pool of warm sandboxed Python processes, instead of
+    # starting a new one for every execution. See capa.safe_exec.pool.
+    'warm_pool': {
+        # How many idle processes to keep. 0 disables the pool.
+        'size': 0,
+        # How many processes may run at once, idle or busy. Defaults to twice
+        # the size.
+        'max_workers': None,
+        # Replace a process after it ran this many executions.
+        'max_executions': 100,
+        # Stop executions after this many seconds.
+        'timeout': 5,
+    },
+
+    # How many bytes of results to keep in each process, in front of the
+    # shared cache. 0 disables the process-local cache.
+    'local_cache_bytes': 0,
 }
 
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
@@ -1129,6 +1178,17 @@ TEMPLATE_LOADERS = (
 
 )
 
+# Keep copies of assets too big for the cache on local disk, so that serving
+# them doesn't read them from the contentstore every time. See
+# contentserver.disk_cache. A DIRECTORY of None disables the disk cache.
+STATIC_CONTENT_DISK_CACHE = {
+    'DIRECTORY': None,
+    # Total size of the copies, in bytes
+    'MAX_SIZE': 10 * 1024 * 1024 * 1024,
+    # Assets bigger than this aren't copied
+    'MAX_ITEM_SIZE': 500 * 1024 * 1024,
+}
+
 MIDDLEWARE_CLASSES = (
     'request_cache.middleware.RequestCache',
     'microsite_configuration.middleware.MicrositeMiddleware',
@@ -2126,6 +2186,22 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': '/tmp/edx-s3/grades',
 }
 
+# Grade reports for courses with more enrolled students than this are graded in
+# parallel by subtasks of this many students each. None grades all students in
+# a single task.
+GRADES_DOWNLOAD_STUDENTS_PER_TASK = None
+
+# Where the subtasks of a grade report store their partial CSVs until merged.
+# All the workers must share it, so it is the "parts" directory of the
+# GRADES_DOWNLOAD store.
+GRADES_DOWNLOAD_PARTS = dict(GRADES_DOWNLOAD, ROOT_PATH=GRADES_DOWNLOAD['ROOT_PATH'] + '/parts')
+
+# The number of distinct answers of each problem part listed in answer
+# distribution reports; the less frequent answers are counted together. Counts
+# are approximate for problem parts with more than twice as many distinct
+# answers, see courseware.grades.AnswerCounts.
+ANSWER_DISTRIBUTION_MAX_ANSWERS = 1000
+
 FINANCIAL_REPORTS = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-financial-reports',
@@ -2427,6 +2503,20 @@ COURSE_ABOUT_VISIBILITY_PERMISSION = 'see_exists'
 # Enrollment API Cache Timeout
 ENROLLMENT_COURSE_DETAILS_CACHE_TIMEOUT = 60
 
+# How long to cache the certificates loaded for a user's dashboard, in
+# seconds. The cache is cleared when the user's enrollments or certificates
+# change. 0 disables it.
+DASHBOARD_DATA_CACHE_TIMEOUT = 0
+
+# How long configuration models (see config_models) are cached in process, in
+# seconds, before checking the shared cache for changes. 0 disables it.
+CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT = 5
+
+# How long the entries of the mobile video outline are cached per course
+# version, in seconds. Only the videos' data from VAL can go stale for this
+# long; changes to the course are picked up immediately. 0 disables it.
+VIDEO_OUTLINE_CACHE_TIMEOUT = 0
+
 # for Student Notes we would like to avoid too frequent token refreshes (default is 30 seconds)
 if FEATURES['ENABLE_EDXNOTES']:
     OAUTH_ID_TOKEN_EXPIRATION = 60 * 60
@@ -2532,6 +2622,10 @@ PREVIEW_DOMAIN = 'preview'
 # If set to None, all courses will be listed on the homepage
 HOMEPAGE_COURSE_MAX = None
 
+# How long to cache the rendered course listings of the homepage and course
+# catalog, in seconds, if ENABLE_COURSE_CATALOG_QUERIES is enabled. 0 disables it.
+COURSE_LISTING_CACHE_TIMEOUT = 0
+
 ################################ Settings for Credit Courses ################################
 # Initial delay used for retrying tasks.
 # Additional retries use longer delays.
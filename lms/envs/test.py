@@ -215,6 +215,13 @@ CACHES = {
     },
 }
 
+# Configuration changes must be seen right away, and the database is rolled back
+# between tests without going through ConfigurationModel.save
+CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT = 0
+
+# The tests mock the country of IP addresses
+GEOIP_CACHE_TIMEOUT = 0
+
 # Dummy secret key for dev
 SECRET_KEY = '85920908f28904ed733fe576320db18cabd7b6cd'
 
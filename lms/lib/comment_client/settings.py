@@ -6,3 +6,8 @@ else:
     SERVICE_HOST = 'http://localhost:4567'
 
 PREFIX = SERVICE_HOST + '/api/v1'
+
+CLIENT_SETTINGS = getattr(settings, "COMMENTS_SERVICE_CLIENT", {})
+POOL_SIZE = CLIENT_SETTINGS.get('POOL_SIZE', 10)
+MAX_RETRIES = CLIENT_SETTINGS.get('MAX_RETRIES', 1)
+MAX_WORKERS = CLIENT_SETTINGS.get('MAX_WORKERS', 4)
@@ -1,14 +1,35 @@
 from contextlib import contextmanager
 import dogstats_wrapper as dog_stats_api
 import logging
+from multiprocessing.pool import ThreadPool
+import os
+import re
 import requests
+import sys
+import threading
 from django.conf import settings
 from time import time
+from urlparse import urlparse
 from uuid import uuid4
+from django.utils import translation
 from django.utils.translation import get_language
 
+from . import settings as cc_settings
+
 log = logging.getLogger(__name__)
 
+# Only requests which can safely be sent twice are retried.
+RETRIED_METHODS = ('get',)
+
+# Path segments of the comments service API that name resources, rather
+# than identify them.
+RESOURCE_SEGMENT = re.compile(r'^[a-z_]+$')
+
+_SESSION = None
+_WORKER_POOL = None
+_POOL_PID = None
+_POOL_LOCK = threading.Lock()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -31,6 +52,17 @@ def merge_dict(dic1, dic2):
     return dict(dic1.items() + dic2.items())
 
 
+def endpoint_name(url):
+    """
+    The path of `url` with the ids in it replaced by ":id", e.g.
+    "/api/v1/threads/:id/comments", to tag metrics with.
+    """
+    return u'/'.join(
+        segment if not segment or RESOURCE_SEGMENT.match(segment) else u':id'
+        for segment in urlparse(url).path.split('/')
+    )
+
+
 @contextmanager
 def request_timer(request_id, method, url, tags=None):
     start = time()
@@ -39,6 +71,12 @@ def request_timer(request_id, method, url, tags=None):
     end = time()
     duration = end - start
 
+    dog_stats_api.histogram(
+        'comment_client.request.endpoint.time',
+        value=duration,
+        tags=(tags or []) + [u'endpoint:{}'.format(endpoint_name(url))]
+    )
+
     log.info(
         u"comment_client_request_log: request_id={request_id}, method={method}, "
         u"url={url}, duration={duration}".format(
@@ -75,15 +113,25 @@ def perform_request(method, url, data_or_params=None, raw=False,
     else:
         data = None
         params = merge_dict(data_or_params, request_id_dict)
-    with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
-            method,
-            url,
-            data=data,
-            params=params,
-            headers=headers,
-            timeout=5
-        )
+    retries = cc_settings.MAX_RETRIES if method in RETRIED_METHODS else 0
+    while True:
+        try:
+            with request_timer(request_id, method, url, metric_tags):
+                response = get_session().request(
+                    method,
+                    url,
+                    data=data,
+                    params=params,
+                    headers=headers,
+                    timeout=5
+                )
+            break
+        except requests.exceptions.ConnectionError:
+            # Pooled connections may have been closed by the server.
+            if not retries:
+                raise
+            retries -= 1
+            log.warning(u"Retrying comments service request %s after a connection error", request_id)
 
     metric_tags.append(u'status_code:{}'.format(response.status_code))
     if response.status_code > 200:
@@ -132,6 +180,76 @@ def perform_request(method, url, data_or_params=None, raw=False,
             return data
 
 
+def get_session():
+    """
+    Returns the `requests.Session` this process sends its requests to the
+    comments service with, which keeps up to `POOL_SIZE` connections alive.
+    """
+    _check_pid()
+    return _SESSION
+
+
+def run_concurrently(*calls):
+    """
+    Makes independent calls to the comments service at the same time, in a
+    pool of `MAX_WORKERS` threads, and returns their results in order.
+
+    Each of `calls` is a function without arguments, e.g.
+    `functools.partial(user.active_threads, query_params)`. They must not
+    use the database or call `run_concurrently` themselves. If any of them
+    raises an exception, the first one is raised once all of them are done.
+    """
+    if len(calls) < 2 or cc_settings.MAX_WORKERS < 2:
+        return [call() for call in calls]
+
+    language = get_language()
+
+    def run(call):
+        """
+        Run `call` with the caller's language, and return its result or
+        the exception it raised.
+        """
+        if language:
+            translation.activate(language)
+        try:
+            return True, call()
+        except Exception:  # pylint: disable=broad-except
+            return False, sys.exc_info()
+        finally:
+            translation.deactivate()
+
+    global _WORKER_POOL  # pylint: disable=global-statement
+    _check_pid()
+    with _POOL_LOCK:
+        if _WORKER_POOL is None:
+            _WORKER_POOL = ThreadPool(cc_settings.MAX_WORKERS)
+
+    results = []
+    for succeeded, result in _WORKER_POOL.map(run, calls):
+        if not succeeded:
+            raise result[0], result[1], result[2]
+        results.append(result)
+    return results
+
+
+def _check_pid():
+    """
+    Create the session of this process, and forget its worker pool, if
+    they don't exist yet or were inherited from the parent of a forked process.
+    """
+    global _SESSION, _WORKER_POOL, _POOL_PID  # pylint: disable=global-statement
+    with _POOL_LOCK:
+        if _POOL_PID == os.getpid():
+            return
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=cc_settings.POOL_SIZE)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _SESSION = session
+        _WORKER_POOL = None
+        _POOL_PID = os.getpid()
+
+
 class CommentClientError(Exception):
     def __init__(self, msg):
         self.message = msg
@@ -38,6 +38,10 @@ def run():
     if settings.FEATURES.get('ENABLE_THIRD_PARTY_AUTH', False):
         enable_third_party_auth()
 
+    configure_warm_sandbox_pool()
+    configure_safe_exec_local_cache()
+    configure_split_structure_cache()
+
     # Initialize Segment.io analytics module. Flushes first time a message is received and
     # every 50 messages thereafter, or if 10 seconds have passed since last flush
     if settings.FEATURES.get('SEGMENT_IO_LMS') and hasattr(settings, 'SEGMENT_IO_LMS_KEY'):
@@ -58,6 +62,47 @@ def add_mimetypes():
     mimetypes.add_type('application/font-woff', '.woff')
 
 
+def configure_warm_sandbox_pool():
+    """
+    Run capa code in a pool of warm sandboxed processes, if configured in
+    CODE_JAIL['warm_pool'].
+    """
+    python_bin = settings.CODE_JAIL.get('python_bin')
+    pool_settings = settings.CODE_JAIL.get('warm_pool', {})
+    if python_bin and pool_settings.get('size'):
+        from capa.safe_exec import configure_warm_pool
+        configure_warm_pool(
+            python_bin,
+            user=settings.CODE_JAIL.get('user'),
+            limits=settings.CODE_JAIL.get('limits'),
+            **pool_settings
+        )
+
+
+def configure_safe_exec_local_cache():
+    """
+    Keep recent capa code results in the process, if configured in
+    CODE_JAIL['local_cache_bytes'].
+    """
+    max_bytes = settings.CODE_JAIL.get('local_cache_bytes')
+    if max_bytes:
+        from capa.safe_exec import configure_local_cache
+        configure_local_cache(max_bytes)
+
+
+def configure_split_structure_cache():
+    """
+    Keep course structures in a process-wide cache, if configured in
+    SPLIT_STRUCTURE_CACHE.
+    """
+    if settings.SPLIT_STRUCTURE_CACHE.get('MAX_BYTES'):
+        from xmodule.modulestore.split_mongo.mongo_connection import configure_structure_cache
+        configure_structure_cache(
+            settings.SPLIT_STRUCTURE_CACHE['MAX_BYTES'],
+            compress=settings.SPLIT_STRUCTURE_CACHE.get('COMPRESS', False),
+        )
+
+
 def enable_theme():
     """
     Enable the settings for a custom theme, whose files should be stored
@@ -0,0 +1,58 @@
+"""
+Creates or updates the overviews of courses from the modulestore.
+"""
+import logging
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.keys import CourseKey
+from xmodule.modulestore.django import modulestore
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Creates or updates the overviews of one or more courses, or of all the
+    courses of the modulestore, whose overviews make up the course catalog.
+
+    Example usage:
+        $ ./manage.py lms update_course_overviews --all --settings=aws
+    """
+    args = '<course_id course_id ...>'
+    help = 'Creates or updates the overviews of one or more courses.'
+
+    option_list = BaseCommand.option_list + (
+        make_option('--all',
+                    action='store_true',
+                    default=False,
+                    help='Update the overviews of all courses, and delete the overviews of deleted courses.'),
+    )
+
+    def handle(self, *args, **options):
+
+        if options['all']:
+            course_keys = [course.id for course in modulestore().get_courses()]
+        else:
+            course_keys = [CourseKey.from_string(arg) for arg in args]
+
+        if not course_keys:
+            log.fatal('No courses specified.')
+            return
+
+        log.info('Updating the overviews of %d courses.', len(course_keys))
+
+        for course_key in course_keys:
+            try:
+                CourseOverview.update_from_course_key(course_key)
+            except Exception as ex:  # pylint: disable=broad-except
+                log.exception('An error occurred while updating the overview of %s: %s',
+                              unicode(course_key), ex.message)
+
+        if options['all']:
+            CourseOverview.delete_missing_courses(course_keys)
+
+        log.info('Finished updating course overviews.')
@@ -3,9 +3,15 @@ Declaration of CourseOverview model
 """
 
 import json
+from uuid import uuid4
 
+from ccx_keys.locator import CCXLocator
 import django.db.models
-from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField, FloatField
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.db.models.fields import BooleanField, CharField, DateTimeField, DecimalField, TextField, FloatField
+from django.utils.datastructures import SortedDict
 from django.utils.translation import ugettext
 
 from util.date_utils import strftime_localized
@@ -16,6 +22,115 @@ from xmodule.modulestore.django import modulestore
 from xmodule_django.models import CourseKeyField, UsageKeyField
 
 
+# The key of the version stamp of the course catalog in the cache, which is
+# changed whenever a course is published. See CourseOverview.get_catalog_version.
+CATALOG_VERSION_CACHE_KEY = 'course_overviews.catalog_version'
+CATALOG_VERSION_CACHE_TIMEOUT = 60 * 60 * 24
+
+# The orders in which CourseOverviewManager.catalog can sort courses
+CATALOG_SORT_BY_NUMBER = 'number'
+CATALOG_SORT_BY_START_DATE = 'start_date'
+CATALOG_SORT_BY_ANNOUNCEMENT = 'announcement'
+
+
+class CourseOverviewManager(django.db.models.Manager):
+    """
+    Query manager for CourseOverview
+    """
+    def catalog(
+            self, now, orgs=None, exclude_orgs=None, course_ids=None, visibilities=None, open_only=False,
+            ignore_start_dates=False, enrollment_domains=None, include_course_ids=None, include_orgs=None,
+            sort_by=CATALOG_SORT_BY_NUMBER
+    ):
+        """
+        A queryset for the course overviews of a course catalog, filtered and
+        sorted by the database, which can be sliced to paginate it.
+
+        Arguments:
+            now (datetime): the time at which the catalog is looked at.
+            orgs (list): only include the courses of these orgs.
+            exclude_orgs (list): exclude the courses of these orgs.
+            course_ids (list): only include these courses.
+            visibilities (list): only include the courses with one of these
+                catalog visibilities.
+            open_only (bool): only include the courses which are open at `now`,
+                i.e. which are started and not visible to staff only, or which
+                are open for enrollment and not invitation only.
+            ignore_start_dates (bool): consider all courses started.
+            enrollment_domains (list): if not None, the courses which restrict
+                enrollment to a domain are only open for enrollment if it is one
+                of these.
+            include_course_ids (list): include these courses whatever their
+                visibility, or whether they are open.
+            include_orgs (list): include the courses of these orgs whatever
+                their visibility, or whether they are open.
+            sort_by (str): CATALOG_SORT_BY_NUMBER to sort by course number,
+                CATALOG_SORT_BY_START_DATE to sort by start date with ended
+                courses last, or CATALOG_SORT_BY_ANNOUNCEMENT to sort the most
+                recently announced courses first, then the other courses by
+                their most recent (advertised) start date, like
+                CourseDescriptor.sorting_score.
+        """
+        queryset = self.get_query_set()
+        if orgs is not None:
+            queryset = queryset.filter(org__in=orgs)
+        if exclude_orgs:
+            queryset = queryset.exclude(org__in=exclude_orgs)
+        if course_ids is not None:
+            queryset = queryset.filter(id__in=course_ids)
+
+        visible = Q()
+        if visibilities is not None:
+            visible &= Q(catalog_visibility__in=visibilities)
+        if open_only:
+            started = Q(visible_to_staff_only=False)
+            if not ignore_start_dates:
+                started &= Q(start__isnull=True) | Q(start__lt=now)
+            enrollable = (
+                Q(invitation_only=False) &
+                (Q(enrollment_start__isnull=True) | Q(enrollment_start__lt=now)) &
+                (Q(enrollment_end__isnull=True) | Q(enrollment_end__gt=now))
+            )
+            if enrollment_domains is not None:
+                enrollable &= (
+                    Q(enrollment_domain__isnull=True) | Q(enrollment_domain='') |
+                    Q(enrollment_domain__in=enrollment_domains)
+                )
+            visible &= started | enrollable
+        if visible:
+            if include_course_ids:
+                visible |= Q(id__in=include_course_ids)
+            if include_orgs:
+                visible |= Q(org__in=include_orgs)
+            queryset = queryset.filter(visible)
+
+        quote_name = connection.ops.quote_name
+        if sort_by == CATALOG_SORT_BY_START_DATE:
+            return queryset.extra(
+                select=SortedDict([
+                    ('has_ended', "{end} IS NOT NULL AND {end} < %s".format(end=quote_name('end'))),
+                    ('has_no_start', "{start} IS NULL".format(start=quote_name('start'))),
+                ]),
+                select_params=(connection.ops.value_to_db_datetime(now), ),
+                order_by=['has_ended', 'has_no_start', 'start', 'display_number_with_default', 'id'],
+            )
+        elif sort_by == CATALOG_SORT_BY_ANNOUNCEMENT:
+            return queryset.extra(
+                select=SortedDict([
+                    ('has_no_announcement', "{announcement} IS NULL".format(announcement=quote_name('announcement'))),
+                    ('has_no_sorting_start', "{start} IS NULL".format(start=quote_name('sorting_start'))),
+                ]),
+                order_by=[
+                    'has_no_announcement', '-announcement', 'has_no_sorting_start', '-sorting_start',
+                    'display_number_with_default', 'id',
+                ],
+            )
+        elif sort_by == CATALOG_SORT_BY_NUMBER:
+            return queryset.order_by('display_number_with_default', 'id')
+        else:
+            raise ValueError(u"Unknown catalog sort order: '{}'".format(sort_by))
+
+
 class CourseOverview(django.db.models.Model):
     """
     Model for storing and caching basic information about a course.
@@ -33,8 +148,8 @@ class CourseOverview(django.db.models.Model):
     display_org_with_default = TextField()
 
     # Start/end dates
-    start = DateTimeField(null=True)
-    end = DateTimeField(null=True)
+    start = DateTimeField(null=True, db_index=True)
+    end = DateTimeField(null=True, db_index=True)
     advertised_start = TextField(null=True)
 
     # URLs
@@ -57,9 +172,22 @@ class CourseOverview(django.db.models.Model):
     # Access parameters
     days_early_for_beta = FloatField(null=True)
     mobile_available = BooleanField()
-    visible_to_staff_only = BooleanField()
+    visible_to_staff_only = BooleanField(db_index=True)
     _pre_requisite_courses_json = TextField()  # JSON representation of list of CourseKey strings
 
+    # Catalog parameters
+    org = CharField(max_length=255, db_index=True)
+    catalog_visibility = CharField(max_length=255, null=True, db_index=True)
+    enrollment_start = DateTimeField(null=True)
+    enrollment_end = DateTimeField(null=True)
+    enrollment_domain = TextField(null=True)
+    invitation_only = BooleanField()
+    announcement = DateTimeField(null=True, db_index=True)
+    # The advertised start date if it is a date, else the start date
+    sorting_start = DateTimeField(null=True, db_index=True)
+
+    objects = CourseOverviewManager()
+
     @staticmethod
     def _create_from_course(course):
         """
@@ -114,7 +242,16 @@ class CourseOverview(django.db.models.Model):
             days_early_for_beta=course.days_early_for_beta,
             mobile_available=course.mobile_available,
             visible_to_staff_only=course.visible_to_staff_only,
-            _pre_requisite_courses_json=json.dumps(course.pre_requisite_courses)
+            _pre_requisite_courses_json=json.dumps(course.pre_requisite_courses),
+
+            org=course.location.org,
+            catalog_visibility=course.catalog_visibility,
+            enrollment_start=course.enrollment_start,
+            enrollment_end=course.enrollment_end,
+            enrollment_domain=course.enrollment_domain,
+            invitation_only=course.invitation_only,
+            announcement=course.announcement,
+            sorting_start=course._sorting_dates()[1],  # pylint: disable=protected-access
         )
 
     @staticmethod
@@ -160,6 +297,72 @@ class CourseOverview(django.db.models.Model):
                     raise CourseOverview.DoesNotExist()
         return course_overview
 
+    @classmethod
+    def get_catalog_version(cls):
+        """
+        Returns the version stamp of the course catalog, which changes whenever
+        a course is published.
+
+        The overviews of the catalog are kept up to date by the
+        update_course_overview task when a course is published, and by the
+        update_course_overviews management command, which also deletes the
+        overviews of the courses no longer in the modulestore.
+        """
+        version = cache.get(CATALOG_VERSION_CACHE_KEY)
+        if version is None:
+            version = uuid4().hex
+            if not cache.add(CATALOG_VERSION_CACHE_KEY, version, CATALOG_VERSION_CACHE_TIMEOUT):
+                version = cache.get(CATALOG_VERSION_CACHE_KEY) or version
+        return version
+
+    @classmethod
+    def update_from_course_key(cls, course_key):
+        """
+        Creates or updates the overview of a course from the modulestore, or
+        deletes it if the course no longer exists, and changes the version of
+        the course catalog.
+
+        Raises:
+            IOError if the course could not be loaded from the module store.
+        """
+        store = modulestore()
+        with store.bulk_operations(course_key):
+            course = store.get_course(course_key)
+            if isinstance(course, CourseDescriptor):
+                cls._create_from_course(course).save()
+            elif course is not None:
+                raise IOError(
+                    "Error while loading course {} from the module store: {}",
+                    unicode(course_key),
+                    course.error_msg if isinstance(course, ErrorDescriptor) else unicode(course)
+                )
+            else:
+                cls.objects.filter(id=course_key).delete()
+        cls.update_catalog_version()
+
+    @classmethod
+    def delete_missing_courses(cls, course_keys):
+        """
+        Deletes the overviews of the courses which are not in `course_keys`,
+        the keys of all the courses of the modulestore, and changes the
+        version of the course catalog.
+        """
+        # CCX overviews are created from their course on demand
+        deleted_ids = [
+            course_id for course_id in set(cls.objects.values_list('id', flat=True)) - set(course_keys)
+            if not isinstance(course_id, CCXLocator)
+        ]
+        if deleted_ids:
+            cls.objects.filter(id__in=deleted_ids).delete()
+        cls.update_catalog_version()
+
+    @staticmethod
+    def update_catalog_version():
+        """
+        Changes the version stamp of the course catalog.
+        """
+        cache.set(CATALOG_VERSION_CACHE_KEY, uuid4().hex, CATALOG_VERSION_CACHE_TIMEOUT)
+
     def clean_id(self, padding_char='='):
         """
         Returns a unique deterministic base32-encoded ID for the course.
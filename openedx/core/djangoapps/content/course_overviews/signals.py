@@ -1,17 +1,21 @@
 """
-Signal handler for invalidating cached course overviews
+Signal handler for updating course overviews
 """
 from django.dispatch.dispatcher import receiver
 
 from xmodule.modulestore.django import SignalHandler
 
-from .models import CourseOverview
-
 
 @receiver(SignalHandler.course_published)
 def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
     """
     Catches the signal that a course has been published in Studio and
-    invalidates the corresponding CourseOverview cache entry if one exists.
+    updates the corresponding CourseOverview in the background.
+
+    The overview is updated in place rather than deleted first, so the course
+    stays in the course catalog until the update is done, or if it fails.
     """
-    CourseOverview.objects.filter(id=course_key).delete()
+    # Import tasks here to avoid a circular import.
+    from .tasks import update_course_overview
+
+    update_course_overview.apply_async([unicode(course_key)], countdown=0)
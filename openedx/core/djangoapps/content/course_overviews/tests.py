@@ -8,6 +8,8 @@ import pytz
 import math
 import mock
 
+from django.core.cache import cache
+from django.core.management import call_command
 from django.utils import timezone
 
 from lms.djangoapps.certificates.api import get_active_web_certificate
@@ -19,7 +21,9 @@ from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls, check_mongo_calls_range
 
-from .models import CourseOverview
+from .models import (
+    CourseOverview, CATALOG_SORT_BY_ANNOUNCEMENT, CATALOG_SORT_BY_NUMBER, CATALOG_SORT_BY_START_DATE
+)
 
 
 @ddt.ddt
@@ -91,6 +95,9 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
             'display_name_with_default',
             'start_date_is_still_default',
             'pre_requisite_courses',
+            'catalog_visibility',
+            'invitation_only',
+            'enrollment_domain',
         ]
         for attribute_name in fields_to_test:
             course_value = getattr(course, attribute_name)
@@ -227,7 +234,7 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
 
             # Set mobile_available to False and update the course.
             # This fires a course_published signal, which should be caught in signals.py, which should in turn
-            # delete the corresponding CourseOverview from the cache.
+            # update the corresponding CourseOverview.
             course.mobile_available = False
             with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
                 self.store.update_item(course, ModuleStoreEnum.UserID.test)
@@ -236,6 +243,21 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
             course_overview_2 = CourseOverview.get_from_id(course.id)
             self.assertFalse(course_overview_2.mobile_available)
 
+    def test_course_overview_kept_until_updated(self):
+        """
+        Tests that publishing a course doesn't remove its CourseOverview from
+        the catalog before the update task has run.
+        """
+        course = CourseFactory.create(mobile_available=True)
+        CourseOverview.get_from_id(course.id)
+
+        course.mobile_available = False
+        with mock.patch('openedx.core.djangoapps.content.course_overviews.tasks.update_course_overview.apply_async'):
+            with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
+                self.store.update_item(course, ModuleStoreEnum.UserID.test)
+
+        self.assertTrue(CourseOverview.objects.get(id=course.id).mobile_available)
+
     @ddt.data((ModuleStoreEnum.Type.mongo, 1, 1), (ModuleStoreEnum.Type.split, 3, 4))
     @ddt.unpack
     def test_course_overview_caching(self, modulestore_type, min_mongo_calls, max_mongo_calls):
@@ -309,3 +331,93 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
             __ = course.lowest_passing_grade
         course_overview = CourseOverview._create_from_course(course)  # pylint: disable=protected-access
         self.assertEqual(course_overview.lowest_passing_grade, None)
+
+
+class CourseOverviewCatalogTestCase(ModuleStoreTestCase):
+    """
+    Tests for the catalog queries of CourseOverview.
+    """
+    NOW = timezone.now()
+    LAST_MONTH = NOW - datetime.timedelta(days=30)
+    LAST_WEEK = NOW - datetime.timedelta(days=7)
+    NEXT_WEEK = NOW + datetime.timedelta(days=7)
+    NEXT_MONTH = NOW + datetime.timedelta(days=30)
+
+    def setUp(self):
+        super(CourseOverviewCatalogTestCase, self).setUp()
+        cache.clear()
+        self.started = CourseFactory.create(org='A', number='3', start=self.LAST_MONTH, end=self.NEXT_MONTH)
+        self.ended = CourseFactory.create(org='A', number='2', start=self.LAST_MONTH, end=self.LAST_WEEK)
+        self.upcoming = CourseFactory.create(
+            org='B', number='1', start=self.NEXT_WEEK, announcement=self.LAST_WEEK,
+            enrollment_start=self.LAST_WEEK, catalog_visibility='about',
+        )
+        self.invitation_only = CourseFactory.create(
+            org='B', number='4', start=self.NEXT_MONTH, invitation_only=True, catalog_visibility='none',
+        )
+        call_command('update_course_overviews', all=True)
+
+    def assert_catalog(self, courses, **kwargs):
+        """
+        Asserts that the catalog query with the given arguments returns the
+        given courses, in order.
+        """
+        self.assertEqual(
+            [overview.id for overview in CourseOverview.objects.catalog(self.NOW, **kwargs)],
+            [course.id for course in courses]
+        )
+
+    def test_catalog_version(self):
+        version = CourseOverview.get_catalog_version()
+        self.assertEqual(CourseOverview.objects.count(), 4)
+        self.assertEqual(CourseOverview.get_catalog_version(), version)
+
+        # Publishing a course only creates its own overview again
+        self.started.display_name = 'Started'
+        create_from_course = CourseOverview._create_from_course  # pylint: disable=protected-access
+        with mock.patch.object(CourseOverview, '_create_from_course', wraps=create_from_course) as create:
+            with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
+                self.store.update_item(self.started, ModuleStoreEnum.UserID.test)
+        self.assertEqual([call[0][0].id for call in create.call_args_list], [self.started.id])
+        self.assertNotEqual(CourseOverview.get_catalog_version(), version)
+        self.assertEqual(CourseOverview.objects.get(id=self.started.id).display_name, 'Started')
+
+    def test_catalog_version_expiry_does_not_load_courses(self):
+        cache.clear()
+        with check_mongo_calls(0):
+            CourseOverview.get_catalog_version()
+        self.assertEqual(CourseOverview.objects.count(), 4)
+
+    def test_update_course_overviews_drops_deleted_courses(self):
+        self.store.delete_course(self.ended.id, ModuleStoreEnum.UserID.test)
+        call_command('update_course_overviews', all=True)
+        self.assertFalse(CourseOverview.objects.filter(id=self.ended.id).exists())
+        self.assertEqual(CourseOverview.objects.count(), 3)
+
+    def test_filters(self):
+        self.assert_catalog([self.ended, self.started], orgs=['A'])
+        self.assert_catalog([self.upcoming, self.invitation_only], exclude_orgs=['A'])
+        self.assert_catalog([self.upcoming], course_ids=[self.upcoming.id, self.ended.id], orgs=['B'])
+        self.assert_catalog([self.upcoming], visibilities=['about'])
+        self.assert_catalog([self.upcoming, self.ended, self.started], open_only=True)
+        self.assert_catalog(
+            [self.upcoming, self.ended, self.started, self.invitation_only], open_only=True, ignore_start_dates=True
+        )
+        self.assert_catalog(
+            [self.upcoming, self.ended, self.started, self.invitation_only],
+            open_only=True, include_course_ids=[self.invitation_only.id]
+        )
+        self.assert_catalog([self.upcoming, self.invitation_only], visibilities=['about'], include_orgs=['B'])
+
+    def test_sort_orders(self):
+        self.assert_catalog(
+            [self.upcoming, self.ended, self.started, self.invitation_only], sort_by=CATALOG_SORT_BY_NUMBER
+        )
+        self.assert_catalog(
+            [self.started, self.upcoming, self.invitation_only, self.ended], sort_by=CATALOG_SORT_BY_START_DATE
+        )
+        self.assert_catalog(
+            [self.upcoming, self.invitation_only, self.ended, self.started], sort_by=CATALOG_SORT_BY_ANNOUNCEMENT
+        )
+        with self.assertRaises(ValueError):
+            CourseOverview.objects.catalog(self.NOW, sort_by='popularity')
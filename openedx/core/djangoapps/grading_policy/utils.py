@@ -1,8 +1,14 @@
 """
 The file contains utils
 """
+import json
+
 from django.conf import settings
 from django.core.cache import cache
+from opaque_keys.edx.keys import UsageKey
+
+from courseware.models import PersistentSectionGrade
+from xmodule.graders import Score
 
 
 class MaxScoresCache(object):
@@ -92,6 +98,88 @@ class MaxScoresCache(object):
         return max_score
 
 
+class PersistedGrades(object):
+    """
+    Persisted section grades of a single student in a course.
+
+    Sections whose grade has been persisted for the current version of the
+    course content can be graded without loading any student state. Grades are
+    only read and written if the ENABLE_PERSISTENT_GRADES feature is on.
+    """
+    def __init__(self, student, course):
+        self.student = student
+        self.course_key = course.id
+        self.course_version = course.subtree_edited_on.isoformat()
+        self.enabled = (
+            settings.FEATURES.get('ENABLE_PERSISTENT_GRADES', False) and
+            not settings.GENERATE_PROFILE_SCORES and
+            student.is_authenticated()
+        )
+        self._grades = {}
+        if self.enabled:
+            # Read before any student state, so that a score changed meanwhile
+            # makes the grade fail to save
+            self._grades = PersistentSectionGrade.read_grades(student.id, self.course_key)
+
+    def covers(self, grading_context):
+        """
+        Return True if every graded section of `grading_context` has a
+        persisted grade, i.e. no student state is needed to grade the course.
+        """
+        return self.enabled and all(
+            self._current_grade(section['section_descriptor'].location) is not None
+            for sections in grading_context['graded_sections'].itervalues()
+            for section in sections
+        )
+
+    def _current_grade(self, location):
+        """
+        Return the persisted grade of the section at `location` if it is valid
+        for the current version of the course, or None.
+        """
+        grade = self._grades.get(location)
+        if grade is None or grade.course_version != self.course_version:
+            return None
+        return grade
+
+    def get(self, location):
+        """
+        Return the persisted grade of the section at `location` as a tuple
+        (attempted, scores), where scores is a list of `Score`, or None if the
+        section has to be graded from student state.
+        """
+        grade = self._current_grade(location)
+        if grade is None:
+            return None
+        scores = [
+            Score(earned, possible, graded, display_name, UsageKey.from_string(block).map_into_course(self.course_key))
+            for earned, possible, graded, display_name, block in json.loads(grade.scores)
+        ]
+        return grade.attempted, scores
+
+    def save(self, section, attempted, scores):
+        """
+        Persist the grade of a section of the grading context, unless it was
+        invalidated since the persisted grades were read. Sections that
+        contain blocks that always have to be regraded are never persisted.
+        """
+        if not self.enabled:
+            return
+        if any(descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']):
+            return
+        location = section['section_descriptor'].location
+        previous_grade = self._grades.get(location)
+        PersistentSectionGrade.save_grade(
+            self.student.id,
+            self.course_key,
+            location,
+            self.course_version,
+            attempted,
+            scores,
+            version=previous_grade.version if previous_grade is not None else None,
+        )
+
+
 def weighted_score(raw_correct, raw_total, weight):
     """Return a tuple that represents the weighted (correct, total) score."""
     # If there is no weighting, or weighting can't be applied, return input.
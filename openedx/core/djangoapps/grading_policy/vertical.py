@@ -15,7 +15,9 @@ from util.module_utils import yield_dynamic_descriptor_descendants
 from student.models import anonymous_id_for_user
 from xmodule.graders import Score, aggregate_scores
 from xmodule.exceptions import UndefinedContext
-from openedx.core.djangoapps.grading_policy.utils import MaxScoresCache, grade_for_percentage, get_score
+from openedx.core.djangoapps.grading_policy.utils import (
+    MaxScoresCache, PersistedGrades, grade_for_percentage, get_score
+)
 from submissions import api as sub_api  # installed from the edx-submissions repository
 
 log = logging.getLogger("openedx.grading_policy")
@@ -67,7 +69,7 @@ class VerticalGrading(object):
     PROGRESS_SUMMARY_TEMPLATE = '/grading_policy/templates/summary/vertical.html'
 
     @staticmethod
-    def grade(student, request, course, keep_raw_scores, field_data_cache, scores_client):
+    def grade(student, request, course, keep_raw_scores, field_data_cache, scores_client, max_scores_cache=None):
         """
         This grades a student as quickly as possible. It returns the
         output from the course grader, augmented with the final letter
@@ -86,26 +88,37 @@ class VerticalGrading(object):
 
         More information on the format is in the docstring for CourseGrader.
         """
-        if field_data_cache is None:
-            with manual_transaction():
-                field_data_cache = field_data_cache_for_grading(course, student)
-        if scores_client is None:
-            scores_client = ScoresClient.from_field_data_cache(field_data_cache)
+        grading_context = course.grading_context
+        persisted_grades = PersistedGrades(student, course)
+        submissions_scores = None
+        # A max_scores_cache passed in is shared with other calls, and pushed
+        # to the remote cache by the caller
+        push_max_scores = False
+
+        # Student state only has to be loaded if some graded section has no
+        # persisted grade for the current version of the course.
+        if not persisted_grades.covers(grading_context):
+            if field_data_cache is None:
+                with manual_transaction():
+                    field_data_cache = field_data_cache_for_grading(course, student)
+            if scores_client is None:
+                scores_client = ScoresClient.from_field_data_cache(field_data_cache)
 
-        # Dict of item_ids -> (earned, possible) point tuples. This *only* grabs
-        # scores that were registered with the submissions API, which for the moment
-        # means only openassessment (edx-ora2)
-        submissions_scores = sub_api.get_scores(
-            course.id.to_deprecated_string(), anonymous_id_for_user(student, course.id)
-        )
-        max_scores_cache = MaxScoresCache.create_for_course(course)
-        # For the moment, we have to get scorable_locations from field_data_cache
-        # and not from scores_client, because scores_client is ignorant of things
-        # in the submissions API. As a further refactoring step, submissions should
-        # be hidden behind the ScoresClient.
-        max_scores_cache.fetch_from_remote(field_data_cache.scorable_locations)
+            # Dict of item_ids -> (earned, possible) point tuples. This *only* grabs
+            # scores that were registered with the submissions API, which for the moment
+            # means only openassessment (edx-ora2)
+            submissions_scores = sub_api.get_scores(
+                course.id.to_deprecated_string(), anonymous_id_for_user(student, course.id)
+            )
+            if max_scores_cache is None:
+                max_scores_cache = MaxScoresCache.create_for_course(course)
+                # For the moment, we have to get scorable_locations from field_data_cache
+                # and not from scores_client, because scores_client is ignorant of things
+                # in the submissions API. As a further refactoring step, submissions should
+                # be hidden behind the ScoresClient.
+                max_scores_cache.fetch_from_remote(field_data_cache.scorable_locations)
+                push_max_scores = True
 
-        grading_context = course.grading_context
         raw_scores = []
 
         totaled_scores = {}
@@ -117,73 +130,84 @@ class VerticalGrading(object):
                 section_descriptor = section['section_descriptor']
                 section_name = section_descriptor.display_name_with_default
 
-                # some problems have state that is updated independently of interaction
-                # with the LMS, so they need to always be scored. (E.g. foldit.,
-                # combinedopenended)
-                should_grade_section = any(
-                    descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']
-                )
-
-                # If there are no problems that always have to be regraded, check to
-                # see if any of our locations are in the scores from the submissions
-                # API. If scores exist, we have to calculate grades for this section.
-                if not should_grade_section:
+                persisted_grade = persisted_grades.get(section_descriptor.location)
+                if persisted_grade is not None:
+                    should_grade_section, persisted_scores = persisted_grade
+                else:
+                    # some problems have state that is updated independently of interaction
+                    # with the LMS, so they need to always be scored. (E.g. foldit.,
+                    # combinedopenended)
                     should_grade_section = any(
-                        descriptor.location.to_deprecated_string() in submissions_scores
-                        for descriptor in section['xmoduledescriptors']
+                        descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']
                     )
 
-                if not should_grade_section:
-                    should_grade_section = any(
-                        descriptor.location in scores_client for descriptor in section['xmoduledescriptors']
-                    )
+                    # If there are no problems that always have to be regraded, check to
+                    # see if any of our locations are in the scores from the submissions
+                    # API. If scores exist, we have to calculate grades for this section.
+                    if not should_grade_section:
+                        should_grade_section = any(
+                            descriptor.location.to_deprecated_string() in submissions_scores
+                            for descriptor in section['xmoduledescriptors']
+                        )
+
+                    if not should_grade_section:
+                        should_grade_section = any(
+                            descriptor.location in scores_client for descriptor in section['xmoduledescriptors']
+                        )
 
                 # If we haven't seen a single problem in the section, we don't have
                 # to grade it at all! We can assume 0%
                 if should_grade_section:
-                    scores = []
-
-                    def create_module(descriptor):
-                        '''creates an XModule instance given a descriptor'''
-                        # TODO: We need the request to pass into here. If we could forego that, our arguments
-                        # would be simpler
-                        return get_module_for_descriptor(
-                            student, request, descriptor, field_data_cache, course.id, course=course
-                        )
+                    if persisted_grade is not None:
+                        scores = persisted_scores
+                    else:
+                        scores = []
+
+                        def create_module(descriptor):
+                            '''creates an XModule instance given a descriptor'''
+                            # TODO: We need the request to pass into here. If we could forego that, our arguments
+                            # would be simpler
+                            return get_module_for_descriptor(
+                                student, request, descriptor, field_data_cache, course.id, course=course
+                            )
 
-                    descendants = yield_dynamic_descriptor_descendants(section_descriptor, student.id, create_module)
-                    for module_descriptor in descendants:
-                        (correct, total) = get_score(
-                            student,
-                            module_descriptor,
-                            create_module,
-                            scores_client,
-                            submissions_scores,
-                            max_scores_cache,
+                        descendants = yield_dynamic_descriptor_descendants(
+                            section_descriptor, student.id, create_module
                         )
-                        if correct is None and total is None:
-                            continue
-
-                        if settings.GENERATE_PROFILE_SCORES:    # for debugging!
-                            if total > 1:
-                                correct = random.randrange(max(total - 2, 1), total + 1)
-                            else:
-                                correct = total
-
-                        graded = module_descriptor.graded
-                        if not total > 0:
-                            # We simply cannot grade a problem that is 12/0, because we might need it as a percentage
-                            graded = False
-
-                        scores.append(
-                            Score(
-                                correct,
-                                total,
-                                graded,
-                                module_descriptor.display_name_with_default,
-                                module_descriptor.location
+                        for module_descriptor in descendants:
+                            (correct, total) = get_score(
+                                student,
+                                module_descriptor,
+                                create_module,
+                                scores_client,
+                                submissions_scores,
+                                max_scores_cache,
                             )
-                        )
+                            if correct is None and total is None:
+                                continue
+
+                            if settings.GENERATE_PROFILE_SCORES:    # for debugging!
+                                if total > 1:
+                                    correct = random.randrange(max(total - 2, 1), total + 1)
+                                else:
+                                    correct = total
+
+                            graded = module_descriptor.graded
+                            if not total > 0:
+                                # We simply cannot grade a problem that is 12/0, because we might need it as a
+                                # percentage
+                                graded = False
+
+                            scores.append(
+                                Score(
+                                    correct,
+                                    total,
+                                    graded,
+                                    module_descriptor.display_name_with_default,
+                                    module_descriptor.location
+                                )
+                            )
+                        persisted_grades.save(section, True, scores)
 
                     __, graded_total = aggregate_section_scores(
                         scores, section_name, getattr(section_descriptor, 'weight', 1.0)
@@ -191,6 +215,8 @@ class VerticalGrading(object):
                     if keep_raw_scores:
                         raw_scores += scores
                 else:
+                    if persisted_grade is None:
+                        persisted_grades.save(section, False, [])
                     graded_total = WeightedScore(
                         0.0, 1.0, True, section_name, None, getattr(section_descriptor, 'weight', 1.0)
                     )
@@ -225,7 +251,8 @@ class VerticalGrading(object):
             # so grader can be double-checked
             grade_summary['raw_scores'] = raw_scores
 
-        max_scores_cache.push_to_remote()
+        if push_max_scores:
+            max_scores_cache.push_to_remote()
 
         return grade_summary
 
@@ -274,6 +301,8 @@ class VerticalGrading(object):
         # be hidden behind the ScoresClient.
         max_scores_cache.fetch_from_remote(field_data_cache.scorable_locations)
 
+        persisted_grades = PersistedGrades(student, course)
+
         blocks_stack = [course_module]
         blocks_dict = {}
 
@@ -295,12 +324,18 @@ class VerticalGrading(object):
 
                 if curr_block.category == grading_type:
                     graded = curr_block.graded
-                    scores = []
-
                     module_creator = curr_block.xmodule_runtime.get_module
-                    for module_descriptor in yield_dynamic_descriptor_descendants(
-                            curr_block, student.id, module_creator
-                    ):
+
+                    persisted_grade = persisted_grades.get(curr_block.location)
+                    if persisted_grade is not None and persisted_grade[0]:
+                        # The scores were persisted when the section was last graded
+                        scores = [score._replace(graded=graded) for score in persisted_grade[1]]
+                        descendants = []
+                    else:
+                        scores = []
+                        descendants = yield_dynamic_descriptor_descendants(curr_block, student.id, module_creator)
+
+                    for module_descriptor in descendants:
                         (correct, total) = get_score(
                             student,
                             module_descriptor,